@@ -66,3 +66,12 @@ MWS_REGION_ENDPOINTS = {
     MWS_REGION_JP: MWS_ENDPOINT_JP,
     MWS_REGION_CN: MWS_ENDPOINT_CN,
 }
+
+MWS_REGION_FULFILLMENT_CENTERS = {
+    MWS_REGION_US: MWS_FULFILLMENT_NA,
+    MWS_REGION_CA: MWS_FULFILLMENT_NA,
+    MWS_REGION_EU: MWS_FULFILLMENT_EU,
+    MWS_REGION_IN: MWS_FULFILLMENT_IN,
+    MWS_REGION_JP: MWS_FULFILLMENT_JP,
+    MWS_REGION_CN: MWS_FULFILLMENT_CN,
+}
@@ -1,3 +1,6 @@
+import zlib
+import base64
+import hashlib
 import oscar_mws
 
 from collections import OrderedDict
@@ -9,11 +12,14 @@ from django.utils.translation import ugettext_lazy as _
 
 from lxml.builder import E
 
+from .registry import get_merchant
+
 Partner = models.get_model('partner', 'Partner')
 StockRecord = models.get_model('partner', 'StockRecord')
 
 
 STATUS_DONE = "_DONE_"
+STATUS_DONE_NO_DATA = "_DONE_NO_DATA_"
 STATUS_SUBMITTED = "_SUBMITTED_"
 STATUS_CANCELLED = "_CANCELLED_"
 STATUS_IN_PROGRESS = "_IN_PROGRESS_"
@@ -23,6 +29,7 @@ STATUS_AWAITING_ASYNCHRONOUS_REPLY = '_AWAITING_ASYNCHRONOUS_REPLY_'
 
 PROCESSING_STATUSES = (
     (STATUS_DONE, _("Done")),
+    (STATUS_DONE_NO_DATA, _("Done (no data)")),
     (STATUS_SUBMITTED, _("Submitted")),
     (STATUS_CANCELLED, _("Cancelled")),
     (STATUS_IN_PROGRESS, _("In Progress")),
@@ -154,8 +161,14 @@ class AbstractFeedSubmission(models.Model):
     date_created = models.DateTimeField(_("Date created"))
     date_updated = models.DateTimeField(_("Date updated"))
     date_submitted = models.DateTimeField(_("Date submitted"))
+    date_completed = models.DateTimeField(
+        _("Date processing completed"), null=True, blank=True)
     processing_status = models.CharField(
         _("Processing status"), max_length=200, choices=PROCESSING_STATUSES)
+    num_messages = models.PositiveIntegerField(
+        _("Number of messages"), null=True, blank=True)
+    date_next_poll = models.DateTimeField(
+        _("Date of next status poll"), null=True, blank=True, db_index=True)
 
     merchant = models.ForeignKey(
         "MerchantAccount", verbose_name=_("Merchant account"),
@@ -163,7 +176,26 @@ class AbstractFeedSubmission(models.Model):
     submitted_products = models.ManyToManyField(
         'catalogue.Product', verbose_name=_("Submitted products"),
         related_name="feed_submissions")
-    feed_xml = models.TextField(_("Submitted XML feed"), null=True, blank=True)
+    feed_content = models.ForeignKey(
+        'oscar_mws.FeedContent', verbose_name=_("Submitted feed content"),
+        related_name="submissions", null=True, blank=True,
+        on_delete=models.PROTECT)
+
+    def _get_feed_xml(self):
+        if self.feed_content_id is None:
+            return None
+        return self.feed_content.get_data()
+
+    def _set_feed_xml(self, feed_xml):
+        if not feed_xml:
+            self.feed_content = None
+            return
+        FeedContent = models.get_model('oscar_mws', 'FeedContent')
+        self.feed_content = FeedContent.from_data(feed_xml)
+
+    # The submitted feed is loaded from the feed content only when it is
+    # accessed, querying submissions never loads the feed itself.
+    feed_xml = property(_get_feed_xml, _set_feed_xml)
 
     def save(self, **kwargs):
         self.date_updated = tz_now()
@@ -177,6 +209,84 @@ class AbstractFeedSubmission(models.Model):
     class Meta:
         abstract = True
         ordering = ['-date_updated']
+        # support listing submissions by date of update with or without
+        # one of the dashboard filters applied
+        index_together = [
+            ('date_updated', 'id'),
+            ('processing_status', 'date_updated', 'id'),
+            ('feed_type', 'date_updated', 'id'),
+            ('merchant', 'date_updated', 'id'),
+        ]
+
+
+class AbstractFeedContent(models.Model):
+    """
+    The content of a submitted feed. Feeds can be very large and are only
+    needed for reference and debugging, so they are stored compressed in a
+    separate table that is only accessed when the content is requested.
+    The content is addressed by its SHA-256 checksum which means that
+    identical feeds are only stored once.
+    """
+    checksum = models.CharField(
+        _("SHA-256 checksum"), max_length=64, unique=True)
+    size = models.PositiveIntegerField(_("Uncompressed size"))
+    compressed_data = models.TextField(_("Compressed data"))
+    date_created = models.DateTimeField(_("Date created"), default=tz_now)
+
+    @staticmethod
+    def get_checksum(data):
+        return hashlib.sha256(data).hexdigest()
+
+    @classmethod
+    def from_data(cls, data):
+        """
+        Get the stored content for *data* and store it if it doesn't exist
+        yet.
+        """
+        if isinstance(data, unicode):
+            data = data.encode('utf-8')
+        compressed_data = base64.b64encode(zlib.compress(data))
+        content, __ = cls._default_manager.get_or_create(
+            checksum=cls.get_checksum(data),
+            defaults={'size': len(data), 'compressed_data': compressed_data})
+        return content
+
+    @classmethod
+    def from_file(cls, data_file):
+        """
+        Get the stored content for the data in *data_file* and store it if it
+        doesn't exist yet. The file is read in chunks from its current
+        position, only the compressed data is kept in memory.
+        """
+        checksum = hashlib.sha256()
+        compressor = zlib.compressobj()
+        compressed, size = [], 0
+        for chunk in iter(lambda: data_file.read(64 * 1024), ''):
+            checksum.update(chunk)
+            compressed.append(compressor.compress(chunk))
+            size += len(chunk)
+        compressed.append(compressor.flush())
+        content, __ = cls._default_manager.get_or_create(
+            checksum=checksum.hexdigest(),
+            defaults={'size': size, 'compressed_data': base64.b64encode(
+                ''.join(compressed))})
+        return content
+
+    def get_data(self):
+        """
+        Get the decompressed content as unicode string. It is decompressed
+        only once per instance.
+        """
+        if not hasattr(self, '_data'):
+            self._data = zlib.decompress(
+                base64.b64decode(self.compressed_data)).decode('utf-8')
+        return self._data
+
+    def __unicode__(self):
+        return "Feed content {0}".format(self.checksum)
+
+    class Meta:
+        abstract = True
 
 
 class AbstractFeedReport(models.Model):
@@ -228,6 +338,65 @@ class AbstractFeedResult(models.Model):
         abstract = True
 
 
+class AbstractReportRequest(models.Model):
+    """
+    A report request represents a report that has been requested from MWS
+    using the Reports API. Amazon generates the report asynchronously, so the
+    processing status of the request has to be polled until the report is
+    done. The next poll is scheduled with an increasing interval for requests
+    that are still processing. Once the report is done, the generated report
+    ID is stored and the report is downloaded exactly once.
+    """
+    request_id = models.CharField(
+        _("Report request ID"), max_length=64, unique=True)
+    report_type = models.CharField(_("Report type"), max_length=200)
+    processing_status = models.CharField(
+        _("Processing status"), max_length=200, choices=PROCESSING_STATUSES,
+        db_index=True)
+    report_id = models.CharField(
+        _("Generated report ID"), max_length=64, blank=True)
+
+    merchant = models.ForeignKey(
+        "MerchantAccount", verbose_name=_("Merchant account"),
+        related_name="report_requests")
+    # the marketplace the report was requested for, ``None`` if it covers
+    # all marketplaces of the merchant account.
+    marketplace = models.ForeignKey(
+        'oscar_mws.AmazonMarketplace', verbose_name=_("Marketplace"),
+        related_name='report_requests', null=True, blank=True,
+        on_delete=models.SET_NULL)
+
+    start_date = models.DateTimeField(_("Start date"), null=True, blank=True)
+    end_date = models.DateTimeField(_("End date"), null=True, blank=True)
+
+    num_polls = models.PositiveIntegerField(
+        _("Number of status polls"), default=0)
+    date_next_poll = models.DateTimeField(
+        _("Date of next status poll"), null=True, blank=True)
+    date_claimed = models.DateTimeField(
+        _("Date claimed for processing"), null=True, blank=True)
+    date_downloaded = models.DateTimeField(
+        _("Date downloaded"), null=True, blank=True)
+    num_failed_attempts = models.PositiveIntegerField(
+        _("Number of failed processing attempts"), default=0)
+
+    date_created = models.DateTimeField(_("Date created"))
+    date_updated = models.DateTimeField(_("Date updated"))
+
+    def save(self, **kwargs):
+        self.date_updated = tz_now()
+        if not self.date_created:
+            self.date_created = tz_now()
+        return super(AbstractReportRequest, self).save(**kwargs)
+
+    def __unicode__(self):
+        return "Report request #{0}".format(self.request_id)
+
+    class Meta:
+        abstract = True
+        ordering = ['-date_created']
+
+
 class AbstractAmazonProfile(models.Model):
     """
     An Amazon profile provides Amazon-specific attributes and settings for a
@@ -249,6 +418,15 @@ class AbstractAmazonProfile(models.Model):
         (FULFILLMENT_BY_MERCHANT, _("Fulfillment by Merchant")),
     )
 
+    FEED_RESULT_SUCCESS = "Success"
+    FEED_RESULT_WARNING = "Warning"
+    FEED_RESULT_ERROR = "Error"
+    FEED_RESULTS = (
+        (FEED_RESULT_SUCCESS, _("Success")),
+        (FEED_RESULT_WARNING, _("Warning")),
+        (FEED_RESULT_ERROR, _("Error")),
+    )
+
     # We don't necessarily get the ASIN back right away so we need
     # to be able to create a profile without a ASIN
     asin = models.CharField(_("ASIN"), max_length=10, blank=True)
@@ -272,10 +450,24 @@ class AbstractAmazonProfile(models.Model):
         _("Number of items"), null=True, blank=True)
     fulfillment_by = models.CharField(
         _("Fulfillment by"), max_length=3, choices=FULFILLMENT_TYPES,
-        default=FULFILLMENT_BY_MERCHANT)
+        default=FULFILLMENT_BY_MERCHANT, db_index=True)
     marketplaces = models.ManyToManyField(
         'AmazonMarketplace', verbose_name=_("Marketplaces"),
         related_name="amazon_profiles")
+    # Set when reconciling the profile with the merchant listings reports of
+    # its marketplaces, ``None`` means that the profile hasn't been
+    # reconciled yet. A profile is listed if it is listed in at least one of
+    # the ``listed_marketplaces``.
+    is_listed = models.NullBooleanField(
+        _("Listed on Amazon"), editable=False)
+    listed_marketplaces = models.ManyToManyField(
+        'AmazonMarketplace', verbose_name=_("Listed in marketplaces"),
+        related_name="listed_amazon_profiles", blank=True, editable=False)
+    # The most severe result reported for the product in the latest
+    # processed feed that it has been submitted with.
+    last_feed_result = models.CharField(
+        _("Last feed result"), max_length=10, choices=FEED_RESULTS,
+        blank=True, editable=False, db_index=True)
 
     def get_item_type(self):
         return self.product.product_class
@@ -492,6 +684,13 @@ class AbstractShipmentPackage(models.Model):
     part of a :class:`FulfillmentShipment
     <oscar_mws.abstract_models.AbstractFulfillmentShipment>`.
     """
+    # Carrier statuses after which the tracking details don't change anymore
+    TRACKING_DELIVERED = 'DELIVERED'
+    TRACKING_RETURNED = 'RETURNED'
+    TRACKING_UNDELIVERABLE = 'UNDELIVERABLE'
+    TRACKING_FINAL_STATUSES = (
+        TRACKING_DELIVERED, TRACKING_RETURNED, TRACKING_UNDELIVERABLE)
+
     package_number = models.IntegerField(_("Package number"))
     tracking_number = models.CharField(_("Tracking number"), max_length=255)
     carrier_code = models.CharField(_("Carrier code"), max_length=255)
@@ -500,6 +699,19 @@ class AbstractShipmentPackage(models.Model):
         'oscar_mws.FulfillmentShipment', related_name="packages",
         verbose_name=_("Fulfillment shipment"))
 
+    tracking_status = models.CharField(
+        _("Tracking status"), max_length=32, blank=True, db_index=True)
+    date_estimated_arrival = models.DateTimeField(
+        _("Estimated arrival"), null=True, blank=True)
+    date_tracking_updated = models.DateTimeField(
+        _("Tracking last updated"), null=True, blank=True)
+    date_tracking_due = models.DateTimeField(
+        _("Tracking update due"), default=tz_now, db_index=True)
+
+    @property
+    def is_tracking_final(self):
+        return self.tracking_status in self.TRACKING_FINAL_STATUSES
+
     def __unicode__(self):
         return "Package {0} delivered by {1}".format(
             self.tracking_number,
@@ -510,6 +722,31 @@ class AbstractShipmentPackage(models.Model):
         abstract = True
 
 
+class AbstractPackageTrackingEvent(models.Model):
+    """
+    A tracking event reported by the carrier for a :class:`ShipmentPackage
+    <oscar_mws.abstract_models.AbstractShipmentPackage>`. Tracking events are
+    retrieved from MWS in the background and stored so that they can be
+    displayed without requesting them from MWS.
+    """
+    package = models.ForeignKey(
+        'oscar_mws.ShipmentPackage', verbose_name=_("Shipment package"),
+        related_name='tracking_events')
+    event_code = models.CharField(_("Event code"), max_length=32)
+    event_date = models.DateTimeField(_("Event date"))
+    city = models.CharField(_("City"), max_length=255, blank=True)
+    state = models.CharField(_("State"), max_length=255, blank=True)
+    country = models.CharField(_("Country"), max_length=2, blank=True)
+
+    def __unicode__(self):
+        return "{0} for package {1}".format(self.event_code, self.package_id)
+
+    class Meta:
+        abstract = True
+        ordering = ['event_date', 'id']
+        unique_together = ('package', 'event_date', 'event_code')
+
+
 class AbstractFulfillmentOrderLine(models.Model):
     """
     A fulfillment order line corresponds to an order line in the MWS
@@ -623,6 +860,10 @@ class AbstractMerchantAccount(models.Model):
         help_text=_("if you don't specify a partner, a new one will be "
                     "created automatically"))
 
+    date_inventory_synced = models.DateTimeField(
+        _("Inventory last synchronised"), null=True, blank=True,
+        editable=False)
+
     def save(self, *args, **kwargs):
         if not self.partner:
             self.partner, __ = Partner.objects.get_or_create(name=self.name)
@@ -630,6 +871,9 @@ class AbstractMerchantAccount(models.Model):
 
     @property
     def marketplace_ids(self):
+        merchant = get_merchant(self.seller_id)
+        if merchant is not None and merchant.id == self.pk:
+            return list(merchant.marketplace_ids)
         return [m.marketplace_id for m in self.marketplaces.all()]
 
     def __unicode__(self):
@@ -677,6 +921,10 @@ class AbstractAmazonMarketplace(models.Model):
         blank=True
     )
 
+    date_orders_synced = models.DateTimeField(
+        _("Orders last synchronised"), null=True, blank=True,
+        editable=False)
+
     @property
     def fulfillment_center_id(self):
         return oscar_mws.MWS_FULFILLMENT_CENTERS.get(self.region)
@@ -686,3 +934,198 @@ class AbstractAmazonMarketplace(models.Model):
 
     class Meta:
         abstract = True
+
+
+class AbstractAmazonOrder(models.Model):
+    """
+    An order placed on an Amazon marketplace that has been imported as Oscar
+    order. It links the Oscar order to the Amazon order ID and keeps the
+    Amazon order status which is used to detect changes when orders are
+    imported again.
+    """
+    FULFILLMENT_BY_AMAZON = 'AFN'
+    FULFILLMENT_BY_MERCHANT = 'MFN'
+    FULFILLMENT_CHOICES = (
+        (FULFILLMENT_BY_AMAZON, _("Fulfillment by Amazon")),
+        (FULFILLMENT_BY_MERCHANT, _("Fulfillment by merchant")),
+    )
+
+    amazon_order_id = models.CharField(
+        _("Amazon order ID"), max_length=50, unique=True)
+    order = models.OneToOneField(
+        'order.Order', verbose_name=_("Order"), related_name='amazon_order')
+    marketplace = models.ForeignKey(
+        'oscar_mws.AmazonMarketplace', verbose_name=_("Marketplace"),
+        related_name='orders', null=True, blank=True,
+        on_delete=models.SET_NULL)
+    status = models.CharField(_("Status"), max_length=32, db_index=True)
+    fulfillment_channel = models.CharField(
+        _("Fulfillment channel"), max_length=3, choices=FULFILLMENT_CHOICES,
+        blank=True)
+    date_purchased = models.DateTimeField(_("Date purchased"))
+
+    def __unicode__(self):
+        return "Amazon order {0}".format(self.amazon_order_id)
+
+    class Meta:
+        abstract = True
+
+
+class AbstractPricingSnapshot(models.Model):
+    """
+    Competitive pricing of a product on an Amazon marketplace as reported by
+    MWS. Snapshots form a time series per product and marketplace. A new
+    snapshot is only stored when one of the values changes, otherwise the
+    date of the last check of the latest snapshot is updated. The values of
+    a snapshot were valid from ``date_created`` until at least
+    ``date_checked``.
+    """
+    VALUE_FIELDS = (
+        'currency', 'buybox_price', 'is_buybox_ours', 'lowest_price',
+        'num_offers', 'sales_rank')
+
+    profile = models.ForeignKey(
+        'oscar_mws.AmazonProfile', verbose_name=_("Amazon profile"),
+        related_name='pricing_snapshots')
+    marketplace = models.ForeignKey(
+        'oscar_mws.AmazonMarketplace', verbose_name=_("Marketplace"),
+        related_name='pricing_snapshots')
+
+    currency = models.CharField(_("Currency"), max_length=3, blank=True)
+    buybox_price = models.DecimalField(
+        _("Buy box landed price"), max_digits=12, decimal_places=2,
+        null=True, blank=True)
+    is_buybox_ours = models.BooleanField(_("Buy box is ours"), default=False)
+    lowest_price = models.DecimalField(
+        _("Lowest landed price of other sellers"), max_digits=12,
+        decimal_places=2, null=True, blank=True)
+    num_offers = models.PositiveIntegerField(
+        _("Number of new offers"), null=True, blank=True)
+    sales_rank = models.PositiveIntegerField(
+        _("Sales rank"), null=True, blank=True)
+
+    date_created = models.DateTimeField(_("Date created"))
+    date_checked = models.DateTimeField(_("Date last checked"))
+
+    def get_values(self):
+        return dict((name, getattr(self, name)) for name in self.VALUE_FIELDS)
+
+    def __unicode__(self):
+        return "Pricing for {0} on {1}".format(
+            self.profile_id, self.marketplace_id)
+
+    class Meta:
+        abstract = True
+        index_together = [('marketplace', 'profile', 'id')]
+
+
+class AbstractMwsJob(models.Model):
+    """
+    A job runs a bulk action for products in a marketplace outside of the
+    request/response cycle, e.g. submitting a product feed for the whole
+    catalogue. The job is created as *pending* and is picked up by a worker
+    running the ``mws_run_jobs`` management command. Actions that submit a
+    feed submit a single feed for all products. Other actions process the
+    products in batches and the number of processed and failed products is
+    updated after each batch so that the progress of the job can be
+    displayed while it is running. Jobs created with ``all_products`` run on
+    all products that the action applies to, other jobs only on the selected
+    ``products``.
+    """
+    ACTION_SUBMIT_PRODUCT_FEED = 'submit_product_feed'
+    ACTION_SWITCH_TO_AFN = 'switch_to_afn'
+    ACTION_UPDATE_PRODUCT_IDENTIFIERS = 'update_product_identifiers'
+    ACTION_UPDATE_STOCK = 'update_stock'
+    ACTION_CHOICES = (
+        (ACTION_SUBMIT_PRODUCT_FEED, _("Create new products")),
+        (ACTION_SWITCH_TO_AFN, _("Switch to 'Fulfillment by Amazon'")),
+        (ACTION_UPDATE_PRODUCT_IDENTIFIERS, _("Update product ASINs")),
+        (ACTION_UPDATE_STOCK, _("Update product stock")),
+    )
+
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (PENDING, _("Pending")),
+        (RUNNING, _("Running")),
+        (DONE, _("Done")),
+        (FAILED, _("Failed")),
+    )
+
+    action = models.CharField(
+        _("Action"), max_length=100, choices=ACTION_CHOICES)
+    status = models.CharField(
+        _("Status"), max_length=20, choices=STATUS_CHOICES, default=PENDING,
+        db_index=True)
+
+    marketplace = models.ForeignKey(
+        'oscar_mws.AmazonMarketplace', verbose_name=_("Marketplace"),
+        related_name='jobs')
+    products = models.ManyToManyField(
+        'catalogue.Product', verbose_name=_("Selected products"),
+        related_name='mws_jobs', blank=True)
+    all_products = models.BooleanField(
+        _("Run on all products"), default=False)
+
+    num_total = models.PositiveIntegerField(
+        _("Number of products"), default=0)
+    num_processed = models.PositiveIntegerField(
+        _("Number of processed products"), default=0)
+    num_failed = models.PositiveIntegerField(
+        _("Number of failed products"), default=0)
+
+    date_created = models.DateTimeField(_("Date created"))
+    date_started = models.DateTimeField(
+        _("Date started"), null=True, blank=True)
+    date_finished = models.DateTimeField(
+        _("Date finished"), null=True, blank=True)
+
+    @property
+    def is_finished(self):
+        return self.status in (self.DONE, self.FAILED)
+
+    @property
+    def progress(self):
+        """
+        Percentage of products that have been processed, including failed
+        products.
+        """
+        if not self.num_total:
+            return 100 if self.is_finished else 0
+        return 100 * (self.num_processed + self.num_failed) / self.num_total
+
+    def save(self, **kwargs):
+        if not self.date_created:
+            self.date_created = tz_now()
+        return super(AbstractMwsJob, self).save(**kwargs)
+
+    def __unicode__(self):
+        return "Job #{0} ({1})".format(self.id, self.get_action_display())
+
+    class Meta:
+        abstract = True
+        ordering = ['-date_created']
+
+
+class AbstractMwsJobError(models.Model):
+    """
+    An error that occurred while processing a product in a :class:`MwsJob
+    <oscar_mws.abstract_models.AbstractMwsJob>`. Errors that aren't related
+    to a specific product are stored without product.
+    """
+    job = models.ForeignKey(
+        'oscar_mws.MwsJob', verbose_name=_("Job"), related_name='errors')
+    product = models.ForeignKey(
+        'catalogue.Product', verbose_name=_("Product"),
+        related_name='+', null=True, blank=True, on_delete=models.SET_NULL)
+    message = models.TextField(_("Message"))
+    date_created = models.DateTimeField(_("Date created"), default=tz_now)
+
+    def __unicode__(self):
+        return "Error in job #{0}".format(self.job_id)
+
+    class Meta:
+        abstract = True
+        ordering = ['id']
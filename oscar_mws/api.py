@@ -3,11 +3,14 @@
 #
 # This API client for Amazon's MWS is based on the python-amazon-mws package
 # available here: https://github.com/czpython/python-amazon-mws
+import re
 import hmac
+import time
 import urllib
 import base64
 import hashlib
 import logging
+import tempfile
 import xmltodict
 
 from time import strftime, gmtime
@@ -23,9 +26,26 @@ except ImportError:
 from requests.sessions import Session
 from requests.exceptions import HTTPError
 
+from . import instrumentation
+
 
 logger = logging.getLogger('oscar_mws.api')
 
+# Quoted parameter values are cached to avoid quoting values that are sent
+# with every request (e.g. versions, seller and marketplace IDs) over and over
+# again. Only short strings are cached and the cache is reset when it exceeds
+# its maximum size to keep its memory footprint small.
+QUOTE_CACHE_SIZE = 4096
+QUOTE_CACHE_MAX_LENGTH = 128
+_quote_cache = {}
+
+FORM_CONTENT_TYPE = 'application/x-www-form-urlencoded; charset=utf-8'
+
+# Size of the chunks used to hash, upload and download feeds and reports
+CHUNK_SIZE = 64 * 1024
+
+ERROR_CODE_PATTERN = re.compile(r'<Code>([^<]*)</Code>')
+
 
 class MWSError(Exception):
     """
@@ -37,13 +57,79 @@ class MWSError(Exception):
     url = None
 
 
-def calc_md5(string):
+def iter_chunks(data, chunk_size=CHUNK_SIZE):
+    """
+    Iterate over *data* in chunks of at most *chunk_size* bytes. *data* can be
+    a string, a file-like object or an iterable of strings which is returned
+    unchanged.
+    """
+    if isinstance(data, basestring):
+        for start in xrange(0, len(data), chunk_size):
+            yield data[start:start + chunk_size]
+    elif hasattr(data, 'read'):
+        for chunk in iter(lambda: data.read(chunk_size), ''):
+            yield chunk
+    else:
+        for chunk in data:
+            yield chunk
+
+
+def calc_md5(data):
+    """
+    Calculates the base64 encoded MD5 digest for the given *data* as required
+    for the ``Content-MD5`` header. *data* can be a string, a file-like object
+    or an iterable of strings. Files are hashed in chunks starting at their
+    current position which is restored afterwards.
+    """
+    md = hashlib.md5()
+    position = data.tell() if hasattr(data, 'seek') else None
+    for chunk in iter_chunks(data):
+        md.update(chunk)
+    if position is not None:
+        data.seek(position)
+    return base64.b64encode(md.digest())
+
+
+def copy_with_md5(chunks, fileobj):
     """
-    Calculates the MD5 encryption for the given string
+    Write the strings in *chunks* to *fileobj* and calculate their MD5 digest
+    on the way. Returns the base64 encoded digest.
     """
     md = hashlib.md5()
-    md.update(string)
-    return base64.encodestring(md.digest()).strip('\n')
+    for chunk in chunks:
+        md.update(chunk)
+        fileobj.write(chunk)
+    fileobj.flush()
+    return base64.b64encode(md.digest())
+
+
+def quote_param(value):
+    """
+    Quote *value* for use in the query string of a request as required by the
+    MWS signature version 2. The result for short string values is cached.
+    """
+    cacheable = (isinstance(value, basestring) and
+                 len(value) <= QUOTE_CACHE_MAX_LENGTH)
+    if cacheable:
+        try:
+            return _quote_cache[value]
+        except KeyError:
+            pass
+    quoted = urllib.quote(unicode(value).encode('utf-8'), safe='-_.~')
+    if cacheable:
+        if len(_quote_cache) >= QUOTE_CACHE_SIZE:
+            _quote_cache.clear()
+        _quote_cache[value] = quoted
+    return quoted
+
+
+def get_error_code(content):
+    """
+    Get the error code from the XML error response *content* of MWS or
+    ``None`` if it doesn't contain one.
+    """
+    match = ERROR_CODE_PATTERN.search(content or '')
+    return match.group(1) if match else None
 
 
 def remove_empty(d):
@@ -95,12 +181,14 @@ class DictWrapper(object):
 
 class DataWrapper(object):
     """
-    Text wrapper in charge of validating the hash sent by Amazon.
+    Text wrapper in charge of validating the hash sent by Amazon. *data* is
+    either the response body or a file that it has been streamed to. The hash
+    is calculated from *data* unless it is provided as *content_md5*.
     """
-    def __init__(self, data, header):
+    def __init__(self, data, header, content_md5=None):
         self.original = data
         if 'content-md5' in header:
-            hash_ = calc_md5(self.original)
+            hash_ = content_md5 or calc_md5(self.original)
             if header['content-md5'] != hash_:
                 raise MWSError("Wrong Contentlength, maybe amazon error...")
 
@@ -146,6 +234,19 @@ class MWS(object):
         self.version = version or self.VERSION
         self.session = Session()
 
+        # The parts of the request signature that don't change between
+        # requests are prepared once for the lifetime of the client.
+        self._host = self.domain.replace('https://', '').lower()
+        self._hmac = hmac.new(str(self.secret_key), digestmod=hashlib.sha256)
+        self._signing_prefixes = {}
+        self._base_params = {
+            'AWSAccessKeyId': self.access_key,
+            self.ACCOUNT_TYPE: self.account_id,
+            'SignatureVersion': '2',
+            'Version': self.version,
+            'SignatureMethod': 'HmacSHA256',
+        }
+
         bucket_key = getattr(settings, 'RUNSCOPE_BUCKET_KEY', None)
         if bucket_key:
             logger.info("Redirecting API calls for MWS to runscope")
@@ -175,42 +276,56 @@ class MWS(object):
             self.session.mount('http://', RunscopeAdapter(bucket_key))
 
     def _get_quote_params(self, params):
-        quoted_params = []
-        for key in sorted(params):
-            value = urllib.quote(
-                unicode(params[key]).encode('utf-8'),
-                safe='-_.~'
-            )
-            quoted_params.append("{}={}".format(key, value))
-        return '&'.join(quoted_params)
+        return '&'.join(
+            "{}={}".format(key, quote_param(params[key]))
+            for key in sorted(params))
 
     def make_request(self, extra_data, method="GET", **kwargs):
         """
-        Make request to Amazon MWS API with these parameters
+        Make request to Amazon MWS API with these parameters. The signed
+        parameters are sent in the query string for ``GET`` requests and for
+        requests that provide their own *body*, e.g. ``SubmitFeed``. All other
+        ``POST`` requests send the signed parameters as a form-encoded body
+        which avoids exceeding the maximum URL length for requests with a large
+        number of parameters.
+
+        If a *response_file* is passed in, the response body is streamed into
+        this file and returned as a :class:`DataWrapper` after validating its
+        MD5 hash. This keeps large reports out of memory. A *timeout* in
+        seconds limits how long to wait for MWS to respond, the default is to
+        wait indefinitely.
+
+        Requests that fail without a response, e.g. because of a connection
+        error or timeout, and responses that can't be processed are recorded
+        with the name of the exception as error code before it is re-raised.
         """
 
+        started = time.time()
+
         # Remove all keys with an empty value because
         # Amazon's MWS does not allow such a thing.
         extra_data = remove_empty(extra_data)
-        params = {
-            'AWSAccessKeyId': self.access_key,
-            self.ACCOUNT_TYPE: self.account_id,
-            'SignatureVersion': '2',
-            'Timestamp': self.get_timestamp(),
-            'Version': self.version,
-            'SignatureMethod': 'HmacSHA256',
-        }
+        params = self._base_params.copy()
+        params['Timestamp'] = self.get_timestamp()
         params.update(extra_data)
-        logger.debug("Request Parameters: {}".format(params))
+        logger.debug("Request Parameters: %s", params)
 
         request_description = self._get_quote_params(params)
         signature = self.calc_signature(method, request_description)
 
-        logger.debug('Domain: {} URI: {}'.format(self.domain, self.uri))
-        url = '%s%s?%s&Signature=%s' % (self.domain, self.uri,
-                                        request_description,
-                                        urllib.quote(signature))
+        logger.debug('Domain: %s URI: %s', self.domain, self.uri)
+        signed_params = '%s&Signature=%s' % (request_description,
+                                             urllib.quote(signature))
+        signed = time.time()
         headers = {'User-Agent': 'python-amazon-mws/0.0.1 (Language=Python)'}
+
+        body = kwargs.get('body')
+        if method == 'POST' and body is None:
+            url = '%s%s' % (self.domain, self.uri)
+            body = signed_params
+            headers['Content-Type'] = FORM_CONTENT_TYPE
+        else:
+            url = '%s%s?%s' % (self.domain, self.uri, signed_params)
         headers.update(kwargs.get('extra_headers', {}))
 
         try:
@@ -220,13 +335,32 @@ class MWS(object):
             # params dict as params to request, request will repeat that step
             # because it will need to convert the dict to a url parsed string,
             # so why do it twice if i can just pass the full url :).
+            response_file = kwargs.get('response_file')
             response = self.session.request(
-                method, url, data=kwargs.get('body', ''), headers=headers)
+                method, url, data=body or '', headers=headers,
+                stream=response_file is not None,
+                timeout=kwargs.get('timeout'))
             response.raise_for_status()
+
+            if response_file is not None:
+                content_md5 = copy_with_md5(
+                    response.iter_content(CHUNK_SIZE), response_file)
+                received = time.time()
+                response_bytes = response_file.tell()
+                response_file.seek(0)
+                parsed_response = DataWrapper(
+                    response_file, response.headers, content_md5)
+                parsed_response.response = response
+                self.record_request(
+                    method, extra_data, response, response_bytes,
+                    started, signed, received)
+                return parsed_response
+
             # When retrieving data from the response object, be aware that
             # response.content returns the content in bytes while response.text
             # calls response.content and converts it to unicode.
             data = response.content
+            received = time.time()
 
             # I do not check the headers to decide which content structure to
             # server simply because sometimes Amazon's MWS API returns XML
@@ -249,13 +383,53 @@ class MWS(object):
                     e.response.content
                 )
             )
+            if instrumentation.is_enabled():
+                self.record_request(
+                    method, extra_data, e.response, len(e.response.content),
+                    started, signed, time.time(),
+                    error_code=get_error_code(e.response.content))
             raise error
+        except Exception, e:
+            # connection errors, timeouts and responses that can't be
+            # processed, e.g. because of an invalid MD5 hash
+            if instrumentation.is_enabled():
+                self.record_request(
+                    method, extra_data, None, 0, started, signed, time.time(),
+                    error_code=e.__class__.__name__)
+            raise
 
         # Store the response object in the parsed_response for quick access
         parsed_response.response = response
-        logger.debug("Received response: {}".format(response.content))
+        logger.debug("Received response: %s", response.content)
+        self.record_request(
+            method, extra_data, response, len(data), started, signed,
+            received, time.time())
         return parsed_response
 
+    def record_request(self, method, extra_data, response, response_bytes,
+                       started, signed, received, parsed=None,
+                       error_code=None):
+        """
+        Pass the metrics of a request to the instrumentation sinks configured
+        in ``MWS_INSTRUMENTATION_SINKS``. *started*, *signed*, *received* and
+        *parsed* are the times at which the request was started, signed, the
+        response was received and parsed. *response* is ``None`` for requests
+        that failed without a response. This does nothing if no sinks are
+        configured.
+        """
+        if not instrumentation.is_enabled():
+            return
+        instrumentation.emit(instrumentation.RequestMetrics(
+            action=extra_data.get('Action'),
+            method=method,
+            host=self._host,
+            status_code=getattr(response, 'status_code', None),
+            error_code=error_code,
+            response_bytes=response_bytes,
+            sign_time=signed - started,
+            http_time=received - signed,
+            parse_time=(parsed or received) - received))
+
     def get_service_status(self):
         """
         Returns a GREEN, GREEN_I, YELLOW or RED status.
@@ -265,13 +439,19 @@ class MWS(object):
 
     def calc_signature(self, method, request_description):
         """
-        Calculate MWS signature to interface with Amazon
+        Calculate MWS signature to interface with Amazon. The HMAC initialised
+        with the secret key is copied for each signature instead of creating
+        a new one.
         """
-        sig_data = "{}\n{}\n{}\n{}".format(
-            method, self.domain.replace('https://', '').lower(), self.uri,
-            request_description)
-        return base64.b64encode(
-            hmac.new(str(self.secret_key), sig_data, hashlib.sha256).digest())
+        try:
+            prefix = self._signing_prefixes[method]
+        except KeyError:
+            prefix = self._signing_prefixes[method] = "{}\n{}\n{}\n".format(
+                method, self._host, self.uri)
+        digest = self._hmac.copy()
+        digest.update(prefix)
+        digest.update(request_description)
+        return base64.b64encode(digest.digest())
 
     def get_timestamp(self):
         """
@@ -321,16 +501,36 @@ class Feeds(MWS):
         """
         Uploads a feed ( xml or .tsv ) to the seller's inventory.
         Can be used for creating/updating products on Amazon.
+
+        The *feed* can be a string, a file-like object or an iterable of
+        strings. Files are hashed in chunks and streamed to MWS. An iterable
+        is written to a temporary file while it is hashed because it can only
+        be consumed once.
         """
         data = dict(Action='SubmitFeed',
                     FeedType=feed_type,
                     PurgeAndReplace=purge)
         data.update(self.enumerate_param('MarketplaceIdList.Id',
                                          marketplaceids))
-        md = calc_md5(feed)
-        return self.make_request(data, method="POST", body=feed,
-                                 extra_headers={'Content-MD5': md,
-                                                'Content-Type': content_type})
+        feed_file = None
+        if isinstance(feed, basestring) or hasattr(feed, 'read'):
+            md = calc_md5(feed)
+        else:
+            feed_file = tempfile.TemporaryFile()
+        try:
+            if feed_file is not None:
+                md = copy_with_md5(feed, feed_file)
+                feed_file.seek(0)
+                feed = feed_file
+            return self.make_request(
+                data, method="POST", body=feed,
+                extra_headers={'Content-MD5': md,
+                               'Content-Type': content_type})
+        finally:
+            # only the temporary file for an iterable is closed, files
+            # passed in are left to the caller
+            if feed_file is not None:
+                feed_file.close()
 
     def get_feed_submission_list(self, feedids=None, max_count=None,
                                  feedtypes=None, processingstatuses=None,
@@ -388,9 +588,13 @@ class Reports(MWS):
 
     ACCOUNT_TYPE = "Merchant"
 
-    def get_report(self, report_id):
+    def get_report(self, report_id, response_file=None):
+        """
+        Returns the contents of a report. If *response_file* is provided, the
+        report is streamed into it instead of being loaded into memory.
+        """
         data = dict(Action='GetReport', ReportId=report_id)
-        return self.make_request(data)
+        return self.make_request(data, response_file=response_file)
 
     def get_report_count(self, report_types=(), acknowledged=None,
                          fromdate=None, todate=None):
@@ -540,7 +744,7 @@ class Products(MWS):
         """
         data = dict(Action='GetMatchingProduct', MarketplaceId=marketplaceid)
         data.update(self.enumerate_param('ASINList.ASIN', asins))
-        return self.make_request(data)
+        return self.make_request(data, "POST")
 
     def get_matching_product_for_id(self, marketplaceid, type, id):
         """
@@ -552,7 +756,7 @@ class Products(MWS):
                     MarketplaceId=marketplaceid,
                     IdType=type)
         data.update(self.enumerate_param('IdList.Id', id))
-        return self.make_request(data)
+        return self.make_request(data, "POST")
 
     def get_competitive_pricing_for_sku(self, marketplaceid, skus):
         """
@@ -562,7 +766,7 @@ class Products(MWS):
         data = dict(Action='GetCompetitivePricingForSKU',
                     MarketplaceId=marketplaceid)
         data.update(self.enumerate_param('SellerSKUList.SellerSKU', skus))
-        return self.make_request(data)
+        return self.make_request(data, "POST")
 
     def get_competitive_pricing_for_asin(self, marketplaceid, asins):
         """
@@ -572,7 +776,7 @@ class Products(MWS):
         data = dict(Action='GetCompetitivePricingForASIN',
                     MarketplaceId=marketplaceid)
         data.update(self.enumerate_param('ASINList.ASIN', asins))
-        return self.make_request(data)
+        return self.make_request(data, "POST")
 
     def get_lowest_offer_listings_for_sku(self, marketplaceid, skus,
                                           condition="Any", excludeme="False"):
@@ -581,7 +785,7 @@ class Products(MWS):
                     ItemCondition=condition,
                     ExcludeMe=excludeme)
         data.update(self.enumerate_param('SellerSKUList.SellerSKU', skus))
-        return self.make_request(data)
+        return self.make_request(data, "POST")
 
     def get_lowest_offer_listings_for_asin(self, marketplaceid, asins,
                                            condition="Any", excludeme="False"):
@@ -590,7 +794,7 @@ class Products(MWS):
                     ItemCondition=condition,
                     ExcludeMe=excludeme)
         data.update(self.enumerate_param('ASINList.ASIN', asins))
-        return self.make_request(data)
+        return self.make_request(data, "POST")
 
     def get_product_categories_for_sku(self, marketplaceid, sku):
         data = dict(Action='GetProductCategoriesForSKU',
@@ -641,7 +845,8 @@ class Sellers(MWS):
         Takes a "NextToken" and returns the same information as
         "list_marketplace_participations". Based on the "NextToken".
         """
-        data = dict(Action='ListMarketplaceParticipations', NextToken=token)
+        data = dict(Action='ListMarketplaceParticipationsByNextToken',
+                    NextToken=token)
         return self.make_request(data)
 
 
@@ -689,14 +894,14 @@ class OutboundShipments(MWS):
         return item_dict
 
     def get_fulfillment_preview(self, address, items,
-                                shipping_speed_categories=None):
+                                shipping_speed_categories=None, timeout=None):
         data = dict(Action="GetFulfillmentPreview")
         data.update(self.dict_param('Address', address))
         if shipping_speed_categories:
             data.update(self.enumerate_param(
                 'ShippingSpeedCategories', shipping_speed_categories))
         data.update(self._get_items_as_params(items))
-        return self.make_request(data, 'GET')
+        return self.make_request(data, 'GET', timeout=timeout)
 
     def create_fulfillment_order(
             self, order_id, items, destination_address, order_date, comments,
@@ -1,10 +1,10 @@
 import logging
 import oscar_mws
 
-from django.db.models import get_model
 from django.core.exceptions import ImproperlyConfigured
 
 from . import api
+from .registry import get_merchant
 
 logger = logging.getLogger('oscar_mws')
 
@@ -13,6 +13,13 @@ _mws_connections = {}
 
 
 class Connection(object):
+    """
+    Connection to MWS for the merchant account with *merchant_id*. The API
+    clients are created once per connection and reused for all requests, so
+    that their HTTP session and the prepared request signature are kept. A
+    new connection is created when the merchant account changes, see
+    :func:`get_merchant_connection`.
+    """
     API_CLASSES = {
         'feeds': api.Feeds,
         'outbound': api.OutboundShipments,
@@ -26,17 +33,17 @@ class Connection(object):
     }
 
     def __init__(self, merchant_id):
-        MerchantAccount = get_model('oscar_mws', 'MerchantAccount')
-        try:
-            merchant = MerchantAccount.objects.get(seller_id=merchant_id)
-        except MerchantAccount.DoesNotExist:
+        merchant = get_merchant(merchant_id)
+        if merchant is None:
             raise ImproperlyConfigured(
                 "Could not find merchant with ID {0}".format(merchant_id)
             )
+        self.merchant = merchant
         self.merchant_id = merchant_id
         self.access_key = merchant.aws_api_key
         self.secret_key = merchant.aws_api_secret
         self.region_endpoint = self.get_endpoint(merchant.region)
+        self._apis = {}
 
     def get_connection_kwargs(self):
         return {
@@ -50,28 +57,33 @@ class Connection(object):
         return oscar_mws.MWS_REGION_ENDPOINTS.get(region, None)
 
     def get_api_class(self, name):
+        try:
+            return self._apis[name]
+        except KeyError:
+            pass
         try:
             conn = self.API_CLASSES[name]
         except KeyError:
             raise ImproperlyConfigured(
                 'API {0} is not a valid MWS API class'.format(name))
-        return conn(**self.get_connection_kwargs())
+        api_instance = self._apis[name] = conn(**self.get_connection_kwargs())
+        return api_instance
 
 
 def get_merchant_connection(merchant_id, api_name):
     global _mws_connections
 
-    if merchant_id in _mws_connections:
-        return _mws_connections[merchant_id].get_api_class(api_name)
-
-    try:
-        connection = Connection(merchant_id)
-    except ImproperlyConfigured as exc:
-        logger.error(exc.message)
-        return None
+    # connections are rebuilt when the merchant account has changed
+    connection = _mws_connections.get(merchant_id)
+    if connection is None or connection.merchant != get_merchant(merchant_id):
+        try:
+            connection = Connection(merchant_id)
+        except ImproperlyConfigured as exc:
+            logger.error(exc.message)
+            return None
+        _mws_connections[merchant_id] = connection
 
-    _mws_connections[merchant_id] = connection
-    return _mws_connections[merchant_id].get_api_class(api_name)
+    return connection.get_api_class(api_name)
 
 
 def reset_connections():
@@ -23,6 +23,9 @@ class OscarMwsDashboardApplication(Application):
     submission_detail_view = views.SubmissionDetailView
     submission_update_view = views.SubmissionUpdateView
 
+    job_detail_view = views.MwsJobDetailView
+    job_status_view = views.MwsJobStatusView
+
     fulfillment_order_create_view = views.FulfillmentOrderCreateView
     fulfillment_order_update_view = views.FulfillmentOrderUpdateView
     fulfillment_order_detail_view = views.FulfillmentOrderDetailView
@@ -85,6 +88,16 @@ class OscarMwsDashboardApplication(Application):
                 self.submission_update_view.as_view(),
                 name='submission-update'
             ),
+            url(
+                r'^job/(?P<pk>\d+)/$',
+                self.job_detail_view.as_view(),
+                name='job-detail'
+            ),
+            url(
+                r'^job/(?P<pk>\d+)/status/$',
+                self.job_status_view.as_view(),
+                name='job-status'
+            ),
             url(
                 r'^fulfillment/create/(?P<order_number>[\w-]+)/$',
                 self.fulfillment_order_create_view.as_view(),
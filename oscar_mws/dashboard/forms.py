@@ -2,6 +2,10 @@
 from django.db.models import get_model
 from django.utils.translation import ugettext_lazy as _
 
+from ..abstract_models import FEED_TYPES, PROCESSING_STATUSES
+
+MerchantAccount = get_model('oscar_mws', 'MerchantAccount')
+AmazonProfile = get_model('oscar_mws', 'AmazonProfile')
 AmazonMarketplace = get_model('oscar_mws', 'AmazonMarketplace')
 
 
@@ -29,6 +33,89 @@ class MwsProductFeedForm(forms.Form):
         self.fields['marketplace'].queryset = AmazonMarketplace.objects.all()
 
 
+class ProductSearchForm(forms.Form):
+    NOT_SUBMITTED = 'none'
+
+    marketplace = forms.ModelChoiceField(
+        queryset=AmazonMarketplace.objects.none(),
+        required=False,
+        empty_label=_("All marketplaces"),
+        label=_("Marketplace"),
+    )
+    fulfillment_by = forms.ChoiceField(
+        choices=(('', _("All fulfillment channels")),) +
+        AmazonProfile.FULFILLMENT_TYPES,
+        required=False,
+        label=_("Fulfillment by"),
+    )
+    last_feed_result = forms.ChoiceField(
+        choices=(('', _("All feed results")),) + AmazonProfile.FEED_RESULTS +
+        ((NOT_SUBMITTED, _("Not processed")),),
+        required=False,
+        label=_("Last feed result"),
+    )
+
+    def __init__(self, *args, **kwargs):
+        super(ProductSearchForm, self).__init__(*args, **kwargs)
+        self.fields['marketplace'].queryset = AmazonMarketplace.objects.all()
+
+    def get_filters(self):
+        """
+        Get the lookups for the selected filters. All of them filter on
+        indexed columns of the Amazon profile.
+        """
+        filters = {}
+        if not self.is_valid():
+            return filters
+        data = self.cleaned_data
+        if data.get('marketplace'):
+            filters['amazon_profile__marketplaces'] = data['marketplace']
+        if data.get('fulfillment_by'):
+            filters['amazon_profile__fulfillment_by'] = data['fulfillment_by']
+        if data.get('last_feed_result') == self.NOT_SUBMITTED:
+            filters['amazon_profile__last_feed_result'] = ''
+        elif data.get('last_feed_result'):
+            filters['amazon_profile__last_feed_result'] = \
+                data['last_feed_result']
+        return filters
+
+
+class SubmissionSearchForm(forms.Form):
+    processing_status = forms.ChoiceField(
+        choices=(('', _("All statuses")),) + PROCESSING_STATUSES,
+        required=False,
+        label=_("Processing status"),
+    )
+    feed_type = forms.ChoiceField(
+        choices=(('', _("All feed types")),) + FEED_TYPES,
+        required=False,
+        label=_("Feed type"),
+    )
+    merchant = forms.ModelChoiceField(
+        queryset=MerchantAccount.objects.none(),
+        required=False,
+        empty_label=_("All merchants"),
+        label=_("Merchant account"),
+    )
+
+    def __init__(self, *args, **kwargs):
+        super(SubmissionSearchForm, self).__init__(*args, **kwargs)
+        self.fields['merchant'].queryset = MerchantAccount.objects.all()
+
+    def get_filters(self):
+        """
+        Get the lookups for the selected filters. Each of them uses one of
+        the columns indexed together with the date of the last update.
+        """
+        filters = {}
+        if not self.is_valid():
+            return filters
+        for name in ('processing_status', 'feed_type', 'merchant'):
+            if self.cleaned_data.get(name):
+                filters[name] = self.cleaned_data[name]
+        return filters
+
+
 class AmazonProfileUpdateForm(forms.ModelForm):
     class Meta:
         model = get_model('oscar_mws', 'AmazonProfile')
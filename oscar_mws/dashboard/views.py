@@ -1,11 +1,14 @@
+import json
 import logging
 import oscar_mws
 
+from dateutil import parser as du_parser
+
 from django import forms
-from django.http import Http404, HttpResponseRedirect
+from django.http import Http404, HttpResponse, HttpResponseRedirect
 from django.views import generic
 from django.contrib import messages
-from django.db.models import Q, get_model
+from django.db.models import Max, Q, get_model
 from django.views.generic.edit import FormMixin
 from django.utils.translation import ugettext_lazy as _
 from django.core.urlresolvers import reverse, reverse_lazy
@@ -13,6 +16,7 @@ from django.core.urlresolvers import reverse, reverse_lazy
 from . import forms as dashboard_forms
 
 from ..api import MWSError
+from ..jobs import create_job
 from ..feeds import gateway as feeds_gw
 from ..abstract_models import STATUS_DONE
 from ..connection import reset_connections
@@ -20,8 +24,9 @@ from ..seller.gateway import update_marketplaces
 
 from ..fulfillment import MwsFulfillmentError
 from ..fulfillment.creator import FulfillmentOrderCreator
+from ..fulfillment.timeline import get_fulfillment_timeline
 from ..fulfillment.gateway import (
-    update_fulfillment_orders, update_inventory, submit_fulfillment_orders)
+    update_fulfillment_orders, submit_fulfillment_orders)
 
 logger = logging.getLogger('oscar_mws')
 
@@ -32,12 +37,15 @@ FeedSubmission = get_model("oscar_mws", "FeedSubmission")
 MerchantAccount = get_model("oscar_mws", "MerchantAccount")
 FulfillmentOrder = get_model("oscar_mws", "FulfillmentOrder")
 AmazonMarketplace = get_model("oscar_mws", "AmazonMarketplace")
+MwsJob = get_model("oscar_mws", "MwsJob")
 
 
 class ProductListView(FormMixin, generic.ListView):
     template_name = 'oscar_mws/dashboard/product_list.html'
     context_object_name = 'product_list'
     form_class = dashboard_forms.MwsProductFeedForm
+    search_form_class = dashboard_forms.ProductSearchForm
+    paginate_by = 100
 
     def make_object_list(self):
         self.object_list = self.get_queryset()
@@ -63,102 +71,56 @@ class ProductListView(FormMixin, generic.ListView):
 
     def get_context_data(self, **kwargs):
         kwargs['object_list'] = self.object_list
-        kwargs[self.context_object_name] = self.object_list
         ctx = super(ProductListView, self).get_context_data(**kwargs)
+        products = list(ctx['object_list'])
+        self.add_amazon_details(products)
+        ctx['object_list'] = ctx[self.context_object_name] = products
+        ctx['search_form'] = self.search_form
         form_class = self.get_form_class()
         ctx['form'] = self.get_form(form_class)
         return ctx
 
     def get_queryset(self):
-        return Product.objects.prefetch_related('amazon_profile')
-
-    def handle_update_stock(self, marketplace, form):
-        products = self.get_selected_products(form)
-        if not products:
-            products = Product.objects.filter(Q(amazon_profile__isnull=False))
-        try:
-            update_inventory(products)
-        except MWSError:
-            messages.error(
-                self.request, "An error occured updating available stock")
-        else:
-            messages.info(
-                self.request, "Successfully updated available stock")
-
-    def handle_submit_product_feed(self, marketplace, form):
-        products = self.get_selected_products(form)
+        self.search_form = self.search_form_class(self.request.GET or None)
+        return Product.objects.filter(
+            **self.search_form.get_filters()
+        ).select_related('amazon_profile').prefetch_related('images')
+
+    def add_amazon_details(self, products):
+        """
+        Add the marketplaces of the Amazon profile as ``mws_marketplaces``
+        and the date of the last feed submission as ``date_last_submitted``
+        to each of the *products* on the current page. Each of them is
+        loaded with a single query for all products.
+        """
+        products_by_profile = {}
+        for product in products:
+            product.mws_marketplaces = []
+            product.date_last_submitted = None
+            try:
+                products_by_profile[product.amazon_profile.id] = product
+            except AmazonProfile.DoesNotExist:
+                pass
         if not products:
-            products = Product.objects.filter(
-                Q(amazon_profile=None) | Q(amazon_profile__asin=u''))
-        try:
-            submissions = feeds_gw.submit_product_feed(
-                products=products, marketplaces=[marketplace])
-        except feeds_gw.MwsFeedError:
-            messages.info(
-                self.request,
-                ("cannot submit products to marketplaces of different "
-                 "merchants within the same feed"))
-            return
-        except MWSError:
-            messages.info(self.request, "Submitting feed to MWS failed")
             return
 
-        submission_links = []
-        for submission in submissions:
-            submission_links.append(
-                "<a href='{0}'>{1}</a>".format(
-                    reverse(
-                        'mws-dashboard:submission-detail',
-                        kwargs={'submission_id': submission.submission_id}),
-                    submission.submission_id))
-        messages.info(
-            self.request,
-            "Submitted succesfully as ID(s) {0}".format(
-                ', '.join(submission_links)
-            ),
-            extra_tags='safe',
-        )
-
-    def handle_switch_to_afn(self, marketplace, form):
-        products = self.get_selected_products(form)
-        if not products:
-            products = Product.objects.filter(
-                Q(amazon_profile=None) |
-                Q(amazon_profile__marketplaces=marketplace)
-            )
-        if not products:
-            messages.error(
-                self.request, _('No products specified to switch to AFN'))
-            return
-        AmazonProfile.objects.filter(
-            product__in=[p.id for p in products],
-        ).update(
-            fulfillment_by=AmazonProfile.FULFILLMENT_BY_AMAZON
-        )
-        try:
-            submission = feeds_gw.switch_product_fulfillment(
-                marketplace, products=products)
-        except MWSError:
-            messages.info(self.request, "Submitting feed failed")
-        else:
-            messages.info(
-                self.request, "Submitted succesfully as ID {0}".format(
-                    submission.submission_id))
-
-    def handle_update_product_identifiers(self, marketplace, form):
-        products = self.get_selected_products(form)
-        if not products:
-            products = Product.objects.filter(
-                amazon_profile__marketplaces__isnull=False
-            )
-        try:
-            feeds_gw.update_product_identifiers(marketplace.merchant, products)
-        except MWSError as exc:
-            messages.error(self.request,
-                           "An error occurred retrieving product data from "
-                           "Amazon: {0}".format(exc.message))
-        else:
-            messages.info(self.request, "Updated product ASINs")
+        ProfileMarketplace = AmazonProfile.marketplaces.through
+        links = ProfileMarketplace.objects.filter(
+            amazonprofile__in=products_by_profile.keys()
+        ).select_related('amazonmarketplace__merchant')
+        for link in links:
+            product = products_by_profile[link.amazonprofile_id]
+            product.mws_marketplaces.append(link.amazonmarketplace)
+
+        SubmittedProduct = FeedSubmission.submitted_products.through
+        products_by_id = dict((p.id, p) for p in products)
+        submitted = SubmittedProduct.objects.filter(
+            product__in=products_by_id.keys()
+        ).values('product').annotate(
+            date_updated=Max('feedsubmission__date_updated'))
+        for values in submitted:
+            products_by_id[values['product']].date_last_submitted = \
+                values['date_updated']
 
     def form_valid(self, form):
         marketplace = form.cleaned_data.get('marketplace')
@@ -168,17 +130,21 @@ class ProductListView(FormMixin, generic.ListView):
                 _("No merchant account for Amazon selected but required.")
             )
             return self.render_to_response(self.get_context_data())
-        selected = form.cleaned_data.get('submission_selection')
-        if selected and hasattr(self, 'handle_{0}'.format(selected)):
-            getattr(self, 'handle_{0}'.format(selected))(marketplace, form)
-
-        return self.render_to_response(self.get_context_data())
+        action = form.cleaned_data.get('submission_selection')
+        job = create_job(action, marketplace, self.get_selected_products(form))
+        messages.info(
+            self.request,
+            _("The action will be run in the background as job #{0}").format(
+                job.id))
+        return HttpResponseRedirect(
+            reverse('mws-dashboard:job-detail', kwargs={'pk': job.id}))
 
     def get_selected_products(self, form):
         profile_ids = map(int, form.data.getlist('selected_profiles'))
         if not profile_ids:
-            return Product.objects.none()
-        return Product.objects.filter(amazon_profile__id__in=profile_ids)
+            return []
+        return list(Product.objects.filter(
+            amazon_profile__id__in=profile_ids).values_list('id', flat=True))
 
     def post(self, request, *args, **kwargs):
         self.make_object_list()
@@ -220,15 +186,111 @@ class AmazonProfileUpdateView(generic.UpdateView):
     success_url = reverse_lazy('mws-dashboard:profile-list')
 
 
+def get_submission_cursor(submission):
+    return u"{0}_{1}".format(submission.date_updated.isoformat(),
+                             submission.id)
+
+
+def parse_submission_cursor(cursor):
+    """
+    Parse a *cursor* created by :func:`get_submission_cursor` into a tuple
+    of update date and submission ID. Returns ``None`` for invalid cursors.
+    """
+    try:
+        date_updated, submission_id = cursor.rsplit('_', 1)
+        return du_parser.parse(date_updated), int(submission_id)
+    except (AttributeError, ValueError, OverflowError):
+        return None
+
+
 class SubmissionListView(generic.ListView):
+    """
+    List feed submissions, the most recently updated first. The list is
+    paginated by seeking to the submission after (or before) the last (or
+    first) submission of the current page instead of using an offset. This
+    uses the indexes on ``(date_updated, id)`` and doesn't require counting
+    all submissions, which keeps each page fast independent of the total
+    number of submissions.
+    """
     template_name = 'oscar_mws/dashboard/submission_list.html'
     context_object_name = 'submission_list'
     model = FeedSubmission
+    form_class = dashboard_forms.SubmissionSearchForm
+    paginate_by = 50
+
+    def get(self, request, *args, **kwargs):
+        self.form = self.form_class(request.GET or None)
+        return super(SubmissionListView, self).get(request, *args, **kwargs)
 
     def get_queryset(self):
-        return self.model.objects.prefetch_related(
-            'report'
-        ).order_by('-date_updated')
+        # the report is a one-to-one relation and provides the summary
+        # counts, the submitted feed itself is never loaded here
+        return self.model.objects.filter(
+            **self.form.get_filters()
+        ).select_related('report')
+
+    def paginate_queryset(self, queryset, page_size):
+        after = parse_submission_cursor(self.request.GET.get('after'))
+        before = parse_submission_cursor(self.request.GET.get('before'))
+
+        if before:
+            date_updated, submission_id = before
+            queryset = queryset.filter(
+                Q(date_updated__gt=date_updated) |
+                Q(date_updated=date_updated, id__gt=submission_id)
+            ).order_by('date_updated', 'id')
+        else:
+            queryset = queryset.order_by('-date_updated', '-id')
+            if after:
+                date_updated, submission_id = after
+                queryset = queryset.filter(
+                    Q(date_updated__lt=date_updated) |
+                    Q(date_updated=date_updated, id__lt=submission_id))
+
+        # fetching one additional submission tells us whether there is
+        # another page without counting all matching submissions
+        submissions = list(queryset[:page_size + 1])
+        has_more = len(submissions) > page_size
+        submissions = submissions[:page_size]
+        if before:
+            submissions.reverse()
+            has_previous, has_next = has_more, True
+        else:
+            has_previous, has_next = bool(after), has_more
+        return submissions, has_previous, has_next
+
+    def get_page_url(self, **kwargs):
+        params = self.request.GET.copy()
+        for name in ('after', 'before'):
+            params.pop(name, None)
+        params.update(kwargs)
+        return u"?{0}".format(params.urlencode())
+
+    def get_context_data(self, **kwargs):
+        # the list mixin would paginate by counting all submissions, only
+        # the base context is used. ``get`` passes the unpaginated queryset
+        # as ``object_list`` which has to be replaced by the current page.
+        kwargs.pop('object_list', None)
+        ctx = super(generic.list.MultipleObjectMixin, self).get_context_data(
+            **kwargs)
+
+        submissions, has_previous, has_next = self.paginate_queryset(
+            self.object_list, self.get_paginate_by(self.object_list))
+        if not submissions:
+            has_previous = has_next = False
+        ctx.update({
+            'form': self.form,
+            'is_paginated': has_previous or has_next,
+            'object_list': submissions,
+            self.context_object_name: submissions,
+        })
+        if has_previous:
+            ctx['previous_page_url'] = self.get_page_url(
+                before=get_submission_cursor(submissions[0]))
+        if has_next:
+            ctx['next_page_url'] = self.get_page_url(
+                after=get_submission_cursor(submissions[-1]))
+        return ctx
 
 
 class SubmissionDetailView(generic.DetailView):
@@ -378,6 +440,43 @@ class FulfillmentOrderDetailView(generic.DetailView):
             raise Http404
         return instance[0]
 
+    def get_context_data(self, **kwargs):
+        ctx = super(FulfillmentOrderDetailView, self).get_context_data(
+            **kwargs)
+        ctx['timeline'] = get_fulfillment_timeline(self.object)
+        return ctx
+
+
+class MwsJobDetailView(generic.DetailView):
+    model = MwsJob
+    context_object_name = 'job'
+    template_name = 'oscar_mws/dashboard/job_detail.html'
+    max_errors = 100
+
+    def get_context_data(self, **kwargs):
+        ctx = super(MwsJobDetailView, self).get_context_data(**kwargs)
+        ctx['job_errors'] = self.object.errors.select_related(
+            'product')[:self.max_errors]
+        return ctx
+
+
+class MwsJobStatusView(generic.View):
+    """
+    Return the status and progress counters of a job as JSON. This is polled
+    by the job detail page while the job is running and only loads the
+    counters of the job.
+    """
+    fields = ('status', 'num_total', 'num_processed', 'num_failed')
+
+    def get(self, request, *args, **kwargs):
+        try:
+            status = MwsJob.objects.filter(
+                pk=kwargs.get('pk')).values(*self.fields)[0]
+        except IndexError:
+            raise Http404
+        return HttpResponse(json.dumps(status),
+                            content_type='application/json')
+
 
 class MerchantListView(generic.ListView):
     model = MerchantAccount
@@ -6,6 +6,75 @@ MWS_FULFILLMENT_MERCHANT_FINDER = \
 
 MWS_DEFAULT_SHIPPING_SPEED = 'Standard'
 
+# Fulfillment previews are cached in memory for the given number of seconds
+MWS_FULFILLMENT_PREVIEW_TIMEOUT = 900
+MWS_FULFILLMENT_PREVIEW_CACHE_SIZE = 1000
+MWS_FULFILLMENT_PREVIEW_WAIT = 5
+# Number of seconds to wait for MWS to respond to a preview request
+MWS_FULFILLMENT_PREVIEW_REQUEST_TIMEOUT = 3
+
+# Number of seconds the shipping timeline of a fulfillment order is cached
+MWS_FULFILLMENT_TIMELINE_TIMEOUT = 3600
+
+# Feed submissions are polled when they are expected to be done based on the
+# processing times of previous feeds. The default processing time is used
+# until enough feeds have been processed.
+MWS_FEED_DEFAULT_PROCESSING_TIME = 300
+MWS_FEED_POLL_MIN_INTERVAL = 60
+MWS_FEED_POLL_MAX_INTERVAL = 1800
+MWS_FEED_POLL_BATCH_WINDOW = 60
+
+# Pending report requests are polled with an interval that doubles after each
+# poll starting at MWS_REPORT_POLL_INTERVAL seconds up to the maximum interval
+MWS_REPORT_POLL_INTERVAL = 60
+MWS_REPORT_POLL_MAX_INTERVAL = 900
+
+# Mapping of report types to the callables processing downloaded reports
+MWS_REPORT_HANDLERS = {
+    '_GET_MERCHANT_LISTINGS_DATA_':
+    'oscar_mws.reports.handlers.reconcile_listings_report',
+}
+# Number of times downloading and processing a report is attempted
+MWS_REPORT_MAX_ATTEMPTS = 5
+# Number of seconds after which a report claimed for processing by a process
+# that died can be processed again
+MWS_REPORT_CLAIM_TIMEOUT = 3600
+
+# Number of products processed in one batch by jobs for dashboard actions
+MWS_JOB_BATCH_SIZE = 100
+# Number of seconds after which running jobs are considered dead and failed
+MWS_JOB_TIMEOUT = 21600
+
+# Maximum number of packages updated in one tracking sweep
+MWS_PACKAGE_TRACKING_BATCH_SIZE = 100
+# Number of seconds between tracking updates for recently shipped packages
+MWS_PACKAGE_TRACKING_INTERVAL = 14400
+# Number of days after shipping that packages are tracked
+MWS_PACKAGE_TRACKING_MAX_AGE = 60
+
+# Number of days of updated orders imported by the first order import
+MWS_ORDERS_INITIAL_SYNC_DAYS = 30
+# Mapping of Amazon order statuses to the statuses of imported Oscar orders
+MWS_ORDER_STATUS_MAP = {
+    'Pending': 'Pending',
+    'PendingAvailability': 'Pending',
+    'Unshipped': 'Pending',
+    'PartiallyShipped': 'Being processed',
+    'Shipped': 'Complete',
+    'InvoiceUnconfirmed': 'Complete',
+    'Canceled': 'Cancelled',
+    'Unfulfillable': 'Cancelled',
+}
+
+# Merchant accounts are looked up in an in-process cache of this size backed
+# by the Django cache for the given number of seconds
+MWS_MERCHANT_REGISTRY_SIZE = 100
+MWS_MERCHANT_REGISTRY_TIMEOUT = 3600
+
+# Sinks that receive the metrics of every request to MWS, either dotted paths
+# of sink classes or tuples of the path and keyword arguments for the class
+MWS_INSTRUMENTATION_SINKS = []
+
 MWS_DASHBOARD_NAVIGATION = [
     {
         'label': _('Amazon MWS'),
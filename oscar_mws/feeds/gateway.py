@@ -1,10 +1,16 @@
+import sys
 import logging
+import tempfile
 
+from collections import defaultdict
 from dateutil.parser import parse as du_parse
 
+from django.db import transaction
 from django.db.models import get_model
+from django.utils.timezone import now as tz_now
 
-from ..api import MWSError
+from ..api import MWSError, iter_chunks
+from ..utils import chunks, get_request_throttle
 from .. import abstract_models as am
 from ..connection import get_merchant_connection
 from ..feeds import writers
@@ -23,24 +29,36 @@ OP_TYPE_UPDATE = 'Update'
 OP_TYPE_PARTIAL_UPDATE = 'PartialUpdate'
 OP_TYPE_DELETE = 'Delete'
 
+# Maximum number of submission IDs in a GetFeedSubmissionList request
+MAX_FEED_SUBMISSION_IDS = 100
+
+# Request quota and restore rate in seconds of GetMatchingProductForId. MWS
+# restores 5 IDs per second and the identifiers are requested one at a time.
+MATCHING_PRODUCT_QUOTA = (20, 0.2)
+
 
 class MwsFeedError(BaseException):
     """ Represents an error that is specific to the Feed API of MWS. """
     pass
 
 
-def handle_feed_submission_response(merchant, response, feed_xml=None):
+def handle_feed_submission_response(merchant, response, feed_xml=None,
+                                    num_messages=None, feed_file=None):
     """
     Processes the response received from MWS when submitting an XML feed. It
     creates a new :class:`FeedSubmission <oscar_mws.models.FeedSubmission>`
     from the ID in the *response* as well as submission metadata such as the
     feed submission date. If the original XML is passed in as *feed_xml* it
     is stored with the feed submission for reference and easier debugging.
+    Large feeds can be passed in as *feed_file* instead, which is read from
+    the start in chunks.
 
     :param MerchantAccount merchant: the merchant account the feed was
         submitted to.
     :param response: the original response dict returned by MWS.
     :param str feed_xml: XML submitted to MWS or None
+    :param int num_messages: number of messages in the feed. It is used to
+        estimate the processing time of the feed.
     """
     fsinfo = response.FeedSubmissionInfo
     try:
@@ -57,22 +75,37 @@ def handle_feed_submission_response(merchant, response, feed_xml=None):
         )
         if feed_xml:
             submission.feed_xml = feed_xml
+        elif feed_file is not None:
+            FeedContent = get_model('oscar_mws', 'FeedContent')
+            feed_file.seek(0)
+            submission.feed_content = FeedContent.from_file(feed_file)
 
     submission.merchant = merchant
     submission.processing_status = fsinfo.FeedProcessingStatus
+    if num_messages is not None:
+        submission.num_messages = num_messages
     submission.save()
     logger.info(
         "Feed submission successful as ID {}".format(submission.submission_id))
     return submission
 
 
+def print_feed(feed_file):
+    for chunk in iter_chunks(feed_file):
+        sys.stdout.write(chunk)
+    sys.stdout.write('\n')
+
+
 def submit_product_feed(products, marketplaces, dry_run=False,
                         operation_type=OP_TYPE_UPDATE):
     """
     Generate a product feed for the list of *products* and submit it to
     Amazon. The submission ID returned by them is used to create a
     FeedSubmission to log the progress of the submission as well as the
-    products that are handled as part of the submission.
+    products that are handled as part of the submission. If *products* is a
+    queryset, the products are streamed from the database. The feed is
+    written to a temporary file message by message and uploaded from there,
+    so that memory usage doesn't grow with the number of products.
 
     A list of *marketplaces* is also required that specify the Amazon
     marketplaces to submit the product(s) to. The marketplaces have to be
@@ -80,7 +113,7 @@ def submit_product_feed(products, marketplaces, dry_run=False,
     specified. If either of these restrictions is violated, the feed will be
     rejected by Amazon.
 
-    :param list products: list of Oscar products to be submitted
+    :param list products: list or queryset of Oscar products to be submitted
     :param list marketplaces: list of AmazonMarketplaces to make the products
         available on
     :param boolean dry_run: flag to specify dry run mode. If ``True`` the XML
@@ -103,49 +136,83 @@ def submit_product_feed(products, marketplaces, dry_run=False,
             "Marketplaces of different merchant accounts specified. This "
             "is invalid, please only use marketplaces for the same seller")
 
-    submissions = []
-    for marketplace in marketplaces:
-        merchant = marketplace.merchant
-        logger.info(
-            "Updating {0} products for seller ID {1}".format(
-                len(products), merchant.seller_id))
-
-        writer = writers.ProductFeedWriter(merchant_id=merchant.seller_id)
+    if not marketplaces:
+        return []
+    if hasattr(products, 'iterator'):
+        product_ids = products.order_by().values_list('id', flat=True)
+        products = products.iterator()
+    else:
+        products = list(products)
+        product_ids = [p.id for p in products]
+
+    # all marketplaces belong to the same merchant and get the same feed
+    merchant = marketplaces[0].merchant
+    feed_file = tempfile.TemporaryFile()
+    try:
+        writer = writers.ProductFeedWriter(
+            merchant_id=merchant.seller_id, feed_file=feed_file)
         for product in products:
             writer.add_product(product)
-        xml_data = writer.as_string(pretty_print=dry_run)
-
-        logger.debug("Product feed XML to be submitted:\n{0}".format(xml_data))
+        writer.close()
 
         if dry_run:
-            print xml_data
+            print_feed(feed_file)
             return
 
-        feeds_api = get_merchant_connection(merchant.seller_id, 'feeds')
-        try:
-            response = feeds_api.submit_feed(
-                feed=xml_data, feed_type=am.TYPE_POST_PRODUCT_DATA,
-                marketplaceids=marketplace_ids or merchant.marketplace_ids)
-        except MWSError:
-            logger.error(
-                "could not submit product feed to MWS", exc_info=1,
-                extra={'seller_id': merchant.seller_id,
-                       'marketplace_id': marketplace.marketplace_id,
-                       'product_ids': [p.id for p in products],
-                       'feed_xml': xml_data})
-            raise
-        submission = handle_feed_submission_response(merchant, response.parsed,
-                                                     feed_xml=xml_data)
-        for product in products:
-            submission.submitted_products.add(product)
-        submissions.append(submission)
-    return submissions
+        submissions = []
+        for marketplace in marketplaces:
+            logger.info(
+                "Updating {0} products for seller ID {1}".format(
+                    writer.num_messages, merchant.seller_id))
+
+            feeds_api = get_merchant_connection(merchant.seller_id, 'feeds')
+            feed_file.seek(0)
+            try:
+                response = feeds_api.submit_feed(
+                    feed=feed_file, feed_type=am.TYPE_POST_PRODUCT_DATA,
+                    marketplaceids=marketplace_ids or merchant.marketplace_ids)
+            except MWSError:
+                logger.error(
+                    "could not submit product feed to MWS", exc_info=1,
+                    extra={'seller_id': merchant.seller_id,
+                           'marketplace_id': marketplace.marketplace_id,
+                           'num_messages': writer.num_messages})
+                raise
+            submission = handle_feed_submission_response(
+                merchant, response.parsed, feed_file=feed_file,
+                num_messages=writer.num_messages)
+            submitted_ids = product_ids
+            if hasattr(submitted_ids, 'iterator'):
+                submitted_ids = submitted_ids.iterator()
+            for batch in chunks(submitted_ids, 500):
+                submission.submitted_products.add(*batch)
+            submissions.append(submission)
+        return submissions
+    finally:
+        feed_file.close()
+
+
+def get_date_completed(info, now=None):
+    """
+    Get the date a feed submission described by *info* completed processing
+    or ``None`` if it is still pending. Feeds that are ``_DONE_`` or
+    ``_CANCELLED_`` without a ``CompletedProcessingDate`` are considered
+    completed *now*.
+    """
+    date_completed = info.get('CompletedProcessingDate')
+    if date_completed:
+        return du_parse(date_completed)
+    if info.FeedProcessingStatus in [am.STATUS_DONE, am.STATUS_CANCELLED]:
+        return now or tz_now()
+    return None
 
 
 def update_feed_submission(submission):
     """
     Retrieves the status of a submitted MWS feed stored in *submission* and
-    updates the ``processing_status`` of the feed submission.
+    updates the ``processing_status`` of the feed submission. Once the feed
+    is ``_DONE_`` or ``_CANCELLED_``, its completion date is stored as well
+    and it is no longer scheduled for polling.
 
     :param FeedSubmission submission: a FeedSubmission instance
     :rtype FeedSubmission: updated submission instanceh
@@ -169,54 +236,153 @@ def update_feed_submission(submission):
 
     for result in response.get_list('FeedSubmissionInfo'):
         submission.processing_status = result.FeedProcessingStatus
+        date_completed = get_date_completed(result)
+        if date_completed:
+            submission.date_completed = date_completed
+            submission.date_next_poll = None
         submission.save()
     return submission
 
 
-def update_feed_submissions(merchant):
+def iter_feed_submission_info(feeds_api, submission_ids=None):
+    """
+    Iterate over the feed submission info for all *submission_ids*. The IDs
+    are requested in batches of ``MAX_FEED_SUBMISSION_IDS`` and responses
+    that span several pages are followed using the ``NextToken``. If no IDs
+    are given, the most recent feed submissions are requested.
+
+    :raises MWSError: if an error occurs when communicating with MWS
     """
-    Check the MWS API for updates on previously submitted feeds. If
-    *submission_id* is specified only the feed submission matching that ID
-    is requested. Otherwise, all submission that are stored in the database
-    that are not _DONE_ or _CANCELLED_ are requested.
+    if submission_ids:
+        batches = chunks(sorted(submission_ids), MAX_FEED_SUBMISSION_IDS)
+    else:
+        batches = [None]
 
-    Returns List of updated ``FeedSubmission`` instances.
+    for batch in batches:
+        response = feeds_api.get_feed_submission_list(
+            feedids=batch, max_count=len(batch) if batch else None).parsed
+        while True:
+            for info in response.get_list('FeedSubmissionInfo'):
+                yield info
+            if response.get('HasNext') != 'true':
+                break
+            response = feeds_api.get_submission_list_by_next_token(
+                token=response.NextToken).parsed
+
+
+def update_feed_submissions(merchant, submission_ids=None):
     """
-    submissions = FeedSubmission.objects.exclude(
-        processing_status__in=[am.STATUS_DONE, am.STATUS_CANCELLED],
-        merchant=merchant
-    )
+    Check the MWS API for updates on previously submitted feeds of
+    *merchant*. The submissions with the given *submission_ids* or, if no IDs
+    are given, all submissions stored in the database that are not
+    ``_DONE_`` or ``_CANCELLED_`` are requested in batches, see
+    :func:`iter_feed_submission_info`. If there are none, the most recent
+    feed submissions are requested instead and submissions unknown locally
+    are created.
+
+    The referenced submissions are loaded in a single query and only
+    submissions with a changed processing status are updated in bulk. Note
+    that this means that ``save`` is not called on the updated submissions.
+
+    :rtype list: the updated or created ``FeedSubmission`` instances.
+    :raises MWSError: if an error occurs when communicating with MWS
+    """
+    if submission_ids is not None:
+        pending_ids = submission_ids
+    else:
+        pending_ids = FeedSubmission.objects.filter(
+            merchant=merchant,
+        ).exclude(
+            processing_status__in=[am.STATUS_DONE, am.STATUS_CANCELLED],
+        ).values_list('submission_id', flat=True)
+
     feeds_api = get_merchant_connection(merchant.seller_id, 'feeds')
-    response = feeds_api.get_feed_submission_list(
-        feedids=[s.submission_id for s in submissions] or None
-    ).parsed
+    try:
+        infos = dict(
+            (info.FeedSubmissionId, info)
+            for info in iter_feed_submission_info(feeds_api, pending_ids))
+    except MWSError:
+        logger.error(
+            "updating status of feed submissions failed", exc_info=1,
+            extra={'seller_id': merchant.seller_id})
+        raise
 
-    if response.HasNext:
-        # TODO: need to handle this flag
-        response.NextToken
+    statuses = {}
+    for id_batch in chunks(infos.keys(), 500):
+        statuses.update(
+            (submission_id, (pk, status))
+            for submission_id, pk, status in FeedSubmission.objects.filter(
+                submission_id__in=id_batch,
+            ).values_list('submission_id', 'id', 'processing_status'))
+
+    now = tz_now()
+    changed = defaultdict(list)
+    completed = {}
+    new_submissions = []
+    updated_ids = []
+    for submission_id, info in infos.iteritems():
+        date_completed = get_date_completed(info, now)
+        if submission_id not in statuses:
+            updated_ids.append(submission_id)
+            new_submissions.append(FeedSubmission(
+                submission_id=submission_id,
+                date_submitted=du_parse(info.SubmittedDate),
+                date_completed=date_completed,
+                feed_type=info.FeedType,
+                processing_status=info.FeedProcessingStatus,
+                merchant=merchant,
+                date_created=now,
+                date_updated=now))
+            continue
+
+        pk, status = statuses[submission_id]
+        if status == info.FeedProcessingStatus:
+            continue
+        updated_ids.append(submission_id)
+        if date_completed:
+            completed[pk] = (info.FeedProcessingStatus, date_completed)
+        else:
+            changed[info.FeedProcessingStatus].append(pk)
+
+    with transaction.commit_on_success():
+        # the completion date is different for every submission
+        for pk, (status, date_completed) in completed.iteritems():
+            FeedSubmission.objects.filter(id=pk).update(
+                processing_status=status, date_completed=date_completed,
+                date_next_poll=None, date_updated=now)
+        for status, pks in changed.iteritems():
+            for pk_batch in chunks(pks, 500):
+                FeedSubmission.objects.filter(id__in=pk_batch).update(
+                    processing_status=status, date_updated=now)
+        FeedSubmission.objects.bulk_create(new_submissions)
 
     updated_feeds = []
-    for result in response.get_list('FeedSubmissionInfo'):
-        try:
-            submission = FeedSubmission.objects.get(
-                submission_id=result.FeedSubmissionId,
-                date_submitted=du_parse(result.SubmittedDate),
-                feed_type=result.FeedType,
-            )
-        except FeedSubmission.DoesNotExist:
-            submission = FeedSubmission(
-                submission_id=result.FeedSubmissionId,
-                date_submitted=du_parse(result.SubmittedDate),
-                feed_type=result.FeedType,
-            )
+    for id_batch in chunks(updated_ids, 500):
+        updated_feeds.extend(FeedSubmission.objects.filter(
+            submission_id__in=id_batch,
+        ).select_related('merchant'))
+    return updated_feeds
 
-        if submission.processing_status != result.FeedProcessingStatus:
-            updated_feeds.append(submission)
 
-        submission.merchant = merchant
-        submission.processing_status = result.FeedProcessingStatus
-        submission.save()
+def poll_feed_submissions(merchant, submission_ids=None):
+    """
+    Update the processing status of the feed submissions with
+    *submission_ids* or all pending feed submissions of *merchant*, see
+    :func:`update_feed_submissions`, and retrieve the processing results of
+    all submissions that are now ``_DONE_``.
 
+    :rtype list: the updated ``FeedSubmission`` instances.
+    :raises MWSError: if an error occurs when updating the feed submissions.
+    """
+    updated_feeds = update_feed_submissions(merchant, submission_ids)
+    for submission in updated_feeds:
+        if submission.processing_status != am.STATUS_DONE:
+            continue
+        try:
+            process_submission_results(submission)
+        except MWSError:
+            # the error is logged, results are requested again next time
+            continue
     return updated_feeds
 
 
@@ -348,9 +514,36 @@ def process_submission_results(submission):
                 else:
                     feed_result.product = product
             feed_result.save()
+
+        update_feed_results(submission, report.get_list('Result'))
     return reports
 
 
+def update_feed_results(submission, results):
+    """
+    Store the outcome of the processed *submission* on the Amazon profiles of
+    the submitted products. Products without a result in *results* have
+    been processed successfully, all others get the most severe result type
+    reported for their SKU. This is used to filter products by their feed
+    status without looking at the feed reports.
+    """
+    result_skus = defaultdict(set)
+    for result in results:
+        sku = result.get('AdditionalInfo', {}).get('SKU')
+        if sku:
+            result_skus[result.ResultCode].add(sku)
+
+    profiles = AmazonProfile.objects.filter(
+        product__in=submission.submitted_products.all())
+    profiles.update(last_feed_result=AmazonProfile.FEED_RESULT_SUCCESS)
+    # errors are applied last as they take precedence over warnings
+    for result_type in (AmazonProfile.FEED_RESULT_WARNING,
+                        AmazonProfile.FEED_RESULT_ERROR):
+        if result_skus[result_type]:
+            profiles.filter(sku__in=result_skus[result_type]).update(
+                last_feed_result=result_type)
+
+
 def update_product_identifiers(merchant, products):
     """
     Updates the identifiers ``SellerSKU`` and ``ASIN`` used by Amazon for the
@@ -360,13 +553,17 @@ def update_product_identifiers(merchant, products):
     marketplaces defined in its :class:`AmazonProfile
     <oscar_mws.models.AmazonProfile>`. The ``SellerSKU`` and ``ASIN`` received
     for each product are stored on the products :class:`Amazon Profile
-    <oscar_mws.models.AmazonProfile>`.
+    <oscar_mws.models.AmazonProfile>`. Requests are throttled to the
+    restore rate of ``GetMatchingProductForId``.
 
     :param MerchantAccount merchant: the merchant account to get IDs for
     :param list products: list of Oscar products to get IDs for
     :raises MWSError: if an error occurs communicating with MWS
     """
     prods_api = get_merchant_connection(merchant.seller_id, 'products')
+    throttle = get_request_throttle(
+        merchant.seller_id, 'GetMatchingProductForId',
+        *MATCHING_PRODUCT_QUOTA)
     for product in products:
         marketplace_ids = [
             m.marketplace_id for m in product.amazon_profile.marketplaces.all()
@@ -375,6 +572,7 @@ def update_product_identifiers(merchant, products):
             marketplace_ids = [None]
 
         for marketplace_id in marketplace_ids:
+            throttle.wait()
             try:
                 response = prods_api.get_matching_product_for_id(
                     marketplaceid=marketplace_id, type="SellerSKU",
@@ -419,8 +617,13 @@ def switch_product_fulfillment(marketplace, products, dry_run=False):
     stock information is discarded and handled by Amazon automatically based on
     inbound shipments (refer to the Amazon MWS documentation for more details).
 
+    If *products* is a queryset, the products are streamed from the database
+    together with their Amazon profile instead of loading all of them at
+    once. The feed is written to a temporary file message by message and
+    uploaded from there. Products without an Amazon profile are skipped.
+
     :param AmazonMarketplace marketplace: an Amazon marketplace instance
-    :param list products: a list of Oscar products
+    :param list products: a list or queryset of Oscar products
     :param boolean dry_run: flag to enable dry run. If set to ``True`` the
         generated XML is printed to stdout rather than submitted to MWS.
         Default: ``False``
@@ -430,35 +633,44 @@ def switch_product_fulfillment(marketplace, products, dry_run=False):
 
     :raises MWSError: if an error occurs while communicating with MWS.
     """
+    if hasattr(products, 'iterator'):
+        products = products.select_related('amazon_profile').iterator()
+
     seller_id = marketplace.merchant.seller_id
-    writer = writers.InventoryFeedWriter(seller_id)
-    for product in products:
-        writer.add_product(
-            product,
-            fulfillment_by=product.amazon_profile.fulfillment_by,
-            fulfillment_center_id=marketplace.fulfillment_center_id,
-        )
+    feed_file = tempfile.TemporaryFile()
+    try:
+        writer = writers.InventoryFeedWriter(seller_id, feed_file=feed_file)
+        for product in products:
+            try:
+                fulfillment_by = product.amazon_profile.fulfillment_by
+            except AmazonProfile.DoesNotExist:
+                continue
+            writer.add_product(
+                product,
+                fulfillment_by=fulfillment_by,
+                fulfillment_center_id=marketplace.fulfillment_center_id,
+            )
+        writer.close()
 
-    xml_data = writer.as_string(pretty_print=dry_run)
-    logger.debug(
-        "Submitting inventory feed with XML:\n{0}".format(xml_data)
-    )
-    if dry_run:
-        print xml_data
-        return
+        if dry_run:
+            print_feed(feed_file)
+            return
 
-    feeds_api = get_merchant_connection(
-        marketplace.merchant.seller_id, 'feeds')
-    try:
-        response = feeds_api.submit_feed(
-            feed=xml_data, feed_type=am.TYPE_POST_INVENTORY_AVAILABILITY_DATA,
-            marketplaceids=[marketplace.marketplace_id])
-    except MWSError:
-        logger.error(
-            "failed submitting feed to switch fulfillment", exc_info=1,
-            extra={'seller_id': seller_id, 'feed_xml': xml_data,
-                   'marketplace_id': marketplace.marketplace_id,
-                   'product_ids': [p.id for p in products]})
-        raise
-    return handle_feed_submission_response(
-        marketplace.merchant, response.parsed, feed_xml=xml_data)
+        feeds_api = get_merchant_connection(seller_id, 'feeds')
+        try:
+            response = feeds_api.submit_feed(
+                feed=feed_file,
+                feed_type=am.TYPE_POST_INVENTORY_AVAILABILITY_DATA,
+                marketplaceids=[marketplace.marketplace_id])
+        except MWSError:
+            logger.error(
+                "failed submitting feed to switch fulfillment", exc_info=1,
+                extra={'seller_id': seller_id,
+                       'marketplace_id': marketplace.marketplace_id,
+                       'num_messages': writer.num_messages})
+            raise
+        return handle_feed_submission_response(
+            marketplace.merchant, response.parsed, feed_file=feed_file,
+            num_messages=writer.num_messages)
+    finally:
+        feed_file.close()
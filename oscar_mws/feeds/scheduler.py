@@ -0,0 +1,204 @@
+from datetime import timedelta
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import get_model, Min
+from django.utils.timezone import now as tz_now
+
+from .. import abstract_models as am
+from ..utils import chunks
+from . import gateway
+
+FeedSubmission = get_model('oscar_mws', 'FeedSubmission')
+
+# Number of recently completed submissions used to learn processing times
+HISTORY_SIZE = 500
+
+
+def get_setting_interval(name, default):
+    return timedelta(seconds=getattr(settings, name, default))
+
+
+def get_size_bucket(num_messages):
+    """
+    Get the order of magnitude of *num_messages*, e.g. ``100`` for a feed
+    with 250 messages. Feeds of a similar size take a similar time to be
+    processed.
+    """
+    if not num_messages:
+        return None
+    return 10 ** (len(str(num_messages)) - 1)
+
+
+def get_pending_submissions(merchant=None):
+    submissions = FeedSubmission.objects.exclude(
+        processing_status__in=[am.STATUS_DONE, am.STATUS_CANCELLED])
+    if merchant is not None:
+        submissions = submissions.filter(merchant=merchant)
+    return submissions
+
+
+class ProcessingTimeEstimator(object):
+    """
+    Estimates the time MWS needs to process a feed from the processing times
+    of previously completed feeds. The estimate is the median processing
+    time of completed feeds with the same feed type, merchant and size. If
+    there are less than ``min_samples`` feeds available, less specific
+    groups of feeds are used, falling back to
+    ``MWS_FEED_DEFAULT_PROCESSING_TIME``.
+
+    :param history: iterable of tuples containing the feed type, merchant
+        ID, number of messages, submission and completion date of completed
+        feeds.
+    """
+    min_samples = 3
+
+    def __init__(self, history=()):
+        self.default = get_setting_interval(
+            'MWS_FEED_DEFAULT_PROCESSING_TIME', 300)
+        durations = defaultdict(list)
+        for (feed_type, merchant_id, num_messages,
+             date_submitted, date_completed) in history:
+            duration = max(date_completed - date_submitted, timedelta(0))
+            for key in self.get_keys(feed_type, merchant_id, num_messages):
+                durations[key].append(duration)
+
+        self.estimates = {}
+        for key, values in durations.iteritems():
+            if len(values) >= self.min_samples:
+                self.estimates[key] = sorted(values)[len(values) // 2]
+
+    @classmethod
+    def from_history(cls, size=HISTORY_SIZE):
+        history = FeedSubmission.objects.filter(
+            date_completed__isnull=False,
+        ).exclude(
+            processing_status=am.STATUS_CANCELLED,
+        ).order_by('-date_completed').values_list(
+            'feed_type', 'merchant_id', 'num_messages', 'date_submitted',
+            'date_completed')[:size]
+        return cls(history)
+
+    def get_keys(self, feed_type, merchant_id, num_messages):
+        return [(feed_type, merchant_id, get_size_bucket(num_messages)),
+                (feed_type, merchant_id),
+                (feed_type,)]
+
+    def estimate(self, feed_type, merchant_id, num_messages=None):
+        for key in self.get_keys(feed_type, merchant_id, num_messages):
+            if key in self.estimates:
+                return self.estimates[key]
+        return self.default
+
+
+def get_next_poll(expected_duration, date_submitted, now, is_polled=True):
+    """
+    Get the date to poll a feed submitted at *date_submitted* next. The feed
+    is polled when it is expected to be done. Feeds that take longer than
+    expected are polled after a quarter of the time they have been
+    processing so far or immediately if they haven't been polled yet. The
+    delay is always kept between ``MWS_FEED_POLL_MIN_INTERVAL`` and
+    ``MWS_FEED_POLL_MAX_INTERVAL``.
+    """
+    min_interval = get_setting_interval('MWS_FEED_POLL_MIN_INTERVAL', 60)
+    max_interval = get_setting_interval('MWS_FEED_POLL_MAX_INTERVAL', 1800)
+
+    delay = date_submitted + expected_duration - now
+    if delay < min_interval:
+        if not is_polled:
+            return now
+        delay = (now - date_submitted) / 4
+    return now + min(max(delay, min_interval), max_interval)
+
+
+def schedule_submissions(submissions, estimator, now=None, is_polled=True):
+    """
+    Set the date of the next poll for all *submissions* based on the
+    processing time expected by *estimator*, see :func:`get_next_poll`.
+    Submissions with the same date of the next poll are updated together.
+
+    :param submissions: queryset of feed submissions to schedule.
+    :rtype int: the number of scheduled submissions.
+    """
+    now = now or tz_now()
+    submissions = submissions.values_list(
+        'id', 'feed_type', 'merchant_id', 'num_messages', 'date_submitted')
+    next_polls = defaultdict(list)
+    for (pk, feed_type, merchant_id, num_messages,
+         date_submitted) in submissions:
+        expected = estimator.estimate(feed_type, merchant_id, num_messages)
+        next_polls[get_next_poll(
+            expected, date_submitted, now, is_polled)].append(pk)
+
+    num_scheduled = 0
+    with transaction.commit_on_success():
+        for date_next_poll, pks in next_polls.iteritems():
+            for pk_batch in chunks(pks, 500):
+                FeedSubmission.objects.filter(id__in=pk_batch).update(
+                    date_next_poll=date_next_poll)
+            num_scheduled += len(pks)
+    return num_scheduled
+
+
+def poll_due_submissions(merchant, estimator=None):
+    """
+    Poll the status of all pending feed submissions of *merchant* that are
+    due. Submissions that become due within ``MWS_FEED_POLL_BATCH_WINDOW``
+    are polled as well to check as many submissions as possible in a single
+    request. Submissions that haven't been scheduled yet are scheduled first
+    and submissions that are still pending after polling are rescheduled.
+
+    :rtype list: the updated ``FeedSubmission`` instances.
+    :raises MWSError: if an error occurs when communicating with MWS
+    """
+    now = tz_now()
+    estimator = estimator or ProcessingTimeEstimator.from_history()
+    schedule_submissions(
+        get_pending_submissions(merchant).filter(date_next_poll__isnull=True),
+        estimator, now, is_polled=False)
+
+    window = get_setting_interval('MWS_FEED_POLL_BATCH_WINDOW', 60)
+    due_ids = list(get_pending_submissions(merchant).filter(
+        date_next_poll__lte=now + window,
+    ).values_list('submission_id', flat=True))
+    if not due_ids:
+        return []
+
+    updated_feeds = gateway.poll_feed_submissions(merchant, due_ids)
+    schedule_submissions(
+        get_pending_submissions(merchant).filter(submission_id__in=due_ids),
+        estimator, tz_now())
+    return updated_feeds
+
+
+def get_next_poll_date(merchant=None):
+    """
+    Get the date of the next scheduled poll for pending feed submissions or
+    ``None`` if there are no pending submissions.
+    """
+    return get_pending_submissions(merchant).aggregate(
+        next_poll=Min('date_next_poll'))['next_poll']
+
+
+def get_poll_queue(merchant=None, estimator=None):
+    """
+    Get the queue of pending feed submissions ordered by the date of their
+    next poll. Each entry is a dictionary with the submission details, the
+    expected completion date and the date of the next poll.
+    """
+    estimator = estimator or ProcessingTimeEstimator.from_history()
+    submissions = get_pending_submissions(merchant).order_by(
+        'date_next_poll',
+    ).values(
+        'submission_id', 'feed_type', 'merchant__seller_id', 'merchant_id',
+        'num_messages', 'processing_status', 'date_submitted',
+        'date_next_poll')
+    queue = []
+    for submission in submissions:
+        expected = estimator.estimate(
+            submission['feed_type'], submission['merchant_id'],
+            submission['num_messages'])
+        submission['date_expected'] = submission['date_submitted'] + expected
+        queue.append(submission)
+    return queue
@@ -35,13 +35,26 @@ MSG_TYPE_SETTLEMENT_REPORT = "SettlementReport"
 
 
 class BaseFeedWriter(object):
+    """
+    Base class of writers for XML feeds. The messages of the feed are kept
+    in memory and the feed is rendered by :meth:`as_string`. If a
+    *feed_file* is passed in, each message is written to the file as soon as
+    it is added instead and the products of the messages aren't kept. This
+    keeps the memory usage constant for feeds of any size. :meth:`close`
+    has to be called once all messages have been added to complete the
+    feed.
+    """
     DOCUMENT_VERSION = '1.01'
     XSI = "http://www.w3.org/2001/XMLSchema-instance"
     NSMAP = {'xsi': XSI}
+    ROOT_TAG = 'AmazonEnvelope'
 
     def __init__(self, message_type, merchant_id, document_version=None,
-                 purge_and_replace=False):
+                 purge_and_replace=False, feed_file=None):
         ENS = ElementMaker(nsmap=self.NSMAP)
+        self.feed_file = feed_file
+        self.num_messages = 0
+        self.messages = {}
 
         if not purge_and_replace:
             purge_value = 'false'
@@ -59,6 +72,27 @@ class BaseFeedWriter(object):
         attr_name = "{{{0}}}noNamespaceSchemaLocation".format(self.XSI)
         self.root.attrib[attr_name] = "amzn-envelope.xsd"
 
+        if self.feed_file is not None:
+            self.feed_file.write(self.as_string().rsplit(
+                '</{0}>'.format(self.ROOT_TAG), 1)[0])
+
+    def add_message(self, msg_id, msg_elem, product=None):
+        self.num_messages += 1
+        if self.feed_file is None:
+            self.messages[msg_id] = product
+            self.root.append(msg_elem)
+        else:
+            self.feed_file.write(etree.tostring(msg_elem, encoding='utf-8'))
+
+    def close(self):
+        """
+        Complete the feed written to the feed file and rewind the file to
+        the start of the feed.
+        """
+        self.feed_file.write('</{0}>'.format(self.ROOT_TAG))
+        self.feed_file.flush()
+        self.feed_file.seek(0)
+
     def as_string(self, pretty_print=False):
         return etree.tostring(
             self.root,
@@ -71,18 +105,18 @@ class BaseFeedWriter(object):
 class ProductFeedWriter(BaseFeedWriter):
     mapper_class = mappers.ProductMapper
 
-    def __init__(self, merchant_id, purge_and_replace=False):
+    def __init__(self, merchant_id, purge_and_replace=False, feed_file=None):
         super(ProductFeedWriter, self).__init__(
             message_type='Product',
             merchant_id=merchant_id,
             purge_and_replace=purge_and_replace,
+            feed_file=feed_file,
         )
 
         mapper = getattr(settings, 'MWS_PRODUCT_MAPPER', None)
         self.mapper_class = load_class(mapper) or self.mapper_class
 
         self.msg_counter = itertools.count(1)
-        self.messages = {}
 
     def add_product(self, product, operation_type=OP_UPDATE):
         msg_id = self.msg_counter.next()
@@ -92,23 +126,23 @@ class ProductFeedWriter(BaseFeedWriter):
             E.OperationType(operation_type),
             self.mapper_class(product).get_product_xml()
         )
-        self.messages[msg_id] = product
-        self.root.append(msg_elem)
+        self.add_message(msg_id, msg_elem, product)
 
 
 class InventoryFeedWriter(BaseFeedWriter):
     mapper_class = mappers.InventoryProductMapper
 
-    def __init__(self, merchant_id, purge_and_replace=False, mapper=None):
+    def __init__(self, merchant_id, purge_and_replace=False, mapper=None,
+                 feed_file=None):
         super(InventoryFeedWriter, self).__init__(
             message_type='Inventory',
             merchant_id=merchant_id,
             purge_and_replace=purge_and_replace,
+            feed_file=feed_file,
         )
         mapper = getattr(settings, 'MWS_INVENTORY_MAPPER', None)
         self.mapper_class = load_class(mapper) or self.mapper_class
         self.msg_counter = itertools.count(1)
-        self.messages = {}
 
     def add_product(self, product, operation_type=OP_UPDATE,
                     fulfillment_center_id=None, fulfillment_by=None):
@@ -128,5 +162,4 @@ class InventoryFeedWriter(BaseFeedWriter):
             E.OperationType(operation_type),
             inventory
         )
-        self.messages[msg_id] = product
-        self.root.append(msg_elem)
+        self.add_message(msg_id, msg_elem, product)
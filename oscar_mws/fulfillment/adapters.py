@@ -1,6 +1,7 @@
 from collections import OrderedDict
 
 from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist
 
 from ..utils import load_class, convert_camel_case
 
@@ -110,9 +111,9 @@ class OrderAdapter(BaseAdapter):
         self.addresses = self.get_fulfillment_addresses()
         self.has_mutliple_destinations = bool(len(self.addresses) > 1)
 
+        # Line adapters are looked up lazily per address and cached here
+        # so that repeated calls to get_lines don't hit the database again.
         self._lines = {}
-        for address in self.addresses:
-            self._lines[address.id] = self.get_lines(address)
 
     def get_suffix(self, address, **kwargs):
         return "{0:03d}".format(self.addresses.index(address) + 1)
@@ -165,13 +166,40 @@ class OrderAdapter(BaseAdapter):
         return [self.order.email]
 
     def get_lines(self, address, **kwargs):
+        address_id = getattr(address, 'id', None)
+        if address_id in self._lines:
+            return self._lines[address_id]
+
         try:
             lines = self.order.get_lines_for_address(address, **kwargs)
         except AttributeError:
-            lines = self.order.lines.filter(
+            lines = self.get_amazon_lines()
+
+        self._lines[address_id] = [self.get_line_adapter(l) for l in lines]
+        return self._lines[address_id]
+
+    def get_amazon_lines(self):
+        """
+        Get all lines of the order that have a product with an Amazon profile.
+        If the lines have been prefetched, e.g. using
+        ``prefetch_related('lines__product__amazon_profile')``, the lines are
+        filtered in memory to avoid an additional query per order.
+        """
+        prefetched = getattr(self.order, '_prefetched_objects_cache', {})
+        if 'lines' not in prefetched:
+            return self.order.lines.filter(
                 product__amazon_profile__isnull=False)
 
-        return [self.get_line_adapter(l) for l in lines]
+        lines = []
+        for line in self.order.lines.all():
+            if not line.product_id:
+                continue
+            try:
+                line.product.amazon_profile
+            except ObjectDoesNotExist:
+                continue
+            lines.append(line)
+        return lines
 
     def get_fields(self, address=None, **kwargs):
         if address is None:
@@ -2,11 +2,12 @@ from decimal import Decimal as D
 
 from django.conf import settings
 from django.db.models import get_model
+from django.utils.timezone import now as tz_now
 from django.utils.translation import ugettext_lazy as _
 from django.core.exceptions import ImproperlyConfigured
 
 from . import adapters
-from ..utils import load_class
+from ..utils import load_class, chunks
 from . import MwsFulfillmentError
 
 MerchantAccount = get_model('oscar_mws', 'MerchantAccount')
@@ -15,6 +16,9 @@ FulfillmentOrderLine = get_model('oscar_mws', 'FulfillmentOrderLine')
 
 
 class FulfillmentOrderCreator(object):
+    # Number of orders that are loaded and processed together when creating
+    # fulfillment orders in bulk.
+    batch_size = 500
 
     def __init__(self):
         self.order_adapter_class = adapters.get_order_adapter()
@@ -81,7 +85,10 @@ class FulfillmentOrderCreator(object):
         except FulfillmentOrderLine.DoesNotExist:
             line = FulfillmentOrderLine(
                 line=line_adapter.line, fulfillment_order=fulfillment_order)
+        self.populate_fulfillment_line(line, line_adapter)
+        line.save()
 
+    def populate_fulfillment_line(self, line, line_adapter):
         line_kwargs = line_adapter.get_fields()
         line.order_item_id = \
             line_adapter.get_seller_fulfillment_order_item_id()
@@ -91,4 +98,140 @@ class FulfillmentOrderCreator(object):
         if price and price.get('Value'):
             line.price_incl_tax = D(price.get('Value'))
             line.price_currency = price.get('Currency')
-        line.save()
+        return line
+
+    def get_merchant_key(self, order, address):
+        """
+        Get the key used to cache the merchant returned by the merchant finder
+        when creating fulfillment orders in bulk. The finder is only called
+        once for each distinct key. The key is provided by the finder itself,
+        see :func:`oscar_mws.fulfillment.finders.merchant_key`. Custom finders
+        without a key are called for every address, ``None`` is returned.
+        """
+        get_key = getattr(
+            self.find_fulfillment_merchant, 'get_merchant_key', None)
+        if get_key is None:
+            return None
+        return get_key(order, address)
+
+    def get_bulk_queryset(self, orders):
+        return orders.select_related(
+            'shipping_address', 'shipping_address__country',
+        ).prefetch_related(
+            'lines__product__amazon_profile',
+        )
+
+    def create_fulfillment_orders(self, orders, batch_size=None):
+        """
+        Create fulfillment orders for all orders in the queryset *orders*.
+        This is intended for importing large numbers of (historic) orders,
+        e.g. when a new fulfillment region is set up. Orders are processed in
+        batches of *batch_size* orders with lines, addresses and Amazon
+        profiles prefetched for each batch. The merchant finder is called
+        only once per distinct key returned by :meth:`get_merchant_key` and
+        fulfillment orders and their lines are inserted using
+        ``bulk_create``.
+
+        Fulfillment orders that already exist are not changed and reported
+        in ``errors`` instead. Order lines that are already part of a
+        fulfillment order are skipped.
+
+        :param QuerySet orders: queryset of Oscar orders.
+        :param int batch_size: number of orders to process at once. Defaults
+            to ``batch_size`` on the creator.
+        :rtype list: list of newly created fulfillment orders.
+        """
+        batch_size = batch_size or self.batch_size
+        merchants = {}
+
+        order_ids = list(orders.order_by('pk').values_list('pk', flat=True))
+        fulfillment_orders = []
+        for id_batch in chunks(order_ids, batch_size):
+            batch = self.get_bulk_queryset(orders.filter(pk__in=id_batch))
+            fulfillment_orders.extend(
+                self._create_fulfillment_order_batch(batch, merchants))
+        return fulfillment_orders
+
+    def _find_merchant(self, order, address, merchants):
+        key = self.get_merchant_key(order, address)
+        if key is None or key not in merchants:
+            try:
+                merchant = self.find_fulfillment_merchant(order, address)
+            except MwsFulfillmentError:
+                merchant = None
+            if key is None:
+                return merchant
+            merchants[key] = merchant
+        return merchants[key]
+
+    def _create_fulfillment_order_batch(self, orders, merchants):
+        pending = []
+        for order in orders:
+            adapter = self.get_order_adapter(order)
+            for address in adapter.addresses:
+                fulfillment_id = adapter.get_seller_fulfillment_order_id(
+                    address)
+                merchant = self._find_merchant(order, address, merchants)
+                if not merchant:
+                    self.errors[fulfillment_id] = _(
+                        "could not find suitable merchant for fulfillemnt "
+                        "order {}". format(fulfillment_id)
+                    )
+                    continue
+                pending.append((fulfillment_id, order, address, merchant,
+                                adapter))
+        if not pending:
+            return []
+
+        existing_ids = set(FulfillmentOrder.objects.filter(
+            fulfillment_id__in=[p[0] for p in pending]
+        ).values_list('fulfillment_id', flat=True))
+
+        new_orders = []
+        new_adapters = {}
+        for fulfillment_id, order, address, merchant, adapter in pending:
+            if fulfillment_id in existing_ids or \
+               fulfillment_id in new_adapters:
+                self.errors[fulfillment_id] = _("Order already created.")
+                continue
+            order_kw = adapter.get_fields(address=address)
+            new_orders.append(FulfillmentOrder(
+                fulfillment_id=fulfillment_id,
+                order=order,
+                merchant=merchant,
+                shipping_address=order_kw.get('DestinationAddress'),
+                shipping_speed=order_kw.get('ShippingSpeedCategory'),
+                comments=order_kw.get('DisplayableOrderComment'),
+                date_updated=tz_now(),
+            ))
+            new_adapters[fulfillment_id] = (adapter, address)
+        if not new_orders:
+            return []
+        FulfillmentOrder.objects.bulk_create(new_orders)
+
+        # bulk_create doesn't set the primary keys on the created instances
+        # so we have to retrieve them to be able to create the lines.
+        fulfillment_orders = list(FulfillmentOrder.objects.filter(
+            fulfillment_id__in=new_adapters.keys()))
+
+        line_adapters = []
+        for fulfillment_order in fulfillment_orders:
+            adapter, address = new_adapters[fulfillment_order.fulfillment_id]
+            for line_adapter in adapter.get_lines(address=address):
+                line_adapters.append((line_adapter, fulfillment_order))
+
+        assigned_line_ids = set(FulfillmentOrderLine.objects.filter(
+            line__in=[la.line.id for la, __ in line_adapters]
+        ).values_list('line_id', flat=True))
+
+        new_lines = []
+        for line_adapter, fulfillment_order in line_adapters:
+            if line_adapter.line.id in assigned_line_ids:
+                continue
+            assigned_line_ids.add(line_adapter.line.id)
+            line = FulfillmentOrderLine(
+                line=line_adapter.line, fulfillment_order=fulfillment_order)
+            self.populate_fulfillment_line(line, line_adapter)
+            new_lines.append(line)
+        FulfillmentOrderLine.objects.bulk_create(new_lines)
+        return fulfillment_orders
@@ -1,3 +1,31 @@
+import logging
+
+import oscar_mws
+
+from ..registry import get_registry_version, invalidate_merchant_registry
+
+logger = logging.getLogger('oscar_mws')
+
+
+def merchant_key(key_func):
+    """
+    Decorator declaring *key_func* as the key of a merchant finder. It is
+    called with the order and shipping address and returns a key that is
+    equal for all addresses resolving to the same merchant. Merchants are
+    cached by this key when fulfillment orders are created in bulk. Finders
+    without a key are called for every address.
+    """
+    def decorator(finder):
+        finder.get_merchant_key = key_func
+        return finder
+    return decorator
+
+
+def get_country_key(order, shipping_address):
+    return getattr(shipping_address, 'country_id', None)
+
+
+@merchant_key(lambda order, shipping_address: 'default')
 def default_merchant_finder(order, shipping_address, **kwargs):
     from django.db.models import get_model
     try:
@@ -5,3 +33,91 @@ def default_merchant_finder(order, shipping_address, **kwargs):
     except IndexError:
         pass
     return None
+
+
+_routing_table = (None, None)
+
+
+def build_routing_table():
+    """
+    Build a routing table mapping country codes to the merchant account that
+    should fulfill orders shipped to that country. A country is routed to the
+    merchant that has a marketplace in this country. If there is no such
+    marketplace, the merchant with a marketplace (or region) served by the same
+    fulfillment center is used, e.g. an address in France is routed to the
+    merchant selling on the German marketplace. The first merchant account is
+    used as a fallback for all other countries and stored as ``None``.
+
+    :rtype dict: mapping of country code to ``MerchantAccount``.
+    """
+    from django.db.models import get_model
+    AmazonMarketplace = get_model('oscar_mws', 'AmazonMarketplace')
+    MerchantAccount = get_model('oscar_mws', 'MerchantAccount')
+
+    countries = {}
+    centers = {}
+    for marketplace in AmazonMarketplace.objects.select_related(
+            'merchant').order_by('id'):
+        countries.setdefault(marketplace.region, marketplace.merchant)
+        center = oscar_mws.MWS_FULFILLMENT_CENTERS.get(marketplace.region)
+        centers.setdefault(center, marketplace.merchant)
+
+    table = {None: None}
+    for merchant in MerchantAccount.objects.order_by('id'):
+        if table[None] is None:
+            table[None] = merchant
+        center = oscar_mws.MWS_REGION_FULFILLMENT_CENTERS.get(merchant.region)
+        centers.setdefault(center, merchant)
+
+    for country, center in oscar_mws.MWS_FULFILLMENT_CENTERS.iteritems():
+        merchant = countries.get(country) or centers.get(center)
+        if merchant:
+            table[country] = merchant
+    return table
+
+
+def get_routing_table():
+    """
+    Get the in-process routing table. It shares the version stored in the
+    Django cache with the merchant registry and is rebuilt once the version
+    changed, e.g. because a merchant account was saved in another process.
+    """
+    global _routing_table
+    version = get_registry_version()
+    table_version, table = _routing_table
+    if table is None or table_version != version:
+        table = build_routing_table()
+        _routing_table = (version, table)
+    return table
+
+
+def reset_routing_table(**kwargs):
+    """
+    Reset the routing table used by :func:`routing_merchant_finder` in all
+    processes so that it is rebuilt on next use. This invalidates the
+    merchant registry as well, which is invalidated on the ``post_save`` and
+    ``post_delete`` signals of ``MerchantAccount`` and ``AmazonMarketplace``.
+    """
+    global _routing_table
+    _routing_table = (None, None)
+    invalidate_merchant_registry()
+
+
+@merchant_key(get_country_key)
+def routing_merchant_finder(order, shipping_address, **kwargs):
+    """
+    Find the merchant for the *shipping_address* based on its country using
+    the routing table built by :func:`build_routing_table`. The routing table
+    is kept in memory, looking up a merchant doesn't require any database
+    access. Countries without a fulfillment center are routed to the first
+    merchant account and logged as a warning.
+    """
+    table = get_routing_table()
+    country_code = getattr(shipping_address, 'country_id', None)
+    try:
+        return table[country_code]
+    except KeyError:
+        logger.warning(
+            "No fulfillment center for country %s, using merchant %s",
+            country_code, table[None])
+        return table[None]
@@ -1,21 +1,26 @@
 import logging
 
+from datetime import datetime
 from collections import defaultdict
 from dateutil import parser as du_parser
 
+from django.db import transaction
 from django.db.models import get_model
-from django.core.exceptions import ObjectDoesNotExist
+from django.utils.timezone import now as tz_now, utc
 
 from oscar.core.loading import get_class
 
 from ..api import MWSObject, MWSError
 from ..signals import mws_fulfillment_created
+from ..utils import chunks, get_request_throttle
 from ..connection import get_merchant_connection
+from .timeline import invalidate_fulfillment_timelines
 
 logger = logging.getLogger('oscar_mws')
 
 Partner = get_model('partner', 'Partner')
 Product = get_model('catalogue', 'Product')
+StockAlert = get_model('partner', 'StockAlert')
 StockRecord = get_model('partner', 'StockRecord')
 
 Line = get_model('order', 'Line')
@@ -28,6 +33,16 @@ ShipmentPackage = get_model('oscar_mws', 'ShipmentPackage')
 FulfillmentOrder = get_model('oscar_mws', 'FulfillmentOrder')
 FulfillmentOrderLine = get_model('oscar_mws', 'FulfillmentOrderLine')
 FulfillmentShipment = get_model('oscar_mws', 'FulfillmentShipment')
+MerchantAccount = get_model('oscar_mws', 'MerchantAccount')
+
+# Maximum number of SellerSkus allowed in ListInventorySupply requests
+MAX_INVENTORY_SKUS = 50
+# Request quota and restore rate in seconds of ListInventorySupply, which
+# shares its throttle with ListInventorySupplyByNextToken
+INVENTORY_SUPPLY_QUOTA = (30, 0.5)
+# Query start used for the first delta sync of a merchant account to retrieve
+# the supply of all SKUs in the account
+INVENTORY_SYNC_START = datetime(2000, 1, 1, tzinfo=utc)
 
 
 def _update_shipment(shipment_data, fulfillment_order):
@@ -226,8 +241,12 @@ def update_fulfillment_order(fulfillment_order):
     fulfillment_order.save()
 
     shipments = response.get('FulfillmentShipment') or MWSObject()
-    for fshipment in shipments.get_list('member'):
+    fshipments = shipments.get_list('member')
+    for fshipment in fshipments:
         _update_shipment(fshipment, fulfillment_order)
+    if fshipments:
+        fulfillment_order.date_updated = invalidate_fulfillment_timelines(
+            fulfillment_order.order)
     return fulfillment_order
 
 
@@ -274,6 +293,178 @@ def get_all_fulfillment_orders(merchant, query_datetime=None):
     return processed_orders
 
 
+def iter_inventory_supply(inventory_api, skus=(), query_start=None):
+    """
+    Iterate over the inventory supply for the given *skus* or, if no SKUs are
+    given, all inventory supply that changed since *query_start*. SKUs are
+    requested in batches of ``MAX_INVENTORY_SKUS`` which is the maximum
+    number of SKUs allowed in a single request. Responses that span several
+    pages are followed using the ``NextToken`` returned by MWS. Requests are
+    throttled to the restore rate of ``ListInventorySupply``.
+
+    :raises MWSError: if an error occurs when communicating with MWS
+    """
+    throttle = get_request_throttle(
+        inventory_api.account_id, 'ListInventorySupply',
+        *INVENTORY_SUPPLY_QUOTA)
+    if skus:
+        requests = [{'skus': batch}
+                    for batch in chunks(sorted(skus), MAX_INVENTORY_SKUS)]
+    else:
+        requests = [{'datetime': query_start}]
+
+    for kwargs in requests:
+        throttle.wait()
+        response = inventory_api.list_inventory_supply(**kwargs).parsed
+        while True:
+            supply = response.get('InventorySupplyList') or MWSObject()
+            for inventory in supply.get_list('member'):
+                yield inventory
+            if not response.get('NextToken'):
+                break
+            throttle.wait()
+            response = inventory_api.list_inventory_supply_by_next_token(
+                token=response.NextToken).parsed
+
+
+def update_stock_alerts(stockrecord_ids):
+    """
+    Open and close the low-stock alerts of the stock records with
+    *stockrecord_ids* in a single pass. This does the same as Oscar's
+    ``update_stock_alerts`` receiver of the ``post_save`` signal for stock
+    records that have been updated in bulk.
+
+    :rtype tuple: the number of opened and closed alerts.
+    """
+    new_alerts, closed_ids = [], []
+    for id_batch in chunks(stockrecord_ids, 500):
+        stockrecords = list(StockRecord.objects.filter(
+            id__in=id_batch, low_stock_threshold__isnull=False))
+        open_ids = set(StockAlert.objects.filter(
+            stockrecord__in=id_batch, status=StockAlert.OPEN,
+        ).values_list('stockrecord_id', flat=True))
+        for stockrecord in stockrecords:
+            if stockrecord.is_below_threshold:
+                if stockrecord.id not in open_ids:
+                    new_alerts.append(StockAlert(
+                        stockrecord=stockrecord,
+                        threshold=stockrecord.low_stock_threshold))
+            elif stockrecord.id in open_ids:
+                closed_ids.append(stockrecord.id)
+        # alerts of records without threshold are closed like in Oscar
+        closed_ids.extend(
+            open_ids - set(s.id for s in stockrecords))
+
+    StockAlert.objects.bulk_create(new_alerts)
+    for id_batch in chunks(closed_ids, 500):
+        StockAlert.objects.filter(
+            stockrecord__in=id_batch, status=StockAlert.OPEN,
+        ).update(status=StockAlert.CLOSED)
+    return len(new_alerts), len(closed_ids)
+
+
+def update_stockrecords(seller_id, quantities):
+    """
+    Set the stock of the stock records for the merchant with *seller_id* to
+    the supply quantities in *quantities* mapping SKUs to their quantity. All
+    stock records and products are loaded upfront and only stock records with
+    a changed quantity are updated. Stock records that don't exist yet are
+    created for the merchant's partner.
+
+    The values are updated in bulk which means that
+    :meth:`AmazonStockTrackingMixin.set_amazon_supply_quantity
+    <oscar_mws.mixins.AmazonStockTrackingMixin.set_amazon_supply_quantity>`
+    and ``save`` are not called and no ``post_save`` signals are sent for the
+    stock records. ``date_updated`` is set explicitly and the low-stock
+    alerts of the updated stock records are opened and closed by
+    :func:`update_stock_alerts` instead of Oscar's ``update_stock_alerts``
+    receiver. Other receivers of ``post_save`` for stock records are not
+    called.
+
+    :param str seller_id: seller ID of the merchant account.
+    :param dict quantities: mapping of SKU to supply quantity.
+    :rtype int: the number of stock records updated or created.
+    """
+    if not quantities:
+        return 0
+
+    stockrecords = StockRecord.objects.filter(
+        product__amazon_profile__sku__in=quantities.keys(),
+        partner__amazon_merchant__seller_id=seller_id,
+    ).values_list(
+        'id', 'product__amazon_profile__sku', 'num_in_stock', 'num_allocated')
+
+    changed = defaultdict(list)
+    missing_skus = set(quantities.keys())
+    for record_id, sku, num_in_stock, num_allocated in stockrecords:
+        missing_skus.discard(sku)
+        quantity = quantities[sku]
+        if num_in_stock != quantity or num_allocated:
+            changed[quantity].append(record_id)
+
+    new_records = []
+    if missing_skus:
+        # It seems that there's no stock record available for these products
+        # that is linked to the merchant account. Let's try and create new
+        # stock records for the merchant's partner.
+        try:
+            partner = Partner.objects.get(amazon_merchant__seller_id=seller_id)
+        except Partner.DoesNotExist:
+            partner = None
+        products = Product.objects.filter(
+            amazon_profile__sku__in=missing_skus,
+        ).values_list('id', 'amazon_profile__sku')
+        for product_id, sku in products:
+            if partner is None:
+                break
+            missing_skus.discard(sku)
+            new_records.append(StockRecord(
+                product_id=product_id, partner=partner, partner_sku=sku,
+                num_in_stock=quantities[sku], num_allocated=0))
+
+    for sku in missing_skus:
+        logger.error(
+            "no stockrecord and partner found for given product and merchant",
+            extra={'seller_sku': sku, 'seller_id': seller_id})
+
+    with transaction.commit_on_success():
+        date_updated = tz_now()
+        for quantity, record_ids in changed.iteritems():
+            for id_batch in chunks(record_ids, 500):
+                StockRecord.objects.filter(id__in=id_batch).update(
+                    num_in_stock=quantity, num_allocated=0,
+                    date_updated=date_updated)
+        StockRecord.objects.bulk_create(new_records)
+        update_stock_alerts(
+            [i for ids in changed.itervalues() for i in ids])
+
+    num_updated = sum(len(ids) for ids in changed.itervalues())
+    logger.info(
+        "updated {} and created {} stock records from MWS supply".format(
+            num_updated, len(new_records)), extra={'seller_id': seller_id})
+    return num_updated + len(new_records)
+
+
+def get_supply_quantities(seller_id, inventory_supply):
+    """
+    Get a dictionary mapping the SKUs to the in-stock supply quantities in
+    *inventory_supply*. Invalid quantities are logged and skipped.
+    """
+    quantities = {}
+    for inventory in inventory_supply:
+        try:
+            quantities[inventory.SellerSKU] = int(
+                inventory.InStockSupplyQuantity)
+        except (ValueError, TypeError):
+            logger.error(
+                "could not convert '{}' to integer for stock "
+                "record".format(inventory.InStockSupplyQuantity),
+                exc_info=1,
+                extra={'seller_id': seller_id, 'sku': inventory.SellerSKU,
+                       'value': inventory.InStockSupplyQuantity})
+    return quantities
+
+
 def update_inventory(products):
     """
     Update the available inventory for the *products* as available on MWS for
@@ -285,13 +476,20 @@ def update_inventory(products):
     <oscar_mws.models.AmazonProfile>` and :class:`MerchantAccount
     <oscar_mws.models.MerchantAccount>`.
 
-    :param list products: A list of product models.
+    The SKUs are requested from MWS in batches, see
+    :func:`iter_inventory_supply`, and the stock records are updated in bulk
+    using :func:`update_stockrecords`.
+
+    :param list products: A list or queryset of product models.
 
     :raises MWSError: if an error occurs when communicating with MWS
     """
-    product_values = Product.objects.filter(
-        id__in=[p.id for p in products],
-    ).values_list(
+    if hasattr(products, 'values_list'):
+        product_values = products
+    else:
+        product_values = Product.objects.filter(
+            id__in=[p.id for p in products])
+    product_values = product_values.values_list(
         'amazon_profile__sku',
         'amazon_profile__marketplaces__merchant__seller_id'
     )
@@ -307,49 +505,58 @@ def update_inventory(products):
         inventory_api = get_merchant_connection(seller_id, 'inventory')
 
         try:
-            response = inventory_api.list_inventory_supply(skus=skus).parsed
+            quantities = get_supply_quantities(
+                seller_id, iter_inventory_supply(inventory_api, skus=skus))
         except MWSError:
             logger.error(
                 'MWS responsed with an error', exc_info=1, extra={
                     'seller_id': seller_id, 'skus': skus})
             raise
+        update_stockrecords(seller_id, quantities)
 
-        for inventory in response.InventorySupplyList.get_list('member'):
-            try:
-                stockrecord = StockRecord.objects.get(
-                    product__amazon_profile__sku=inventory.SellerSKU,
-                    partner__amazon_merchant__seller_id=seller_id)
-            except StockRecord.DoesNotExist:
-                # It seems that there's no stock record available for the
-                # product that is linked to the merchant account. Let's try
-                # and create a new stockrecord for this product and merchant's
-                # partner. If that fails, we are out of options and just
-                # continue with the next one
-                try:
-                    stockrecord = StockRecord.objects.create(
-                        product=Product.objects.get(
-                            amazon_profile__sku=inventory.SellerSKU),
-                        partner=Partner.objects.get(
-                            amazon_merchant__seller_id=seller_id),
-                    )
-                except ObjectDoesNotExist:
-                    logger.error(
-                        "no stockrecord and partner found for given product "
-                        "and merchant", extra={
-                            'seller_sku': inventory.SellerSKU,
-                            'seller_id': seller_id})
-                    continue
-            try:
-                quantity = int(inventory.InStockSupplyQuantity)
-            except (ValueError, TypeError):
-                logger.error(
-                    "could not convert '{}' to integer for stock "
-                    "record".format(inventory.InStockSupplyQuantity),
-                    exc_info=1,
-                    extra={'seller_id': seller_id, 'sku': inventory.SellerSKU,
-                           'response': response,
-                           'value': inventory.InStockSupplyQuantity})
-            else:
-                stockrecord.set_amazon_supply_quantity(quantity, commit=False)
 
-            stockrecord.save()
+def update_inventory_changes(merchant, batch_size=500):
+    """
+    Update the stock records for all SKUs of *merchant* that had a change in
+    supply since the last synchronisation. Instead of requesting each SKU
+    explicitly, ``ListInventorySupply`` is queried with a
+    ``QueryStartDateTime`` which returns only the supply that changed. The
+    first synchronisation of a merchant account requests the supply for all
+    SKUs in the account. The supply is streamed page by page and stock records
+    are updated in batches of *batch_size* SKUs.
+
+    The time of the synchronisation is stored in
+    :attr:`MerchantAccount.date_inventory_synced
+    <oscar_mws.models.MerchantAccount.date_inventory_synced>` only if all
+    pages were processed successfully. It is the start time of the
+    synchronisation to make sure that changes happening while the pages are
+    processed are picked up by the next synchronisation.
+
+    :param MerchantAccount merchant: the merchant account to synchronise.
+    :rtype int: the number of stock records updated or created.
+
+    :raises MWSError: if an error occurs when communicating with MWS
+    """
+    started = tz_now()
+    query_start = merchant.date_inventory_synced or INVENTORY_SYNC_START
+    inventory_api = get_merchant_connection(merchant.seller_id, 'inventory')
+
+    num_updated = 0
+    supply = iter_inventory_supply(
+        inventory_api, query_start=query_start.isoformat())
+    try:
+        for batch in chunks(supply, batch_size):
+            quantities = get_supply_quantities(merchant.seller_id, batch)
+            num_updated += update_stockrecords(merchant.seller_id, quantities)
+    except MWSError:
+        logger.error(
+            'MWS responsed with an error', exc_info=1, extra={
+                'seller_id': merchant.seller_id,
+                'query_start': query_start.isoformat()})
+        raise
+
+    # using update() prevents unnecessary post_save signals for the merchant
+    MerchantAccount.objects.filter(pk=merchant.pk).update(
+        date_inventory_synced=started)
+    merchant.date_inventory_synced = started
+    return num_updated
@@ -0,0 +1,288 @@
+import time
+import logging
+import threading
+
+from decimal import Decimal as D
+from collections import OrderedDict
+from dateutil import parser as du_parser
+
+from requests import RequestException
+
+from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist
+
+from ..api import MWSObject, MWSError
+from ..connection import get_merchant_connection
+
+logger = logging.getLogger('oscar_mws')
+
+
+class FulfillmentPreviewCache(object):
+    """
+    In-process cache for fulfillment previews with a time-to-live for each
+    entry and LRU eviction when more than *max_size* entries are stored.
+    Expired entries are kept until they are evicted so that they can be
+    served as a fallback when MWS is unavailable.
+
+    The cache also keeps track of previews that are currently requested from
+    MWS. Only the first caller for a key requests the preview, all other
+    callers for the same key wait for its result instead of sending an
+    identical request.
+    """
+
+    def __init__(self, max_size=1000, timeout=900):
+        self.max_size = max_size
+        self.timeout = timeout
+        self._entries = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, allow_stale=False):
+        with self._lock:
+            try:
+                expires, previews = self._entries.pop(key)
+            except KeyError:
+                return None
+            # re-insert the entry to mark it as most recently used
+            self._entries[key] = (expires, previews)
+        if not allow_stale and expires < time.time():
+            return None
+        return previews
+
+    def set(self, key, previews):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (time.time() + self.timeout, previews)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def acquire(self, key):
+        """
+        Register a request for *key*. Returns a tuple of the event that is set
+        once the request is finished and a flag that is ``True`` if the caller
+        is responsible for requesting the preview.
+        """
+        with self._lock:
+            if key in self._pending:
+                return self._pending[key], False
+            event = self._pending[key] = threading.Event()
+            return event, True
+
+    def release(self, key):
+        with self._lock:
+            event = self._pending.pop(key, None)
+        if event:
+            event.set()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_preview_cache = None
+
+
+def get_preview_cache():
+    global _preview_cache
+    if _preview_cache is None:
+        _preview_cache = FulfillmentPreviewCache(
+            max_size=getattr(
+                settings, 'MWS_FULFILLMENT_PREVIEW_CACHE_SIZE', 1000),
+            timeout=getattr(settings, 'MWS_FULFILLMENT_PREVIEW_TIMEOUT', 900))
+    return _preview_cache
+
+
+def get_address_params(address):
+    """
+    Convert an Oscar *address* into the address parameters required by the
+    ``GetFulfillmentPreview`` API.
+    """
+    return OrderedDict(
+        Name=address.name,
+        Line1=address.line1,
+        Line2=address.line2,
+        City=address.city,
+        CountryCode=address.country_id,
+        StateOrProvinceCode=address.state,
+        PostalCode=address.postcode,
+    )
+
+
+def get_basket_items(basket):
+    """
+    Get a list of ``(sku, quantity)`` tuples for all lines in *basket* that
+    have a product with an Amazon profile.
+    """
+    items = []
+    for line in basket.all_lines():
+        try:
+            sku = line.product.amazon_profile.sku
+        except ObjectDoesNotExist:
+            continue
+        items.append((sku, line.quantity))
+    return items
+
+
+def get_preview_key(merchant, address, items, shipping_speed_categories=None):
+    """
+    Get the cache key for a preview. The key contains every field of the
+    *address* sent to MWS, the SKUs and their quantities as well as the
+    requested shipping speeds. Postcodes are compared without spaces and
+    case. The order of *items* and speed categories is irrelevant.
+    """
+    quantities = {}
+    for sku, quantity in items:
+        quantities[sku] = quantities.get(sku, 0) + int(quantity)
+    address_fields = []
+    for name, value in address.iteritems():
+        if name == 'PostalCode':
+            value = (value or '').replace(' ', '').upper()
+        address_fields.append((name, value or ''))
+    return (
+        merchant.seller_id,
+        tuple(sorted(address_fields)),
+        tuple(sorted(quantities.iteritems())),
+        tuple(sorted(shipping_speed_categories or [])),
+    )
+
+
+def parse_fulfillment_previews(response):
+    """
+    Parse the ``GetFulfillmentPreview`` *response* into a list of
+    dictionaries, one for each shipping speed category. Each preview contains
+    the shipping speed, whether the items are fulfillable, the earliest and
+    latest estimated arrival dates and the total of the estimated fees.
+    """
+    previews = []
+    fpreviews = response.get('FulfillmentPreviews') or MWSObject()
+    for fpreview in fpreviews.get_list('member'):
+        earliest_arrival = latest_arrival = None
+        shipments = fpreview.get('FulfillmentPreviewShipments') or MWSObject()
+        for shipment in shipments.get_list('member'):
+            if shipment.get('EarliestArrivalDate'):
+                date = du_parser.parse(shipment.EarliestArrivalDate)
+                if not earliest_arrival or date < earliest_arrival:
+                    earliest_arrival = date
+            if shipment.get('LatestArrivalDate'):
+                date = du_parser.parse(shipment.LatestArrivalDate)
+                if not latest_arrival or date > latest_arrival:
+                    latest_arrival = date
+
+        total_fees = D('0.00')
+        currency = None
+        fees = fpreview.get('EstimatedFees') or MWSObject()
+        for fee in fees.get_list('member'):
+            total_fees += D(fee.Amount.Value)
+            currency = fee.Amount.CurrencyCode
+
+        previews.append({
+            'shipping_speed': fpreview.ShippingSpeedCategory,
+            'is_fulfillable': fpreview.get('IsFulfillable') == 'true',
+            'earliest_arrival': earliest_arrival,
+            'latest_arrival': latest_arrival,
+            'total_fees': total_fees,
+            'currency': currency,
+        })
+    return previews
+
+
+def request_fulfillment_preview(merchant, address, items,
+                                shipping_speed_categories=None):
+    outbound_api = get_merchant_connection(merchant.seller_id, 'outbound')
+    mws_items = []
+    for sku, quantity in items:
+        mws_items.append(OrderedDict(
+            SellerSKU=sku,
+            SellerFulfillmentOrderItemId=sku,
+            Quantity=quantity,
+        ))
+    response = outbound_api.get_fulfillment_preview(
+        address=address, items=mws_items,
+        shipping_speed_categories=shipping_speed_categories,
+        timeout=getattr(
+            settings, 'MWS_FULFILLMENT_PREVIEW_REQUEST_TIMEOUT', 3))
+    return parse_fulfillment_previews(response.parsed)
+
+
+def get_fulfillment_preview(merchant, address, items,
+                            shipping_speed_categories=None, refresh=False):
+    """
+    Get the fulfillment previews for shipping *items* to *address* from the
+    preview cache. MWS is only contacted if there is no valid preview cached
+    for the destination and items. Identical requests that are made at the
+    same time are sent to MWS only once, other callers wait for at most
+    ``MWS_FULFILLMENT_PREVIEW_WAIT`` seconds for the result. The request to
+    MWS times out after ``MWS_FULFILLMENT_PREVIEW_REQUEST_TIMEOUT`` seconds.
+    If MWS returns an error, can't be reached or doesn't respond in time, an
+    expired preview is returned if there is one available.
+
+    Without a cached preview, the call blocks until MWS responds or the
+    request times out. When it is used while rendering a page, e.g. the
+    basket, that page is delayed by up to the request timeout on a cold
+    cache. Use :func:`warm_fulfillment_previews` outside of the request to
+    keep the previews of popular destinations cached.
+
+    :param MerchantAccount merchant: the merchant account fulfilling the
+        items.
+    :param dict address: destination address as required by MWS, see
+        :func:`get_address_params`.
+    :param list items: list of ``(sku, quantity)`` tuples.
+    :param list shipping_speed_categories: shipping speeds to request
+        previews for. Defaults to all shipping speeds.
+    :param bool refresh: ignore cached previews and request them from MWS.
+
+    :rtype list: list of previews as returned by
+        :func:`parse_fulfillment_previews` or ``None`` if no preview is
+        available.
+    """
+    if not items:
+        return []
+
+    cache = get_preview_cache()
+    key = get_preview_key(merchant, address, items, shipping_speed_categories)
+
+    if not refresh:
+        previews = cache.get(key)
+        if previews is not None:
+            return previews
+
+    event, is_owner = cache.acquire(key)
+    if not is_owner:
+        event.wait(getattr(settings, 'MWS_FULFILLMENT_PREVIEW_WAIT', 5))
+        return cache.get(key, allow_stale=True)
+
+    try:
+        previews = request_fulfillment_preview(
+            merchant, address, items, shipping_speed_categories)
+    except (MWSError, RequestException):
+        logger.error(
+            "could not retrieve fulfillment preview", exc_info=1,
+            extra={'seller_id': merchant.seller_id, 'items': items,
+                   'country_code': address.get('CountryCode')})
+        previews = cache.get(key, allow_stale=True)
+    else:
+        cache.set(key, previews)
+    finally:
+        cache.release(key)
+    return previews
+
+
+def warm_fulfillment_previews(merchant, addresses, items,
+                              shipping_speed_categories=None):
+    """
+    Request fulfillment previews for each address in *addresses* and store
+    them in the preview cache. This can be used to pre-warm the cache for
+    popular destinations and products, e.g. in a periodic task.
+
+    :rtype int: the number of previews successfully retrieved.
+    """
+    warmed = 0
+    for address in addresses:
+        previews = get_fulfillment_preview(
+            merchant, address, items, shipping_speed_categories, refresh=True)
+        if previews:
+            warmed += 1
+    return warmed
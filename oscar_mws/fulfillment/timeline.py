@@ -0,0 +1,147 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import get_model
+from django.utils.timezone import now as tz_now
+
+FulfillmentOrder = get_model('oscar_mws', 'FulfillmentOrder')
+FulfillmentOrderLine = get_model('oscar_mws', 'FulfillmentOrderLine')
+FulfillmentShipment = get_model('oscar_mws', 'FulfillmentShipment')
+
+CACHE_KEY_PREFIX = 'oscar_mws:fulfillment-timeline'
+
+
+def get_timeline_cache_key(fulfillment_order):
+    """
+    Get the cache key for the timeline of *fulfillment_order*. The key
+    contains the date of the last update of the fulfillment order, so every
+    change to the order results in a new key.
+    """
+    return '{0}:{1}:{2}'.format(
+        CACHE_KEY_PREFIX, fulfillment_order.pk,
+        fulfillment_order.date_updated.isoformat())
+
+
+def get_line_data(fline):
+    return {
+        'order_item_id': fline.order_item_id,
+        'title': fline.line.title,
+        'sku': fline.line.partner_sku,
+        'quantity': fline.quantity,
+        'status': fline.line.status,
+    }
+
+
+def build_fulfillment_timeline(fulfillment_order):
+    """
+    Assemble the shipping timeline of *fulfillment_order* from the
+    shipments, packages, package tracking events, fulfillment lines and
+    shipping events that are stored for it. The data is loaded with a fixed
+    number of queries, independent of the number of shipments and packages.
+
+    :rtype dict: a dictionary of plain values that can be cached. Shipments
+        contain their packages and the fulfillment lines that have been
+        shipped with them. Lines that haven't been shipped are listed as
+        ``unshipped_lines``. All shipping events are listed as ``events``
+        in the order they were created.
+    """
+    shipments = FulfillmentShipment.objects.filter(
+        order_id=fulfillment_order.order_id,
+    ).prefetch_related(
+        'packages__tracking_events', 'shipment_events__event_type',
+    ).order_by('date_shipped', 'id')
+    flines = FulfillmentOrderLine.objects.filter(
+        fulfillment_order=fulfillment_order,
+    ).select_related('line').order_by('id')
+
+    lines_by_shipment = {}
+    lines_by_package = {}
+    unshipped_lines = []
+    for fline in flines:
+        line_data = get_line_data(fline)
+        if fline.shipment_id is None:
+            unshipped_lines.append(line_data)
+            continue
+        lines_by_shipment.setdefault(fline.shipment_id, []).append(line_data)
+        if fline.package_id is not None:
+            lines_by_package.setdefault(fline.package_id, []).append(
+                line_data)
+
+    timeline_shipments = []
+    events = {}
+    for shipment in shipments:
+        packages = []
+        for package in sorted(shipment.packages.all(),
+                              key=lambda p: p.package_number):
+            packages.append({
+                'package_number': package.package_number,
+                'tracking_number': package.tracking_number,
+                'carrier_code': package.carrier_code,
+                'tracking_status': package.tracking_status,
+                'date_estimated_arrival': package.date_estimated_arrival,
+                'tracking_events': [{
+                    'event_code': event.event_code,
+                    'event_date': event.event_date,
+                    'city': event.city,
+                    'state': event.state,
+                    'country': event.country,
+                } for event in package.tracking_events.all()],
+                'lines': lines_by_package.get(package.id, []),
+            })
+        for event in shipment.shipment_events.all():
+            events[event.id] = {
+                'shipment_id': shipment.shipment_id,
+                'event_type': event.event_type.name,
+                'notes': event.notes,
+                'date_created': event.date_created,
+            }
+        timeline_shipments.append({
+            'shipment_id': shipment.shipment_id,
+            'fulfillment_center_id': shipment.fulfillment_center_id,
+            'status': shipment.status,
+            'date_shipped': shipment.date_shipped,
+            'date_estimated_arrival': shipment.date_estimated_arrival,
+            'packages': packages,
+            'lines': lines_by_shipment.get(shipment.id, []),
+        })
+
+    return {
+        'fulfillment_id': fulfillment_order.fulfillment_id,
+        'status': fulfillment_order.status,
+        'status_display': unicode(fulfillment_order.get_status_display()),
+        'date_updated': fulfillment_order.date_updated,
+        'shipments': timeline_shipments,
+        'unshipped_lines': unshipped_lines,
+        'events': sorted(events.values(), key=lambda e: e['date_created']),
+    }
+
+
+def get_fulfillment_timeline(fulfillment_order):
+    """
+    Get the timeline of *fulfillment_order* from the cache or build and
+    cache it if there is none. Cached timelines are kept for
+    ``MWS_FULFILLMENT_TIMELINE_TIMEOUT`` seconds.
+    """
+    key = get_timeline_cache_key(fulfillment_order)
+    timeline = cache.get(key)
+    if timeline is None:
+        timeline = build_fulfillment_timeline(fulfillment_order)
+        cache.set(
+            key, timeline,
+            getattr(settings, 'MWS_FULFILLMENT_TIMELINE_TIMEOUT', 3600))
+    return timeline
+
+
+def invalidate_fulfillment_timelines(*orders):
+    """
+    Invalidate the cached timelines of all fulfillment orders for the Oscar
+    *orders*, given as instances or IDs. Shipments belong to the order and
+    not to a single fulfillment order, so all of them are affected when
+    shipments are updated. The date of the last update is changed which
+    results in new cache keys.
+
+    :rtype datetime: the new date of the last update.
+    """
+    date_updated = tz_now()
+    FulfillmentOrder.objects.filter(order__in=orders).update(
+        date_updated=date_updated)
+    return date_updated
@@ -0,0 +1,226 @@
+import logging
+
+from datetime import timedelta
+from collections import defaultdict
+from dateutil import parser as du_parser
+
+from django.conf import settings
+from django.db.models import Q, get_model
+from django.utils.timezone import now as tz_now
+
+from ..api import MWSObject, MWSError, get_error_code
+from ..utils import get_request_throttle
+from ..connection import get_merchant_connection
+from .timeline import invalidate_fulfillment_timelines
+
+logger = logging.getLogger('oscar_mws')
+
+FulfillmentOrder = get_model('oscar_mws', 'FulfillmentOrder')
+ShipmentPackage = get_model('oscar_mws', 'ShipmentPackage')
+PackageTrackingEvent = get_model('oscar_mws', 'PackageTrackingEvent')
+
+# Carrier statuses that need attention and are tracked at the base interval
+# independent of the age of the shipment
+TRACKING_ATTENTION_STATUSES = (
+    'DELAYED', 'AVAILABLE_FOR_PICKUP', 'CUSTOMER_ACTION')
+
+# Request quota and restore rate in seconds of GetPackageTrackingDetails
+PACKAGE_TRACKING_QUOTA = (30, 0.5)
+
+# Packages throttled by MWS are retried after this delay instead of their
+# regular tracking interval
+THROTTLED_RETRY_DELAY = timedelta(minutes=1)
+
+
+def get_batch_size():
+    return getattr(settings, 'MWS_PACKAGE_TRACKING_BATCH_SIZE', 100)
+
+
+def get_tracking_interval(package, now=None):
+    """
+    Get the time to wait before the tracking details of *package* are
+    requested again. Packages are tracked every
+    ``MWS_PACKAGE_TRACKING_INTERVAL`` seconds in the first week after they
+    have been shipped. The interval grows by the base interval with every
+    week after that, unless the carrier status needs attention.
+    """
+    now = now or tz_now()
+    interval = timedelta(
+        seconds=getattr(settings, 'MWS_PACKAGE_TRACKING_INTERVAL', 14400))
+    if package.tracking_status in TRACKING_ATTENTION_STATUSES:
+        return interval
+
+    date_shipped = package.fulfillment_shipment.date_shipped
+    if date_shipped is None:
+        return interval
+    weeks = max((now - date_shipped).days // 7, 0)
+    return interval * (weeks + 1)
+
+
+def get_due_packages(batch_size=None, now=None):
+    """
+    Get the packages whose tracking details are due for an update, the
+    packages that have been due the longest first. Packages with a final
+    carrier status, e.g. ``DELIVERED``, and packages of shipments older than
+    ``MWS_PACKAGE_TRACKING_MAX_AGE`` days are not tracked anymore.
+
+    :rtype list: at most *batch_size* packages with their shipment.
+    """
+    now = now or tz_now()
+    batch_size = batch_size or get_batch_size()
+    max_age = timedelta(
+        days=getattr(settings, 'MWS_PACKAGE_TRACKING_MAX_AGE', 60))
+    packages = ShipmentPackage.objects.filter(
+        Q(fulfillment_shipment__date_shipped__isnull=True) |
+        Q(fulfillment_shipment__date_shipped__gte=now - max_age),
+        date_tracking_due__lte=now,
+    ).exclude(
+        tracking_status__in=ShipmentPackage.TRACKING_FINAL_STATUSES,
+    ).select_related(
+        'fulfillment_shipment',
+    ).order_by('date_tracking_due', 'id')
+    return list(packages[:batch_size])
+
+
+def _parse_date(value):
+    if not value:
+        return None
+    return du_parser.parse(value)
+
+
+def get_tracking_events(package, response):
+    """
+    Get the tracking events in the *response* to a
+    ``GetPackageTrackingDetails`` request as unsaved
+    :class:`PackageTrackingEvent <oscar_mws.models.PackageTrackingEvent>`
+    instances for *package*.
+    """
+    events = []
+    tracking_events = response.get('TrackingEvents') or MWSObject()
+    for event in tracking_events.get_list('member'):
+        address = event.get('EventAddress') or MWSObject()
+        events.append(PackageTrackingEvent(
+            package=package,
+            event_code=event.EventCode,
+            event_date=_parse_date(event.EventDate),
+            city=address.get('City') or u'',
+            state=address.get('State') or u'',
+            country=address.get('Country') or u''))
+    return events
+
+
+def is_throttled(error):
+    response = getattr(error, 'response', None)
+    if response is None:
+        return False
+    return get_error_code(response.content) == 'RequestThrottled'
+
+
+def update_package_tracking(outbound_api, package, now=None):
+    """
+    Request the tracking details for *package* from MWS and store the
+    carrier status and all tracking events that haven't been stored yet.
+    The package is scheduled for the next update using
+    :func:`get_tracking_interval`.
+
+    :raises MWSError: if the tracking details can't be retrieved.
+    :rtype bool: ``True`` if the status or the tracking events of the
+        package have changed.
+    """
+    now = now or tz_now()
+    response = outbound_api.get_package_tracking_details(
+        package_number=package.package_number).parsed
+
+    status = response.get('CurrentStatus') or u''
+    has_changed = status != package.tracking_status
+    package.tracking_status = status
+    package.date_estimated_arrival = _parse_date(
+        response.get('EstimatedArrivalDate'))
+    package.date_tracking_updated = now
+    package.date_tracking_due = now + get_tracking_interval(package, now)
+    package.save()
+
+    existing = set(
+        package.tracking_events.values_list('event_date', 'event_code'))
+    new_events = [
+        e for e in get_tracking_events(package, response)
+        if (e.event_date, e.event_code) not in existing]
+    PackageTrackingEvent.objects.bulk_create(new_events)
+    return has_changed or bool(new_events)
+
+
+def update_due_packages(batch_size=None):
+    """
+    Update the tracking details of the packages that are due as returned
+    by :func:`get_due_packages`. Each package requires a separate request to
+    MWS using the merchant account of its fulfillment order. The requests
+    are throttled to stay within the request quota of the merchant account.
+    Packages that fail to update are retried after their regular interval,
+    packages that are throttled by MWS anyway are retried after
+    ``THROTTLED_RETRY_DELAY``. The cached
+    fulfillment timelines of orders with changed packages are invalidated.
+
+    :rtype tuple: the number of updated and failed packages.
+    """
+    now = tz_now()
+    packages = get_due_packages(batch_size, now)
+    if not packages:
+        return 0, 0
+
+    order_ids = set(p.fulfillment_shipment.order_id for p in packages)
+    seller_ids = dict(FulfillmentOrder.objects.filter(
+        order_id__in=order_ids,
+    ).values_list('order_id', 'merchant__seller_id'))
+
+    packages_by_seller = defaultdict(list)
+    for package in packages:
+        seller_id = seller_ids.get(package.fulfillment_shipment.order_id)
+        packages_by_seller[seller_id].append(package)
+
+    num_updated = num_failed = 0
+    changed_order_ids = set()
+    for seller_id, seller_packages in packages_by_seller.iteritems():
+        outbound_api = None
+        if seller_id:
+            outbound_api = get_merchant_connection(seller_id, 'outbound')
+        throttle = get_request_throttle(
+            seller_id, 'GetPackageTrackingDetails', *PACKAGE_TRACKING_QUOTA)
+
+        for package in seller_packages:
+            try:
+                if outbound_api is None:
+                    raise MWSError(
+                        "no merchant account for package {0}".format(
+                            package.package_number))
+                throttle.wait()
+                has_changed = update_package_tracking(
+                    outbound_api, package, now)
+            except MWSError as exc:
+                if is_throttled(exc):
+                    logger.warning(
+                        "updating tracking details was throttled",
+                        extra={'seller_id': seller_id,
+                               'package_number': package.package_number})
+                    retry_delay = THROTTLED_RETRY_DELAY
+                else:
+                    logger.error(
+                        "updating tracking details failed", exc_info=1,
+                        extra={'seller_id': seller_id,
+                               'package_number': package.package_number})
+                    retry_delay = get_tracking_interval(package, now)
+                ShipmentPackage.objects.filter(pk=package.pk).update(
+                    date_tracking_due=now + retry_delay)
+                num_failed += 1
+                continue
+
+            num_updated += 1
+            if has_changed:
+                changed_order_ids.add(package.fulfillment_shipment.order_id)
+
+    if changed_order_ids:
+        invalidate_fulfillment_timelines(*changed_order_ids)
+
+    logger.info(
+        "updated tracking details for {0} packages, {1} failed".format(
+            num_updated, num_failed))
+    return num_updated, num_failed
@@ -0,0 +1,206 @@
+import socket
+import logging
+import threading
+
+from collections import defaultdict, namedtuple
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from .utils import load_class
+
+logger = logging.getLogger('oscar_mws')
+
+
+class RequestMetrics(namedtuple('RequestMetrics', [
+        'action', 'method', 'host', 'status_code', 'error_code',
+        'response_bytes', 'sign_time', 'http_time', 'parse_time'])):
+    """
+    Metrics of a single request to MWS. The times are in seconds and split
+    into signing the request, the HTTP request including reading the
+    response and parsing the response. ``error_code`` is the MWS error code
+    of failed requests, e.g. ``RequestThrottled``, or the name of the
+    exception for requests that didn't receive a response or whose response
+    couldn't be processed, e.g. ``ConnectionError``. ``status_code`` is
+    ``None`` for these requests.
+    """
+    __slots__ = ()
+
+    @property
+    def total_time(self):
+        return self.sign_time + self.http_time + self.parse_time
+
+    @property
+    def is_throttled(self):
+        return self.error_code == 'RequestThrottled'
+
+
+class LoggingSink(object):
+    """
+    Log a single line for each request to *logger_name* at *level*.
+    """
+
+    def __init__(self, logger_name='oscar_mws.metrics', level=logging.INFO):
+        self.logger = logging.getLogger(logger_name)
+        self.level = level
+
+    def emit(self, metrics):
+        if not self.logger.isEnabledFor(self.level):
+            return
+        self.logger.log(
+            self.level,
+            "%s %s %s %s in %.1fms (sign %.1fms, http %.1fms, parse %.1fms), "
+            "%d bytes", metrics.method, metrics.action,
+            metrics.status_code, metrics.error_code or 'OK',
+            metrics.total_time * 1000, metrics.sign_time * 1000,
+            metrics.http_time * 1000, metrics.parse_time * 1000,
+            metrics.response_bytes, extra=metrics._asdict())
+
+
+class StatsdSink(object):
+    """
+    Send counters and timers for each request to a StatsD server at *host*
+    and *port* over UDP. All metric names start with *prefix* followed by
+    the MWS action. Errors sending the packet are ignored.
+    """
+
+    def __init__(self, host='localhost', port=8125, prefix='oscar_mws'):
+        self.address = (socket.gethostbyname(host), port)
+        self.prefix = prefix
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def get_lines(self, metrics):
+        name = '{0}.{1}'.format(self.prefix, metrics.action)
+        lines = ['{0}.requests:1|c'.format(name)]
+        if metrics.status_code is not None:
+            lines.append(
+                '{0}.status.{1}:1|c'.format(name, metrics.status_code))
+        lines += [
+            '{0}.response_bytes:{1}|c'.format(name, metrics.response_bytes),
+            '{0}.time.sign:{1:.3f}|ms'.format(name, metrics.sign_time * 1000),
+            '{0}.time.http:{1:.3f}|ms'.format(name, metrics.http_time * 1000),
+            '{0}.time.parse:{1:.3f}|ms'.format(
+                name, metrics.parse_time * 1000),
+        ]
+        if metrics.error_code:
+            lines.append(
+                '{0}.errors.{1}:1|c'.format(name, metrics.error_code))
+        return lines
+
+    def emit(self, metrics):
+        try:
+            self.socket.sendto('\n'.join(self.get_lines(metrics)),
+                               self.address)
+        except socket.error:
+            pass
+
+
+class CounterSink(object):
+    """
+    Keep in-process counters of the number of requests, response bytes and
+    the time spent in each phase labelled by action, status code and error
+    code. The counters can be rendered in the Prometheus text format to be
+    exposed to a Prometheus server.
+    """
+    PHASES = ('sign', 'http', 'parse')
+
+    def __init__(self):
+        self._counters = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def emit(self, metrics):
+        status_code = metrics.status_code
+        labels = (metrics.action, '' if status_code is None else status_code,
+                  metrics.error_code or '')
+        with self._lock:
+            self._counters[('mws_requests_total', labels)] += 1
+            self._counters[('mws_response_bytes_total', labels)] += \
+                metrics.response_bytes
+            for phase in self.PHASES:
+                self._counters[('mws_{0}_seconds_total'.format(phase),
+                                labels)] += getattr(metrics, phase + '_time')
+
+    def get_counters(self):
+        """
+        Get a copy of the counters as a dictionary mapping the tuple of the
+        counter name and the label values to the value of the counter.
+        """
+        with self._lock:
+            return dict(self._counters)
+
+    def render(self):
+        lines = []
+        for (name, labels), value in sorted(self.get_counters().items()):
+            lines.append(
+                '{0}{{action="{1}",status="{2}",error="{3}"}} {4!r}'.format(
+                    name, labels[0], labels[1], labels[2], value))
+        return '\n'.join(lines) + '\n'
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+
+
+_sinks = None
+
+
+def load_sinks():
+    """
+    Create the sinks configured in ``MWS_INSTRUMENTATION_SINKS``. Each entry
+    is either the dotted path of a sink class or a tuple of the path and a
+    dictionary of keyword arguments for the class. Sinks that can't be
+    created are logged and left out so that they never affect requests.
+    """
+    sinks = []
+    for sink in getattr(settings, 'MWS_INSTRUMENTATION_SINKS', None) or []:
+        try:
+            kwargs = {}
+            if not isinstance(sink, basestring):
+                sink, kwargs = sink
+            sink_class = load_class(sink)
+            if sink_class is None:
+                raise ImproperlyConfigured(
+                    "cannot find instrumentation sink {0}".format(sink))
+            sinks.append(sink_class(**kwargs))
+        except Exception:
+            logger.error(
+                "could not create instrumentation sink {0}".format(sink),
+                exc_info=1)
+    return sinks
+
+
+def get_sinks():
+    """
+    Get the configured sinks. They are created on first use and the list is
+    kept until :func:`reset_sinks` is called, even if some sinks failed.
+    """
+    global _sinks
+    if _sinks is None:
+        _sinks = load_sinks()
+    return _sinks
+
+
+def reset_sinks():
+    """
+    Reset the configured sinks so that they are created again from the
+    settings on next use.
+    """
+    global _sinks
+    _sinks = None
+
+
+def is_enabled():
+    return bool(get_sinks())
+
+
+def emit(metrics):
+    """
+    Pass *metrics* to all configured sinks. Errors raised by a sink are
+    logged and never affect the request.
+    """
+    for sink in get_sinks():
+        try:
+            sink.emit(metrics)
+        except Exception:
+            logger.error("instrumentation sink {0} failed".format(
+                sink.__class__.__name__), exc_info=1)
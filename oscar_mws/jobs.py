@@ -0,0 +1,258 @@
+import logging
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F, Q, get_model
+from django.utils.timezone import now as tz_now
+
+from .api import MWSError
+from .utils import chunks
+from .feeds import gateway as feeds_gw
+from .fulfillment.gateway import update_inventory
+
+logger = logging.getLogger('oscar_mws')
+
+Product = get_model('catalogue', 'Product')
+MwsJob = get_model('oscar_mws', 'MwsJob')
+MwsJobError = get_model('oscar_mws', 'MwsJobError')
+AmazonProfile = get_model('oscar_mws', 'AmazonProfile')
+
+
+def get_batch_size():
+    return getattr(settings, 'MWS_JOB_BATCH_SIZE', 100)
+
+
+def get_job_timeout():
+    return timedelta(seconds=getattr(settings, 'MWS_JOB_TIMEOUT', 21600))
+
+
+def create_job(action, marketplace, products=None):
+    """
+    Create a pending job running *action* for *products* in *marketplace*.
+    If *products* is empty, the job is flagged to run on all products the
+    action applies to. Only the job is stored here, the products are
+    processed by :func:`run_job`.
+    """
+    job = MwsJob.objects.create(
+        action=action, marketplace=marketplace, all_products=not products)
+    if products:
+        job.products.add(*products)
+    return job
+
+
+def get_default_products(job):
+    """
+    Get all products that the action of *job* applies to when it runs on
+    all products.
+    """
+    if job.action == MwsJob.ACTION_SUBMIT_PRODUCT_FEED:
+        return Product.objects.filter(
+            Q(amazon_profile=None) | Q(amazon_profile__asin=u''))
+    elif job.action == MwsJob.ACTION_SWITCH_TO_AFN:
+        return Product.objects.filter(
+            Q(amazon_profile=None) |
+            Q(amazon_profile__marketplaces=job.marketplace))
+    elif job.action == MwsJob.ACTION_UPDATE_PRODUCT_IDENTIFIERS:
+        return Product.objects.filter(
+            amazon_profile__marketplaces__isnull=False)
+    return Product.objects.filter(amazon_profile__isnull=False)
+
+
+def get_products(job):
+    """
+    Get the queryset of distinct products that *job* runs on. This is empty
+    if the selected products have been deleted in the meantime.
+    """
+    if job.all_products:
+        products = get_default_products(job)
+    else:
+        products = job.products.all()
+    return products.distinct()
+
+
+def submit_product_feed(job, products):
+    submissions = feeds_gw.submit_product_feed(
+        products=products, marketplaces=[job.marketplace])
+    return submissions[0].num_messages
+
+
+def switch_to_afn(job, products):
+    # a single UPDATE with the products as subquery
+    AmazonProfile.objects.filter(product__in=products).update(
+        fulfillment_by=AmazonProfile.FULFILLMENT_BY_AMAZON)
+    submission = feeds_gw.switch_product_fulfillment(
+        job.marketplace, products=products)
+    return submission.num_messages
+
+
+def update_product_identifiers(job, products):
+    feeds_gw.update_product_identifiers(job.marketplace.merchant, products)
+
+
+def update_stock(job, products):
+    update_inventory(products)
+
+
+JOB_HANDLERS = {
+    MwsJob.ACTION_SUBMIT_PRODUCT_FEED: submit_product_feed,
+    MwsJob.ACTION_SWITCH_TO_AFN: switch_to_afn,
+    MwsJob.ACTION_UPDATE_PRODUCT_IDENTIFIERS: update_product_identifiers,
+    MwsJob.ACTION_UPDATE_STOCK: update_stock,
+}
+
+# Actions that submit a single feed for all products of the job. MWS allows
+# only a small burst of feed submissions, so these are never split up.
+FEED_ACTIONS = (MwsJob.ACTION_SUBMIT_PRODUCT_FEED,
+                MwsJob.ACTION_SWITCH_TO_AFN)
+
+# Actions that are sent to MWS one product at a time. Errors for these are
+# recorded only for the product that failed.
+SINGLE_PRODUCT_ACTIONS = (MwsJob.ACTION_UPDATE_PRODUCT_IDENTIFIERS,)
+
+
+def process_feed(job, handler, products):
+    """
+    Run *handler* for all *products* of *job* to submit a single feed. The
+    handler returns the number of messages in the feed, products that have
+    been left out of the feed, e.g. because they have no Amazon profile, are
+    counted as failed. If the handler fails, a single error is recorded for
+    the job and all products are counted as failed.
+
+    :rtype tuple: the number of processed and failed products.
+    """
+    try:
+        num_messages = handler(job, products)
+    except (MWSError, feeds_gw.MwsFeedError) as exc:
+        # the gateway has already logged the details of the error
+        MwsJobError.objects.create(job=job, message=unicode(exc))
+        return 0, job.num_total
+    return num_messages, max(job.num_total - num_messages, 0)
+
+
+def process_products(job, handler, product_ids):
+    """
+    Run *handler* for a batch of products of *job*. The handler gets the
+    products as queryset. If the handler fails, an error is recorded for
+    every product in the batch.
+
+    :rtype tuple: the number of processed and failed products.
+    """
+    products = Product.objects.filter(id__in=product_ids)
+    try:
+        handler(job, products)
+    except (MWSError, feeds_gw.MwsFeedError) as exc:
+        # the gateway has already logged the details of the error
+        MwsJobError.objects.bulk_create([
+            MwsJobError(job=job, product_id=product_id, message=unicode(exc),
+                        date_created=tz_now())
+            for product_id in product_ids])
+        return 0, len(product_ids)
+    return len(product_ids), 0
+
+
+def run_job(job):
+    """
+    Run a pending *job*. The job is claimed before it is run so that it is
+    only run once, even when several workers are running. Actions that
+    submit a feed get all products at once and submit a single feed. All
+    other actions process the products in batches of ``MWS_JOB_BATCH_SIZE``
+    and the progress counters are updated after each batch.
+
+    :rtype bool: ``True`` if the job was run, ``False`` if it isn't pending
+        anymore.
+    """
+    started = tz_now()
+    is_claimed = MwsJob.objects.filter(
+        pk=job.pk, status=MwsJob.PENDING
+    ).update(status=MwsJob.RUNNING, date_started=started)
+    if not is_claimed:
+        return False
+    job.status, job.date_started = MwsJob.RUNNING, started
+
+    jobs = MwsJob.objects.filter(pk=job.pk)
+    try:
+        products = get_products(job)
+        job.num_total = products.count()
+        jobs.update(num_total=job.num_total)
+        if not job.num_total and not job.all_products:
+            # never fall back to all products for an explicit selection
+            raise ValueError(
+                "the selected products don't exist anymore")
+
+        handler = JOB_HANDLERS[job.action]
+        if job.action in FEED_ACTIONS:
+            batches = [products]
+            process = process_feed
+        else:
+            batch_size = get_batch_size()
+            if job.action in SINGLE_PRODUCT_ACTIONS:
+                batch_size = 1
+            batches = chunks(
+                products.order_by('id').values_list('id', flat=True),
+                batch_size)
+            process = process_products
+
+        for batch in batches:
+            processed, failed = process(job, handler, batch)
+            job.num_processed += processed
+            job.num_failed += failed
+            jobs.update(num_processed=F('num_processed') + processed,
+                        num_failed=F('num_failed') + failed)
+    except Exception as exc:
+        logger.error("job {0} failed".format(job.pk), exc_info=1,
+                     extra={'job_id': job.pk, 'action': job.action})
+        MwsJobError.objects.create(job=job, message=unicode(exc))
+        status = MwsJob.FAILED
+    else:
+        status = MwsJob.DONE
+        if job.num_total and job.num_failed == job.num_total:
+            status = MwsJob.FAILED
+
+    jobs.update(status=status, date_finished=tz_now())
+    job.status = status
+    return True
+
+
+def fail_stale_jobs(now=None):
+    """
+    Mark jobs that have been running for longer than ``MWS_JOB_TIMEOUT``
+    seconds as failed. Their worker has most likely died, e.g. because the
+    process was killed, and the job would stay running forever. The jobs
+    are not run again because they might have submitted feeds already.
+
+    :rtype int: the number of failed jobs.
+    """
+    now = now or tz_now()
+    stale_ids = list(MwsJob.objects.filter(
+        status=MwsJob.RUNNING, date_started__lt=now - get_job_timeout(),
+    ).values_list('id', flat=True))
+    if not stale_ids:
+        return 0
+    num_failed = MwsJob.objects.filter(
+        id__in=stale_ids, status=MwsJob.RUNNING,
+    ).update(status=MwsJob.FAILED, date_finished=now)
+    MwsJobError.objects.bulk_create([
+        MwsJobError(job_id=job_id, date_created=now,
+                    message=u"job timed out while running")
+        for job_id in stale_ids])
+    logger.warning(
+        "marked {0} stale jobs as failed".format(num_failed),
+        extra={'job_ids': stale_ids})
+    return num_failed
+
+
+def run_pending_jobs():
+    """
+    Run all pending jobs, the oldest first. Stale running jobs are marked
+    as failed first, see :func:`fail_stale_jobs`.
+
+    :rtype list: the jobs that have been run.
+    """
+    fail_stale_jobs()
+    finished = []
+    for job in MwsJob.objects.filter(
+            status=MwsJob.PENDING).order_by('date_created', 'id'):
+        if run_job(job):
+            finished.append(job)
+    return finished
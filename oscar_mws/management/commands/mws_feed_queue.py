@@ -0,0 +1,29 @@
+from django.core.management.base import NoArgsCommand
+
+from oscar_mws.feeds import scheduler
+
+
+class Command(NoArgsCommand):
+    help = ("List all pending feed submissions with their expected "
+            "completion and the date of their next status poll.")
+
+    def handle_noargs(self, **options):
+        queue = scheduler.get_poll_queue()
+        if not queue:
+            print "No pending feed submissions"
+            return
+
+        print "\t".join([
+            "Submission", "Seller ID", "Feed type", "Messages", "Status",
+            "Submitted", "Expected", "Next poll"])
+        for entry in queue:
+            print "\t".join(unicode(value or '-') for value in [
+                entry['submission_id'],
+                entry['merchant__seller_id'],
+                entry['feed_type'],
+                entry['num_messages'],
+                entry['processing_status'],
+                entry['date_submitted'],
+                entry['date_expected'],
+                entry['date_next_poll'],
+            ])
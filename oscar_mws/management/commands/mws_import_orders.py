@@ -0,0 +1,79 @@
+import time
+
+from optparse import make_option
+
+from django.db.models import get_model
+from django.core.management.base import NoArgsCommand, CommandError
+
+from oscar_mws.api import MWSError
+from oscar_mws.orders import gateway
+
+MerchantAccount = get_model('oscar_mws', 'MerchantAccount')
+AmazonMarketplace = get_model('oscar_mws', 'AmazonMarketplace')
+
+
+class Command(NoArgsCommand):
+    help = ("Import the orders placed on Amazon marketplaces that have been "
+            "updated since the last import.")
+
+    option_list = NoArgsCommand.option_list + (
+        make_option(
+            '--order-id',
+            action='append',
+            dest='order_ids',
+            default=[],
+            help=('Import the order with this Amazon order ID regardless of '
+                  'when it has been updated. Can be used multiple times.')
+        ),
+        make_option(
+            '--seller-id',
+            dest='seller_id',
+            default=None,
+            help=('Seller ID of the merchant account the orders given with '
+                  '--order-id belong to.')
+        ),
+        make_option(
+            '--interval',
+            dest='interval',
+            type='int',
+            default=0,
+            help=('Keep running and import updated orders every INTERVAL '
+                  'seconds.')
+        ),
+    )
+
+    def handle_noargs(self, **options):
+        if options.get('order_ids'):
+            self.import_orders(options.get('seller_id'),
+                               options.get('order_ids'))
+            return
+
+        interval = options.get('interval')
+        while True:
+            self.update_marketplaces()
+            if not interval:
+                break
+            time.sleep(interval)
+
+    def import_orders(self, seller_id, order_ids):
+        try:
+            merchant = MerchantAccount.objects.get(seller_id=seller_id)
+        except MerchantAccount.DoesNotExist:
+            raise CommandError(
+                "no merchant account with seller ID {0}".format(seller_id))
+        num_created, num_updated = gateway.import_orders(merchant, order_ids)
+        print "Created {0} and updated {1} orders".format(
+            num_created, num_updated)
+
+    def update_marketplaces(self):
+        marketplaces = AmazonMarketplace.objects.select_related('merchant')
+        for marketplace in marketplaces:
+            try:
+                num_created, num_updated = gateway.update_marketplace_orders(
+                    marketplace)
+            except MWSError:
+                # the error is logged in the gateway, the marketplace is
+                # synchronised from the same point in the next run
+                continue
+            print "Created {0} and updated {1} orders for {2}".format(
+                num_created, num_updated, marketplace.marketplace_id)
@@ -0,0 +1,71 @@
+import time
+
+from optparse import make_option
+
+from django.db.models import get_model
+from django.core.management.base import NoArgsCommand
+
+from oscar_mws.api import MWSError
+from oscar_mws.feeds import gateway, scheduler
+
+MerchantAccount = get_model('oscar_mws', 'MerchantAccount')
+
+
+class Command(NoArgsCommand):
+    help = ("Poll the processing status of feed submissions that are "
+            "expected to be done and retrieve the results of completed "
+            "feeds.")
+
+    option_list = NoArgsCommand.option_list + (
+        make_option(
+            '--loop',
+            action='store_true',
+            dest='loop',
+            default=False,
+            help=('Keep running and poll feed submissions whenever they are '
+                  'due.')
+        ),
+        make_option(
+            '--all',
+            action='store_true',
+            dest='poll_all',
+            default=False,
+            help=('Poll all pending feed submissions regardless of when '
+                  'they are due.')
+        ),
+    )
+
+    def handle_noargs(self, **options):
+        if options.get('poll_all'):
+            self.poll_merchants(gateway.poll_feed_submissions)
+            return
+
+        while True:
+            estimator = scheduler.ProcessingTimeEstimator.from_history()
+            self.poll_merchants(
+                lambda m: scheduler.poll_due_submissions(m, estimator))
+            if not options.get('loop'):
+                break
+            time.sleep(self.get_sleep_time())
+
+    def get_sleep_time(self):
+        """
+        The queue is checked again every ``MWS_FEED_POLL_MIN_INTERVAL``
+        seconds so that feeds submitted in the meantime are scheduled and
+        polled on time, even if the queue was empty before. Only submissions
+        that are due are polled, checking the queue itself doesn't send
+        requests to MWS.
+        """
+        return scheduler.get_setting_interval(
+            'MWS_FEED_POLL_MIN_INTERVAL', 60).total_seconds()
+
+    def poll_merchants(self, poll):
+        for merchant in MerchantAccount.objects.all():
+            try:
+                updated_feeds = poll(merchant)
+            except MWSError:
+                # the error is logged in the gateway
+                continue
+            for submission in updated_feeds:
+                print "Feed submission #{0} is {1}".format(
+                    submission.submission_id, submission.processing_status)
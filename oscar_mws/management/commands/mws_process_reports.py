@@ -0,0 +1,62 @@
+import time
+
+from optparse import make_option
+
+from django.db.models import get_model
+from django.core.management.base import NoArgsCommand
+
+from oscar_mws.api import MWSError
+from oscar_mws.reports import gateway
+
+MerchantAccount = get_model('oscar_mws', 'MerchantAccount')
+
+
+class Command(NoArgsCommand):
+    help = ("Poll the status of pending report requests and process the "
+            "reports that are done.")
+
+    option_list = NoArgsCommand.option_list + (
+        make_option(
+            '--request',
+            dest='report_type',
+            help=('Request a new report of REPORT_TYPE for all merchants '
+                  'before polling.')
+        ),
+        make_option(
+            '--interval',
+            dest='interval',
+            type='int',
+            default=0,
+            help=('Keep running and poll pending report requests every '
+                  'INTERVAL seconds.')
+        ),
+    )
+
+    def handle_noargs(self, **options):
+        report_type = options.get('report_type')
+        if report_type:
+            for merchant in MerchantAccount.objects.all():
+                try:
+                    gateway.request_report(merchant, report_type)
+                except MWSError:
+                    continue
+
+        interval = options.get('interval')
+        while True:
+            self.process_reports()
+            if not interval:
+                break
+            time.sleep(interval)
+
+    def process_reports(self):
+        for merchant in MerchantAccount.objects.all():
+            try:
+                gateway.update_report_requests(merchant)
+            except MWSError:
+                # the error is logged in the gateway, processing completed
+                # reports of this merchant is still possible
+                pass
+            num_processed = gateway.process_completed_reports(merchant)
+            if num_processed:
+                print "Processed {0} reports for merchant {1}".format(
+                    num_processed, merchant.seller_id)
@@ -0,0 +1,39 @@
+import time
+
+from optparse import make_option
+
+from django.core.management.base import NoArgsCommand
+
+from oscar_mws import jobs
+
+
+class Command(NoArgsCommand):
+    help = ("Run pending jobs that have been created for bulk actions in "
+            "the dashboard.")
+
+    option_list = NoArgsCommand.option_list + (
+        make_option(
+            '--loop',
+            action='store_true',
+            dest='loop',
+            default=False,
+            help='Keep running and run new jobs as they are created.'
+        ),
+        make_option(
+            '--interval',
+            dest='interval',
+            type='int',
+            default=5,
+            help=('Number of seconds to wait before checking for new jobs '
+                  'when running in a loop.')
+        ),
+    )
+
+    def handle_noargs(self, **options):
+        while True:
+            for job in jobs.run_pending_jobs():
+                print "Job #{0} is {1}: {2} processed, {3} failed".format(
+                    job.id, job.status, job.num_processed, job.num_failed)
+            if not options.get('loop'):
+                break
+            time.sleep(options.get('interval'))
@@ -1,6 +1,5 @@
 from optparse import make_option
 
-from django.conf import settings
 from django.db.models import get_model
 from django.core.management.base import NoArgsCommand, CommandError
 
@@ -8,6 +7,7 @@ from oscar_mws.feeds.gateway import switch_product_fulfillment
 
 Product = get_model('catalogue', 'Product')
 AmazonProfile = get_model('oscar_mws', 'AmazonProfile')
+AmazonMarketplace = get_model('oscar_mws', 'AmazonMarketplace')
 
 
 class Command(NoArgsCommand):
@@ -25,6 +25,12 @@ class Command(NoArgsCommand):
             dest='fulfilled_by',
             help=('Switch fulfillment for all products to FULFILLED_BY')
         ),
+        make_option(
+            '--marketplace',
+            dest='marketplace_id',
+            help=('Switch fulfillment for the products sold on the '
+                  'marketplace with ID MARKETPLACE_ID')
+        ),
     )
 
     def handle_noargs(self, **options):
@@ -45,15 +51,22 @@ class Command(NoArgsCommand):
                 )
             )
 
-        merchant_id = getattr(settings, 'MWS_SELLER_ID')
+        try:
+            marketplace = AmazonMarketplace.objects.select_related(
+                'merchant').get(marketplace_id=options.get('marketplace_id'))
+        except AmazonMarketplace.DoesNotExist:
+            raise CommandError(
+                "Unknown marketplace '{0}', please specify a valid "
+                "marketplace ID".format(options.get('marketplace_id')))
+
+        products = Product.objects.filter(
+            amazon_profile__marketplaces=marketplace)
+        if not options.get('dry_run'):
+            AmazonProfile.objects.filter(product__in=products).update(
+                fulfillment_by=fulfilled_by)
 
         submission = switch_product_fulfillment(
-            products=Product.objects.all(),
-            merchant_id=merchant_id,
-            fulfillment_by=fulfilled_by,
-            fulfillment_center_id="AMAZON_NA",
-            dry_run=options.get('dry_run')
-        )
+            marketplace, products, dry_run=options.get('dry_run'))
 
         if not options.get('dry_run'):
             print "Feed submitted as ID #{0}".format(submission.submission_id)
@@ -0,0 +1,60 @@
+import time
+import logging
+
+from optparse import make_option
+
+from django.db.models import get_model
+from django.core.management.base import NoArgsCommand
+
+from oscar_mws.api import MWSError
+from oscar_mws.fulfillment import gateway
+
+logger = logging.getLogger('oscar_mws')
+
+MerchantAccount = get_model('oscar_mws', 'MerchantAccount')
+
+
+class Command(NoArgsCommand):
+    help = ("Update the stock records for all SKUs with a change in supply "
+            "since the last inventory synchronisation.")
+
+    option_list = NoArgsCommand.option_list + (
+        make_option(
+            '--full',
+            action='store_true',
+            dest='full_sync',
+            default=False,
+            help=('Request the supply of all SKUs instead of the changes '
+                  'since the last synchronisation.')
+        ),
+        make_option(
+            '--interval',
+            dest='interval',
+            type='int',
+            default=0,
+            help=('Keep running and synchronise the inventory every '
+                  'INTERVAL seconds.')
+        ),
+    )
+
+    def handle_noargs(self, **options):
+        if options.get('full_sync'):
+            MerchantAccount.objects.update(date_inventory_synced=None)
+
+        interval = options.get('interval')
+        while True:
+            self.sync_merchants()
+            if not interval:
+                break
+            time.sleep(interval)
+
+    def sync_merchants(self):
+        for merchant in MerchantAccount.objects.all():
+            try:
+                num_updated = gateway.update_inventory_changes(merchant)
+            except MWSError:
+                # the error is logged in the gateway, the merchant is
+                # synchronised with the same query start in the next run
+                continue
+            print "Updated {0} stock records for merchant {1}".format(
+                num_updated, merchant.seller_id)
@@ -0,0 +1,35 @@
+from optparse import make_option
+
+from django.db.models import get_model
+from django.core.management.base import NoArgsCommand
+
+from oscar_mws.seller import gateway
+
+MerchantAccount = get_model('oscar_mws', 'MerchantAccount')
+
+
+class Command(NoArgsCommand):
+    help = ("Update the marketplaces of all merchant accounts from Amazon.")
+
+    option_list = NoArgsCommand.option_list + (
+        make_option(
+            '--seller-id',
+            action='append',
+            dest='seller_ids',
+            default=[],
+            help=('Only update the marketplaces of the merchant account with '
+                  'this seller ID. Can be used multiple times.')
+        ),
+    )
+
+    def handle_noargs(self, **options):
+        merchants = MerchantAccount.objects.all()
+        if options.get('seller_ids'):
+            merchants = merchants.filter(
+                seller_id__in=options.get('seller_ids'))
+
+        marketplaces = gateway.update_all_marketplaces(list(merchants))
+        for seller_id, seller_marketplaces in sorted(marketplaces.items()):
+            print "Marketplaces for {0}: {1}".format(
+                seller_id,
+                ', '.join(m.marketplace_id for m in seller_marketplaces))
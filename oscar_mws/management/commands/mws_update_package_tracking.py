@@ -0,0 +1,42 @@
+import time
+
+from optparse import make_option
+
+from django.core.management.base import NoArgsCommand
+
+from oscar_mws.fulfillment import tracking
+
+
+class Command(NoArgsCommand):
+    help = ("Update the tracking details of shipped packages that are due "
+            "for an update.")
+
+    option_list = NoArgsCommand.option_list + (
+        make_option(
+            '--batch-size',
+            dest='batch_size',
+            type='int',
+            default=None,
+            help=('Maximum number of packages updated in one run. Defaults '
+                  'to MWS_PACKAGE_TRACKING_BATCH_SIZE.')
+        ),
+        make_option(
+            '--interval',
+            dest='interval',
+            type='int',
+            default=0,
+            help=('Keep running and update the due packages every '
+                  'INTERVAL seconds.')
+        ),
+    )
+
+    def handle_noargs(self, **options):
+        interval = options.get('interval')
+        while True:
+            num_updated, num_failed = tracking.update_due_packages(
+                options.get('batch_size'))
+            print ("Updated tracking details for {0} packages, "
+                   "{1} failed".format(num_updated, num_failed))
+            if not interval:
+                break
+            time.sleep(interval)
@@ -0,0 +1,52 @@
+import time
+
+from optparse import make_option
+
+from django.db.models import get_model
+from django.core.management.base import NoArgsCommand
+
+from oscar_mws.pricing import gateway
+
+AmazonMarketplace = get_model('oscar_mws', 'AmazonMarketplace')
+
+
+class Command(NoArgsCommand):
+    help = ("Update the competitive pricing snapshots of all products "
+            "listed on Amazon marketplaces.")
+
+    option_list = NoArgsCommand.option_list + (
+        make_option(
+            '--marketplace',
+            action='append',
+            dest='marketplace_ids',
+            default=[],
+            help=('Only update the pricing in the marketplace with this '
+                  'marketplace ID. Can be used multiple times.')
+        ),
+        make_option(
+            '--interval',
+            dest='interval',
+            type='int',
+            default=0,
+            help=('Keep running and start a new sweep INTERVAL seconds after '
+                  'the previous one has finished.')
+        ),
+    )
+
+    def handle_noargs(self, **options):
+        marketplaces = AmazonMarketplace.objects.select_related('merchant')
+        if options.get('marketplace_ids'):
+            marketplaces = marketplaces.filter(
+                marketplace_id__in=options.get('marketplace_ids'))
+
+        interval = options.get('interval')
+        while True:
+            for marketplace in marketplaces.all():
+                created, unchanged, failed = \
+                    gateway.update_marketplace_pricing(marketplace)
+                print ("Pricing for {0}: {1} changed, {2} unchanged, "
+                       "{3} failed".format(marketplace.marketplace_id,
+                                           created, unchanged, failed))
+            if not interval:
+                break
+            time.sleep(interval)
@@ -5,9 +5,13 @@ from django.db.models import get_model
 from django.utils.translation import ugettext_lazy as _
 from django.core.management.base import NoArgsCommand
 
+from oscar_mws.api import MWSError
 from oscar_mws.feeds import gateway
+from oscar_mws.reports import gateway as reports_gateway
+from oscar_mws.reports.readers import TYPE_MERCHANT_LISTINGS
 
 Product = get_model('catalogue', 'Product')
+AmazonMarketplace = get_model('oscar_mws', 'AmazonMarketplace')
 
 
 class Command(NoArgsCommand):
@@ -19,6 +23,16 @@ class Command(NoArgsCommand):
             default=False,
             help=_('Updates the ASINs for all products without one.')
         ),
+        make_option(
+            '--reconcile-listings',
+            action='store_true',
+            dest='reconcile_listings',
+            default=False,
+            help=_('Requests the merchant listings report for all '
+                   'marketplaces to update the ASINs of all products in '
+                   'bulk. The reports are processed by the '
+                   'mws_process_reports command.')
+        ),
     )
 
     def handle_noargs(self, **options):
@@ -30,3 +44,14 @@ class Command(NoArgsCommand):
                 products,
                 marketplace_id=settings.MWS_MARKETPLACE_ID
             )
+
+        if options.get('reconcile_listings'):
+            marketplaces = AmazonMarketplace.objects.select_related(
+                'merchant')
+            for marketplace in marketplaces:
+                try:
+                    reports_gateway.request_report(
+                        marketplace.merchant, TYPE_MERCHANT_LISTINGS,
+                        marketplace=marketplace)
+                except MWSError:
+                    continue
@@ -1,10 +1,17 @@
+from django.db.models.signals import post_save, post_delete
+
 from . import abstract_models as am
+from .registry import invalidate_merchant_registry
 
 
 class FeedSubmission(am.AbstractFeedSubmission):
     pass
 
 
+class FeedContent(am.AbstractFeedContent):
+    pass
+
+
 class FeedReport(am.AbstractFeedReport):
     pass
 
@@ -13,6 +20,10 @@ class FeedResult(am.AbstractFeedResult):
     pass
 
 
+class ReportRequest(am.AbstractReportRequest):
+    pass
+
+
 class AmazonProfile(am.AbstractAmazonProfile):
     pass
 
@@ -33,9 +44,34 @@ class ShipmentPackage(am.AbstractShipmentPackage):
     pass
 
 
+class PackageTrackingEvent(am.AbstractPackageTrackingEvent):
+    pass
+
+
 class MerchantAccount(am.AbstractMerchantAccount):
     pass
 
 
 class AmazonMarketplace(am.AbstractAmazonMarketplace):
     pass
+
+
+class AmazonOrder(am.AbstractAmazonOrder):
+    pass
+
+
+class PricingSnapshot(am.AbstractPricingSnapshot):
+    pass
+
+
+class MwsJob(am.AbstractMwsJob):
+    pass
+
+
+class MwsJobError(am.AbstractMwsJobError):
+    pass
+
+
+for sender in [MerchantAccount, AmazonMarketplace]:
+    post_save.connect(invalidate_merchant_registry, sender=sender)
+    post_delete.connect(invalidate_merchant_registry, sender=sender)
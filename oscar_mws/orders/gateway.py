@@ -0,0 +1,455 @@
+import logging
+
+from decimal import Decimal as D
+from datetime import timedelta
+from collections import defaultdict
+from dateutil import parser as du_parser
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import get_model
+from django.contrib.sites.models import Site
+from django.utils.timezone import now as tz_now
+
+from ..api import MWSObject, MWSError
+from ..utils import chunks, get_request_throttle
+from ..defaults import MWS_ORDER_STATUS_MAP
+from ..connection import get_merchant_connection
+
+logger = logging.getLogger('oscar_mws')
+
+Line = get_model('order', 'Line')
+Order = get_model('order', 'Order')
+ShippingAddress = get_model('order', 'ShippingAddress')
+Country = get_model('address', 'Country')
+Product = get_model('catalogue', 'Product')
+StockRecord = get_model('partner', 'StockRecord')
+
+AmazonOrder = get_model('oscar_mws', 'AmazonOrder')
+AmazonMarketplace = get_model('oscar_mws', 'AmazonMarketplace')
+
+# Maximum number of Amazon order IDs allowed in GetOrder requests
+MAX_GET_ORDER_IDS = 50
+# ListOrders requires the end of the queried period to be at least two
+# minutes before the time of the request
+LIST_ORDERS_DELAY = timedelta(minutes=2)
+# Orders in these statuses are not imported when they are seen for the first
+# time. Pending orders don't provide prices and a shipping address, they are
+# imported when their status changes.
+SKIPPED_ORDER_STATUSES = ('Pending', 'PendingAvailability', 'Canceled')
+
+# Request quota and restore rate in seconds for the throttled operations of
+# the Orders API. Requests for the next page share the throttle of the
+# operation that returned the first page.
+THROTTLE_QUOTAS = {
+    'ListOrders': (6, 60),
+    'GetOrder': (6, 60),
+    'ListOrderItems': (30, 2),
+}
+
+
+def get_throttle(seller_id, operation):
+    return get_request_throttle(
+        seller_id, operation, *THROTTLE_QUOTAS[operation])
+
+
+def _request(seller_id, operation, method, **kwargs):
+    get_throttle(seller_id, operation).wait()
+    return method(**kwargs).parsed
+
+
+def get_order_status(amazon_status):
+    """
+    Get the Oscar order status for *amazon_status* as configured in
+    ``MWS_ORDER_STATUS_MAP``. Unmapped statuses are used unchanged.
+    """
+    status_map = getattr(settings, 'MWS_ORDER_STATUS_MAP',
+                         MWS_ORDER_STATUS_MAP)
+    return status_map.get(amazon_status, amazon_status)
+
+
+def get_initial_sync_date():
+    days = getattr(settings, 'MWS_ORDERS_INITIAL_SYNC_DAYS', 30)
+    return tz_now() - timedelta(days=days)
+
+
+def iter_updated_orders(orders_api, seller_id, marketplace_id,
+                        updated_after, updated_before):
+    """
+    Iterate over the pages of orders in marketplace *marketplace_id* that
+    have been updated between *updated_after* and *updated_before*. Pages
+    are followed using the ``NextToken`` returned by MWS.
+
+    :raises MWSError: if an error occurs when communicating with MWS
+    :rtype generator: lists of orders as returned by MWS.
+    """
+    response = _request(
+        seller_id, 'ListOrders', orders_api.list_orders,
+        marketplaceids=[marketplace_id],
+        lastupdatedafter=updated_after.isoformat(),
+        lastupdatedbefore=updated_before.isoformat())
+    while True:
+        orders = response.get('Orders') or MWSObject()
+        yield orders.get_list('Order')
+        if not response.get('NextToken'):
+            break
+        response = _request(
+            seller_id, 'ListOrders', orders_api.list_orders_by_next_token,
+            token=response.NextToken)
+
+
+def iter_orders(orders_api, seller_id, amazon_order_ids):
+    """
+    Iterate over the orders with *amazon_order_ids* requested in batches of
+    ``MAX_GET_ORDER_IDS``, the maximum allowed in a single request.
+
+    :raises MWSError: if an error occurs when communicating with MWS
+    :rtype generator: lists of orders as returned by MWS.
+    """
+    for batch in chunks(amazon_order_ids, MAX_GET_ORDER_IDS):
+        response = _request(
+            seller_id, 'GetOrder', orders_api.get_order,
+            amazon_order_ids=batch)
+        orders = response.get('Orders') or MWSObject()
+        yield orders.get_list('Order')
+
+
+def get_order_items(orders_api, seller_id, amazon_order_id):
+    """
+    Get all items of the order with *amazon_order_id* following the
+    ``NextToken`` for orders with many items.
+
+    :raises MWSError: if an error occurs when communicating with MWS
+    """
+    order_items = []
+    response = _request(
+        seller_id, 'ListOrderItems', orders_api.list_order_items,
+        amazon_order_id=amazon_order_id)
+    while True:
+        items = response.get('OrderItems') or MWSObject()
+        order_items.extend(items.get_list('OrderItem'))
+        if not response.get('NextToken'):
+            break
+        response = _request(
+            seller_id, 'ListOrderItems',
+            orders_api.list_order_items_by_next_token,
+            token=response.NextToken)
+    return order_items
+
+
+def _get_amount(data, name):
+    money = data.get(name)
+    if not money or not money.get('Amount'):
+        return D('0.00')
+    return D(money.Amount)
+
+
+def get_shipping_address(order_data, country_codes):
+    """
+    Get an unsaved shipping address for the address in *order_data*. No
+    address is returned if the order has no address or its country isn't
+    one of the available *country_codes*.
+    """
+    address = order_data.get('ShippingAddress')
+    if not address or address.get('CountryCode') not in country_codes:
+        return None
+    first_name, __, last_name = (address.get('Name') or u'').rpartition(' ')
+    return ShippingAddress(
+        first_name=first_name,
+        last_name=last_name,
+        line1=address.get('AddressLine1') or u'',
+        line2=address.get('AddressLine2'),
+        line3=address.get('AddressLine3'),
+        line4=address.get('City'),
+        state=address.get('StateOrRegion'),
+        postcode=address.get('PostalCode'),
+        country_id=address.CountryCode)
+
+
+def get_line(item, partner, product_ids, stockrecord_ids):
+    """
+    Get an unsaved order line for the order *item* received from MWS. Taxes
+    are reported separately from the item price by MWS and are added to
+    get the prices including tax. The line is linked to the product with
+    the item's SKU and its stock record for *partner* if they exist.
+    """
+    quantity = int(item.QuantityOrdered)
+    price = _get_amount(item, 'ItemPrice')
+    discount = _get_amount(item, 'PromotionDiscount')
+    tax = _get_amount(item, 'ItemTax')
+    product_id = product_ids.get(item.SellerSKU)
+    return Line(
+        partner=partner,
+        partner_name=partner.name,
+        partner_sku=item.SellerSKU,
+        partner_line_reference=item.OrderItemId,
+        title=item.get('Title') or item.SellerSKU,
+        product_id=product_id,
+        stockrecord_id=stockrecord_ids.get(product_id),
+        quantity=quantity,
+        line_price_excl_tax=price - discount,
+        line_price_incl_tax=price - discount + tax,
+        line_price_before_discounts_excl_tax=price,
+        line_price_before_discounts_incl_tax=price + tax,
+        unit_price_excl_tax=(price / quantity).quantize(D('0.01')),
+        unit_price_incl_tax=((price + tax) / quantity).quantize(D('0.01')))
+
+
+def get_order(order_data, order_items, lines, site):
+    """
+    Get an unsaved Oscar order for *order_data* with the *lines* created
+    for its *order_items*. The order number is the Amazon order ID and the
+    status is the Amazon order status mapped by :func:`get_order_status`.
+    """
+    shipping_excl_tax = sum(
+        (_get_amount(i, 'ShippingPrice') - _get_amount(i, 'ShippingDiscount')
+         for i in order_items), D('0.00'))
+    shipping_tax = sum(
+        (_get_amount(i, 'ShippingTax') for i in order_items), D('0.00'))
+    tax = sum(
+        (_get_amount(i, 'ItemTax') for i in order_items), shipping_tax)
+
+    total_incl_tax = _get_amount(order_data, 'OrderTotal')
+    if not total_incl_tax:
+        total_incl_tax = sum(
+            (l.line_price_incl_tax for l in lines),
+            shipping_excl_tax + shipping_tax)
+    total = order_data.get('OrderTotal') or MWSObject()
+    return Order(
+        number=order_data.AmazonOrderId,
+        site=site,
+        currency=total.get('CurrencyCode') or settings.OSCAR_DEFAULT_CURRENCY,
+        total_incl_tax=total_incl_tax,
+        total_excl_tax=total_incl_tax - tax,
+        shipping_incl_tax=shipping_excl_tax + shipping_tax,
+        shipping_excl_tax=shipping_excl_tax,
+        shipping_method=order_data.get('ShipServiceLevel'),
+        status=get_order_status(order_data.OrderStatus),
+        guest_email=order_data.get('BuyerEmail'))
+
+
+def create_shipping_addresses(orders, countries):
+    """
+    Create the shipping addresses of *orders* in bulk. Bulk creation doesn't
+    return primary keys, the order number is stored in the ``notes`` of the
+    new addresses to look them up and cleared afterwards.
+
+    :param dict countries: mapping of country code to the available countries.
+    :rtype dict: mapping of Amazon order ID to the shipping address ID.
+    """
+    addresses = []
+    for order_data in orders:
+        address = get_shipping_address(order_data, countries)
+        if address is None:
+            continue
+        address.country = countries[address.country_id]
+        # save() sets the search text but isn't called by bulk_create()
+        address._update_search_text()
+        address.notes = order_data.AmazonOrderId
+        addresses.append(address)
+    if not addresses:
+        return {}
+    ShippingAddress.objects.bulk_create(addresses)
+
+    address_ids = dict(ShippingAddress.objects.filter(
+        notes__in=[a.notes for a in addresses], order__isnull=True,
+    ).values_list('notes', 'id'))
+    ShippingAddress.objects.filter(
+        id__in=address_ids.values()).update(notes=None)
+    return address_ids
+
+
+def create_orders(merchant, orders, items):
+    """
+    Create Oscar orders, their lines and :class:`AmazonOrder
+    <oscar_mws.models.AmazonOrder>` for *orders* received from MWS. Shipping
+    addresses, orders, lines and Amazon orders are created in bulk. Products,
+    stock records and countries are loaded with one query each.
+
+    :param dict items: mapping of Amazon order ID to the order items.
+    """
+    partner = merchant.partner
+    site = Site.objects.get_current()
+    marketplace_ids = dict(AmazonMarketplace.objects.filter(
+        merchant=merchant).values_list('marketplace_id', 'id'))
+
+    skus = set(i.SellerSKU for order_items in items.values()
+               for i in order_items)
+    product_ids = dict(Product.objects.filter(
+        amazon_profile__sku__in=skus,
+    ).values_list('amazon_profile__sku', 'id'))
+    stockrecord_ids = dict(StockRecord.objects.filter(
+        partner=partner, product__in=product_ids.values(),
+    ).values_list('product_id', 'id'))
+    countries = Country.objects.in_bulk(set(
+        (o.get('ShippingAddress') or MWSObject()).get('CountryCode')
+        for o in orders))
+
+    address_ids = create_shipping_addresses(orders, countries)
+
+    new_orders, order_lines = [], {}
+    for order_data in orders:
+        order_items = [i for i in items[order_data.AmazonOrderId]
+                       if int(i.QuantityOrdered)]
+        lines = [get_line(i, partner, product_ids, stockrecord_ids)
+                 for i in order_items]
+        order = get_order(order_data, order_items, lines, site)
+        order.shipping_address_id = address_ids.get(order.number)
+        order.date_placed = du_parser.parse(order_data.PurchaseDate)
+        new_orders.append(order)
+        order_lines[order.number] = lines
+    # date_placed is set to the current time on creation unless auto_now_add
+    # is switched off while the orders are inserted
+    date_placed = Order._meta.get_field('date_placed')
+    date_placed.auto_now_add = False
+    try:
+        Order.objects.bulk_create(new_orders)
+    finally:
+        date_placed.auto_now_add = True
+
+    order_ids = dict(Order.objects.filter(
+        number__in=order_lines.keys(), amazon_order__isnull=True,
+    ).values_list('number', 'id'))
+
+    lines, amazon_orders = [], []
+    for order_data in orders:
+        order_id = order_ids[order_data.AmazonOrderId]
+        for line in order_lines[order_data.AmazonOrderId]:
+            line.order_id = order_id
+            lines.append(line)
+        amazon_orders.append(AmazonOrder(
+            amazon_order_id=order_data.AmazonOrderId,
+            order_id=order_id,
+            marketplace_id=marketplace_ids.get(order_data.MarketplaceId),
+            status=order_data.OrderStatus,
+            fulfillment_channel=order_data.get('FulfillmentChannel') or u'',
+            date_purchased=du_parser.parse(order_data.PurchaseDate)))
+    Line.objects.bulk_create(lines)
+    AmazonOrder.objects.bulk_create(amazon_orders)
+
+
+def update_order_statuses(changed):
+    """
+    Set the status of Amazon orders and their Oscar orders. The Oscar orders
+    get the status mapped by :func:`get_order_status`. The orders are updated
+    with one query for each status.
+
+    :param dict changed: mapping of the new status to the Amazon orders.
+    """
+    for status, amazon_orders in changed.iteritems():
+        AmazonOrder.objects.filter(
+            id__in=[o.id for o in amazon_orders]).update(status=status)
+        Order.objects.filter(
+            id__in=[o.order_id for o in amazon_orders],
+        ).update(status=get_order_status(status))
+
+
+def save_orders(merchant, orders_api, orders):
+    """
+    Create or update the Oscar orders for the *orders* received from MWS.
+    The Amazon orders that exist already are loaded with a single query and
+    only orders with a changed status are updated. The items of new orders
+    are requested from MWS before any order is saved so that orders are
+    only created with all their lines.
+
+    :raises MWSError: if an error occurs when communicating with MWS
+    :rtype tuple: the number of created and updated orders.
+    """
+    existing = dict(
+        (o.amazon_order_id, o) for o in AmazonOrder.objects.filter(
+            amazon_order_id__in=[o.AmazonOrderId for o in orders]))
+
+    new_orders = []
+    changed = defaultdict(list)
+    for order_data in orders:
+        amazon_order = existing.get(order_data.AmazonOrderId)
+        if amazon_order is None:
+            if order_data.OrderStatus not in SKIPPED_ORDER_STATUSES:
+                new_orders.append(order_data)
+        elif amazon_order.status != order_data.OrderStatus:
+            changed[order_data.OrderStatus].append(amazon_order)
+
+    items = {}
+    for order_data in new_orders:
+        items[order_data.AmazonOrderId] = get_order_items(
+            orders_api, merchant.seller_id, order_data.AmazonOrderId)
+
+    with transaction.commit_on_success():
+        if new_orders:
+            create_orders(merchant, new_orders, items)
+        update_order_statuses(changed)
+
+    num_updated = sum(len(o) for o in changed.itervalues())
+    return len(new_orders), num_updated
+
+
+def update_marketplace_orders(marketplace):
+    """
+    Import the orders of *marketplace* that have been updated since the last
+    synchronisation. The orders are requested page by page using
+    ``ListOrders`` with ``LastUpdatedAfter`` set to the high-water mark
+    stored in :attr:`AmazonMarketplace.date_orders_synced
+    <oscar_mws.models.AmazonMarketplace.date_orders_synced>`. The first
+    synchronisation imports the orders updated in the last
+    ``MWS_ORDERS_INITIAL_SYNC_DAYS`` days.
+
+    The high-water mark is only moved forward if all pages have been
+    imported. Importing orders is idempotent, a failed synchronisation is
+    repeated from the same point in the next run.
+
+    :raises MWSError: if an error occurs when communicating with MWS
+    :rtype tuple: the number of created and updated orders.
+    """
+    merchant = marketplace.merchant
+    updated_after = marketplace.date_orders_synced or get_initial_sync_date()
+    updated_before = tz_now() - LIST_ORDERS_DELAY
+    orders_api = get_merchant_connection(merchant.seller_id, 'orders')
+
+    num_created = num_updated = 0
+    try:
+        for orders in iter_updated_orders(
+                orders_api, merchant.seller_id, marketplace.marketplace_id,
+                updated_after, updated_before):
+            created, updated = save_orders(merchant, orders_api, orders)
+            num_created += created
+            num_updated += updated
+    except MWSError:
+        logger.error(
+            "importing orders failed", exc_info=1, extra={
+                'seller_id': merchant.seller_id,
+                'marketplace_id': marketplace.marketplace_id,
+                'updated_after': updated_after.isoformat()})
+        raise
+
+    AmazonMarketplace.objects.filter(pk=marketplace.pk).update(
+        date_orders_synced=updated_before)
+    marketplace.date_orders_synced = updated_before
+    logger.info(
+        "created {0} and updated {1} orders".format(num_created, num_updated),
+        extra={'marketplace_id': marketplace.marketplace_id})
+    return num_created, num_updated
+
+
+def import_orders(merchant, amazon_order_ids):
+    """
+    Import the orders with *amazon_order_ids* for *merchant* regardless of
+    when they have been updated. The orders are requested using
+    ``GetOrder`` in batches of ``MAX_GET_ORDER_IDS``.
+
+    :raises MWSError: if an error occurs when communicating with MWS
+    :rtype tuple: the number of created and updated orders.
+    """
+    orders_api = get_merchant_connection(merchant.seller_id, 'orders')
+    num_created = num_updated = 0
+    try:
+        for orders in iter_orders(
+                orders_api, merchant.seller_id, amazon_order_ids):
+            created, updated = save_orders(merchant, orders_api, orders)
+            num_created += created
+            num_updated += updated
+    except MWSError:
+        logger.error(
+            "importing orders failed", exc_info=1,
+            extra={'seller_id': merchant.seller_id})
+        raise
+    return num_created, num_updated
@@ -0,0 +1,186 @@
+import logging
+
+from decimal import Decimal as D
+from collections import defaultdict
+
+from django.db.models import get_model
+from django.utils.timezone import now as tz_now
+
+from ..api import MWSObject, MWSError
+from ..utils import chunks, get_request_throttle
+from ..connection import get_merchant_connection
+from .snapshots import save_snapshots
+
+logger = logging.getLogger('oscar_mws')
+
+AmazonProfile = get_model('oscar_mws', 'AmazonProfile')
+
+# Maximum number of SKUs allowed in a single pricing request
+MAX_PRICING_SKUS = 20
+# ID of the competitive price for the buy box of new items
+BUYBOX_NEW_PRICE_ID = '1'
+
+# Request quota and restore rate in seconds for the pricing operations of
+# the Products API. MWS restores 10 SKUs per second, i.e. one request for
+# MAX_PRICING_SKUS every two seconds.
+THROTTLE_QUOTAS = {
+    'GetCompetitivePricingForSKU': (20, 2),
+    'GetLowestOfferListingsForSKU': (20, 2),
+}
+
+
+def _request(seller_id, operation, method, **kwargs):
+    get_request_throttle(
+        seller_id, operation, *THROTTLE_QUOTAS[operation]).wait()
+    return method(**kwargs).parsed
+
+
+def _get_results(response):
+    # a single result is not wrapped in a list by the parser
+    if isinstance(response, list):
+        return response
+    return [response] if response else []
+
+
+def _get_landed_price(price):
+    landed = (price.get('Price') or MWSObject()).get('LandedPrice')
+    if not landed or not landed.get('Amount'):
+        return None, u''
+    return D(landed.Amount), landed.get('CurrencyCode') or u''
+
+
+def get_competitive_values(result):
+    """
+    Get the snapshot values for the buy box, the number of offers and the
+    sales rank from a ``GetCompetitivePricingForSKU`` *result*.
+    """
+    values = {
+        'currency': u'',
+        'buybox_price': None,
+        'is_buybox_ours': False,
+        'num_offers': None,
+        'sales_rank': None,
+    }
+    product = result.get('Product') or MWSObject()
+    pricing = product.get('CompetitivePricing') or MWSObject()
+
+    prices = pricing.get('CompetitivePrices') or MWSObject()
+    for price in prices.get_list('CompetitivePrice'):
+        if price.get('CompetitivePriceId') != BUYBOX_NEW_PRICE_ID:
+            continue
+        values['buybox_price'], values['currency'] = _get_landed_price(price)
+        values['is_buybox_ours'] = bool(
+            price.get('@belongsToRequester') == 'true')
+
+    counts = pricing.get('NumberOfOfferListings') or MWSObject()
+    for count in counts.get_list('OfferListingCount'):
+        if count.get('@condition') == 'New':
+            values['num_offers'] = int(count.get('#text') or 0)
+
+    ranks = product.get('SalesRankings') or MWSObject()
+    for rank in ranks.get_list('SalesRank')[:1]:
+        values['sales_rank'] = int(rank.Rank)
+    return values
+
+
+def get_lowest_price(result):
+    """
+    Get the lowest landed price and its currency from a
+    ``GetLowestOfferListingsForSKU`` *result*.
+    """
+    product = result.get('Product') or MWSObject()
+    listings = product.get('LowestOfferListings') or MWSObject()
+    prices = [_get_landed_price(listing)
+              for listing in listings.get_list('LowestOfferListing')]
+    prices = [p for p in prices if p[0] is not None]
+    if not prices:
+        return None, u''
+    return min(prices)
+
+
+def get_pricing_values(products_api, seller_id, marketplace_id, skus):
+    """
+    Request the competitive pricing and the lowest prices of other sellers
+    for new items for *skus* from MWS. At most ``MAX_PRICING_SKUS`` can be
+    requested at once. SKUs that MWS reports an error for in either request
+    are left out.
+
+    :raises MWSError: if an error occurs when communicating with MWS
+    :rtype dict: mapping of SKU to the snapshot values.
+    """
+    values = {}
+    response = _request(
+        seller_id, 'GetCompetitivePricingForSKU',
+        products_api.get_competitive_pricing_for_sku,
+        marketplaceid=marketplace_id, skus=skus)
+    for result in _get_results(response):
+        if result.get('@status') == 'Success':
+            values[result['@SellerSKU']] = get_competitive_values(result)
+
+    response = _request(
+        seller_id, 'GetLowestOfferListingsForSKU',
+        products_api.get_lowest_offer_listings_for_sku,
+        marketplaceid=marketplace_id, skus=skus, condition='New',
+        excludeme='True')
+    lowest_prices = {}
+    for result in _get_results(response):
+        if result.get('@status') == 'Success':
+            lowest_prices[result['@SellerSKU']] = get_lowest_price(result)
+
+    for sku in values.keys():
+        if sku not in lowest_prices:
+            del values[sku]
+            continue
+        price, currency = lowest_prices[sku]
+        values[sku]['lowest_price'] = price
+        values[sku]['currency'] = values[sku]['currency'] or currency
+    return values
+
+
+def update_marketplace_pricing(marketplace):
+    """
+    Update the pricing snapshots for all products listed in *marketplace*.
+    The SKUs are requested in batches of ``MAX_PRICING_SKUS`` and the
+    requests are throttled to the restore rate of MWS. A batch that fails is
+    logged and skipped so that a single error doesn't stop the sweep.
+
+    :rtype tuple: the number of created, unchanged and failed snapshots.
+    """
+    merchant = marketplace.merchant
+    products_api = get_merchant_connection(merchant.seller_id, 'products')
+
+    profile_ids = defaultdict(list)
+    profiles = AmazonProfile.objects.filter(
+        marketplaces=marketplace).exclude(sku=u'').values_list('id', 'sku')
+    for profile_id, sku in profiles:
+        profile_ids[sku].append(profile_id)
+
+    num_created = num_unchanged = num_failed = 0
+    for skus in chunks(sorted(profile_ids), MAX_PRICING_SKUS):
+        try:
+            pricing = get_pricing_values(
+                products_api, merchant.seller_id, marketplace.marketplace_id,
+                skus)
+        except MWSError:
+            logger.error(
+                "requesting pricing failed", exc_info=1, extra={
+                    'seller_id': merchant.seller_id,
+                    'marketplace_id': marketplace.marketplace_id,
+                    'skus': skus})
+            num_failed += len(skus)
+            continue
+
+        values = {}
+        for sku, sku_values in pricing.iteritems():
+            for profile_id in profile_ids[sku]:
+                values[profile_id] = sku_values
+        created, unchanged = save_snapshots(marketplace, values, tz_now())
+        num_created += created
+        num_unchanged += unchanged
+        num_failed += len(skus) - len(pricing)
+
+    logger.info(
+        "created {0} pricing snapshots, {1} unchanged, {2} failed".format(
+            num_created, num_unchanged, num_failed),
+        extra={'marketplace_id': marketplace.marketplace_id})
+    return num_created, num_unchanged, num_failed
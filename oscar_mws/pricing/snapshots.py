@@ -0,0 +1,76 @@
+from django.db.models import Max, get_model
+
+from ..utils import chunks
+
+PricingSnapshot = get_model('oscar_mws', 'PricingSnapshot')
+
+
+def _get_latest(snapshots):
+    latest_ids = [
+        row['latest_id'] for row in snapshots.values(
+            'profile').annotate(latest_id=Max('id'))]
+    return PricingSnapshot.objects.filter(
+        id__in=latest_ids).select_related('profile')
+
+
+def get_latest_snapshots(marketplace, skus=None):
+    """
+    Get the latest pricing snapshot for each product in *marketplace* or,
+    if given, only for the products with *skus*. The snapshots are read
+    from the database only, ``date_checked`` tells how recent the values
+    are.
+
+    :rtype dict: mapping of SKU to :class:`PricingSnapshot
+        <oscar_mws.models.PricingSnapshot>`.
+    """
+    snapshots = PricingSnapshot.objects.filter(marketplace=marketplace)
+    if skus is None:
+        return dict((s.profile.sku, s) for s in _get_latest(snapshots))
+
+    latest = {}
+    for batch in chunks(skus, 500):
+        for snapshot in _get_latest(snapshots.filter(profile__sku__in=batch)):
+            latest[snapshot.profile.sku] = snapshot
+    return latest
+
+
+def get_latest_snapshot(marketplace, sku):
+    """
+    Get the latest pricing snapshot for the product with *sku* in
+    *marketplace* or ``None`` if there is none.
+    """
+    return get_latest_snapshots(marketplace, [sku]).get(sku)
+
+
+def save_snapshots(marketplace, values, date_checked):
+    """
+    Store the pricing *values* checked at *date_checked*. A new snapshot is
+    created for a product only if its values differ from its latest
+    snapshot. Otherwise, ``date_checked`` of the latest snapshot is updated.
+    New snapshots are created in bulk and unchanged snapshots are updated
+    with a single query.
+
+    :param dict values: mapping of Amazon profile ID to a dictionary of the
+        snapshot values named in ``PricingSnapshot.VALUE_FIELDS``.
+    :rtype tuple: the number of created and unchanged snapshots.
+    """
+    latest = dict(
+        (s.profile_id, s) for s in _get_latest(PricingSnapshot.objects.filter(
+            marketplace=marketplace, profile__in=values.keys())))
+
+    new_snapshots, unchanged_ids = [], []
+    for profile_id, snapshot_values in values.iteritems():
+        snapshot = latest.get(profile_id)
+        if snapshot is not None and snapshot.get_values() == snapshot_values:
+            unchanged_ids.append(snapshot.id)
+            continue
+        new_snapshots.append(PricingSnapshot(
+            profile_id=profile_id, marketplace=marketplace,
+            date_created=date_checked, date_checked=date_checked,
+            **snapshot_values))
+
+    PricingSnapshot.objects.bulk_create(new_snapshots)
+    if unchanged_ids:
+        PricingSnapshot.objects.filter(id__in=unchanged_ids).update(
+            date_checked=date_checked)
+    return len(new_snapshots), len(unchanged_ids)
@@ -0,0 +1,211 @@
+import time
+import threading
+
+from collections import OrderedDict, namedtuple
+
+from django.conf import settings
+from django.core.cache import cache
+
+import oscar_mws
+
+CACHE_KEY_PREFIX = 'oscar_mws:merchant-registry'
+VERSION_KEY = '{0}:version'.format(CACHE_KEY_PREFIX)
+
+
+MerchantEntry = namedtuple('MerchantEntry', [
+    'id', 'seller_id', 'name', 'region', 'aws_api_key', 'aws_api_secret',
+    'endpoint', 'marketplace_ids'])
+
+
+def build_merchant_registry():
+    """
+    Load all merchant accounts and the IDs of their marketplaces from the
+    database in a single query. If several merchant accounts have the same
+    seller ID, the one created first is used.
+
+    :rtype dict: mapping of seller ID to ``MerchantEntry``.
+    """
+    from django.db.models import get_model
+    MerchantAccount = get_model('oscar_mws', 'MerchantAccount')
+
+    rows = MerchantAccount.objects.order_by(
+        'id', 'marketplaces__id',
+    ).values_list(
+        'id', 'seller_id', 'name', 'region', 'aws_api_key',
+        'aws_api_secret', 'marketplaces__marketplace_id')
+
+    merchants = OrderedDict()
+    for row in rows:
+        merchant = merchants.setdefault(row[0], list(row[:-1]) + [[]])
+        if row[-1] is not None:
+            merchant[-1].append(row[-1])
+
+    registry = {}
+    for (merchant_id, seller_id, name, region, key, secret,
+         marketplace_ids) in merchants.itervalues():
+        registry.setdefault(seller_id, MerchantEntry(
+            id=merchant_id, seller_id=seller_id, name=name, region=region,
+            aws_api_key=key, aws_api_secret=secret,
+            endpoint=oscar_mws.MWS_REGION_ENDPOINTS.get(region),
+            marketplace_ids=tuple(marketplace_ids)))
+    return registry
+
+
+def load_merchant_secrets():
+    """
+    Load the AWS API secrets of all merchant accounts from the database in a
+    single query. Like :func:`build_merchant_registry`, the merchant account
+    created first is used for duplicate seller IDs.
+
+    :rtype dict: mapping of seller ID to AWS API secret.
+    """
+    from django.db.models import get_model
+    MerchantAccount = get_model('oscar_mws', 'MerchantAccount')
+
+    secrets = {}
+    for seller_id, secret in MerchantAccount.objects.order_by(
+            'id').values_list('seller_id', 'aws_api_secret'):
+        secrets.setdefault(seller_id, secret)
+    return secrets
+
+
+def get_registry_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # a time-based initial version can't match a registry that was
+        # cached before the version key got evicted
+        cache.add(VERSION_KEY, int(time.time() * 1000))
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+class MerchantRegistry(object):
+    """
+    Registry of the credentials, endpoints and marketplace IDs of merchant
+    accounts. Entries are kept in an in-process LRU cache of *max_size*
+    seller IDs that is backed by the complete registry stored in the Django
+    cache for *timeout* seconds. The Django cache is populated from the
+    database in a single query when it is missing.
+
+    The AWS API secrets are never written to the Django cache, the entries
+    stored there have no ``aws_api_secret``. The secrets are only kept in
+    the process and are loaded from the database in a single query, see
+    :func:`load_merchant_secrets`, whenever the version changes.
+
+    Both layers are invalidated by incrementing a version number stored in
+    the Django cache. Every lookup compares the version of the in-process
+    entry with the current version so that changes made in other processes
+    are picked up without accessing the database. This requires a cache
+    backend that is shared by all processes, e.g. memcached or Redis. With
+    the default ``LocMemCache`` each process has its own version and changes
+    made in other processes are only picked up once the registry expired.
+    """
+
+    def __init__(self, max_size=100, timeout=3600):
+        self.max_size = max_size
+        self.timeout = timeout
+        self._entries = OrderedDict()
+        self._secrets = (None, {})
+        self._lock = threading.Lock()
+
+    def get_cache_key(self, version):
+        return '{0}:{1}'.format(CACHE_KEY_PREFIX, version)
+
+    def get(self, seller_id):
+        """
+        Get the ``MerchantEntry`` for *seller_id* or ``None`` if there is no
+        merchant account with this seller ID.
+        """
+        version = get_registry_version()
+        with self._lock:
+            try:
+                entry_version, entry = self._entries.pop(seller_id)
+            except KeyError:
+                pass
+            else:
+                if entry_version == version:
+                    # re-insert the entry to mark it as most recently used
+                    self._entries[seller_id] = (entry_version, entry)
+                    return entry
+
+        cache_key = self.get_cache_key(version)
+        registry = cache.get(cache_key)
+        if registry is None:
+            registry = build_merchant_registry()
+            with self._lock:
+                self._secrets = (version, dict(
+                    (key, e.aws_api_secret) for key, e in registry.items()))
+            cache.set(cache_key, dict(
+                (key, e._replace(aws_api_secret=None))
+                for key, e in registry.items()), self.timeout)
+
+        entry = registry.get(seller_id)
+        if entry is not None:
+            if entry.aws_api_secret is None:
+                entry = entry._replace(
+                    aws_api_secret=self.get_secret(version, seller_id))
+            with self._lock:
+                self._entries[seller_id] = (version, entry)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+        return entry
+
+    def get_secret(self, version, seller_id):
+        """
+        Get the AWS API secret of *seller_id* from the in-process secrets.
+        They are loaded from the database if they are older than *version*.
+        """
+        with self._lock:
+            secrets_version, secrets = self._secrets
+        if secrets_version != version:
+            secrets = load_merchant_secrets()
+            with self._lock:
+                self._secrets = (version, secrets)
+        return secrets.get(seller_id)
+
+    def invalidate(self):
+        """
+        Invalidate the registry in all processes sharing the Django cache.
+        """
+        try:
+            cache.incr(VERSION_KEY)
+        except ValueError:
+            cache.set(VERSION_KEY, int(time.time() * 1000))
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._secrets = (None, {})
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_merchant_registry = None
+
+
+def get_merchant_registry():
+    global _merchant_registry
+    if _merchant_registry is None:
+        _merchant_registry = MerchantRegistry(
+            max_size=getattr(settings, 'MWS_MERCHANT_REGISTRY_SIZE', 100),
+            timeout=getattr(settings, 'MWS_MERCHANT_REGISTRY_TIMEOUT', 3600))
+    return _merchant_registry
+
+
+def get_merchant(seller_id):
+    """
+    Get the ``MerchantEntry`` for *seller_id* from the merchant registry or
+    ``None`` if there is no merchant account with this seller ID.
+    """
+    return get_merchant_registry().get(seller_id)
+
+
+def invalidate_merchant_registry(**kwargs):
+    """
+    Invalidate the merchant registry. This is connected to the ``post_save``
+    and ``post_delete`` signals of ``MerchantAccount`` and
+    ``AmazonMarketplace``.
+    """
+    get_merchant_registry().invalidate()
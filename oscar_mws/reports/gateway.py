@@ -0,0 +1,325 @@
+import logging
+import tempfile
+
+from datetime import timedelta
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import get_model, F, Q
+from django.utils.timezone import now as tz_now
+
+from ..api import MWSError
+from ..utils import chunks, load_class
+from ..connection import get_merchant_connection
+from .. import abstract_models as am
+from ..defaults import MWS_REPORT_HANDLERS
+
+from .readers import FlatFileReportReader
+
+logger = logging.getLogger('oscar_mws')
+
+ReportRequest = get_model('oscar_mws', 'ReportRequest')
+
+# Maximum number of report request IDs in a GetReportRequestList request
+MAX_REPORT_REQUEST_IDS = 100
+
+PENDING_STATUSES = [am.STATUS_SUBMITTED, am.STATUS_IN_PROGRESS]
+
+
+def download_report(merchant, report_id, report_file=None):
+    """
+    Download the report with *report_id* for *merchant* from MWS. The report
+    is streamed into *report_file* while its MD5 hash is verified. A new
+    temporary file is used if no file is provided and closed if the
+    download fails. The file is returned rewound to the start of the report.
+
+    :raises MWSError: if an error occurs when communicating with MWS or the
+        MD5 hash of the report is invalid.
+    """
+    own_file = report_file is None
+    if own_file:
+        report_file = tempfile.TemporaryFile()
+    reports_api = get_merchant_connection(merchant.seller_id, 'reports')
+    try:
+        response = reports_api.get_report(
+            report_id=report_id, response_file=report_file)
+    except MWSError:
+        logger.error(
+            "could not download report {}".format(report_id), exc_info=1,
+            extra={'seller_id': merchant.seller_id, 'report_id': report_id})
+        if own_file:
+            report_file.close()
+        raise
+    return response.parsed
+
+
+def iter_report_rows(merchant, report_id, report_type, **kwargs):
+    """
+    Download a flat file report and iterate over its rows. Each row is a
+    dictionary with values converted based on the *report_type*, see
+    :class:`FlatFileReportReader
+    <oscar_mws.reports.readers.FlatFileReportReader>`. The report is stored
+    in a temporary file that is removed once all rows have been processed.
+
+    :raises MWSError: if an error occurs when communicating with MWS
+    """
+    report_file = download_report(merchant, report_id)
+    reader = FlatFileReportReader.for_report_type(
+        report_file, report_type, **kwargs)
+    try:
+        for row in reader:
+            yield row
+    finally:
+        report_file.close()
+
+    for line_num, header, value in reader.errors:
+        logger.error(
+            "invalid value in line {} of report {}".format(
+                line_num, report_id),
+            extra={'seller_id': merchant.seller_id, 'report_id': report_id,
+                   'column': header, 'value': value})
+
+
+def get_poll_delay(num_polls):
+    """
+    Get the delay before polling the status of a report request that has
+    already been polled *num_polls* times. The delay doubles with every poll
+    up to ``MWS_REPORT_POLL_MAX_INTERVAL``.
+    """
+    interval = getattr(settings, 'MWS_REPORT_POLL_INTERVAL', 60)
+    max_interval = getattr(settings, 'MWS_REPORT_POLL_MAX_INTERVAL', 900)
+    return timedelta(seconds=min(interval * 2 ** num_polls, max_interval))
+
+
+def request_report(merchant, report_type, start_date=None, end_date=None,
+                   marketplace_ids=None, marketplace=None):
+    """
+    Request a report of *report_type* for *merchant* from MWS and store it as
+    :class:`ReportRequest <oscar_mws.models.ReportRequest>` to track its
+    processing status. If *marketplace* is given, the report is requested
+    for this marketplace only and the report request is linked to it.
+
+    :raises MWSError: if an error occurs when communicating with MWS
+    """
+    if marketplace is not None and not marketplace_ids:
+        marketplace_ids = [marketplace.marketplace_id]
+    reports_api = get_merchant_connection(merchant.seller_id, 'reports')
+    try:
+        response = reports_api.request_report(
+            report_type=report_type,
+            start_date=start_date.isoformat() if start_date else None,
+            end_date=end_date.isoformat() if end_date else None,
+            marketplaceids=marketplace_ids or ()).parsed
+    except MWSError:
+        logger.error(
+            "could not request report {}".format(report_type), exc_info=1,
+            extra={'seller_id': merchant.seller_id,
+                   'report_type': report_type})
+        raise
+
+    info = response.ReportRequestInfo
+    return ReportRequest.objects.create(
+        request_id=info.ReportRequestId,
+        report_type=report_type,
+        processing_status=info.ReportProcessingStatus,
+        merchant=merchant,
+        marketplace=marketplace,
+        start_date=start_date,
+        end_date=end_date,
+        date_next_poll=tz_now() + get_poll_delay(0))
+
+
+def iter_report_request_info(reports_api, request_ids):
+    """
+    Iterate over the report request info for all *request_ids*. The IDs are
+    requested in batches of ``MAX_REPORT_REQUEST_IDS`` and responses that
+    span several pages are followed using the ``NextToken``.
+
+    :raises MWSError: if an error occurs when communicating with MWS
+    """
+    for batch in chunks(sorted(request_ids), MAX_REPORT_REQUEST_IDS):
+        response = reports_api.get_report_request_list(
+            requestids=batch, max_count=len(batch)).parsed
+        while True:
+            for info in response.get_list('ReportRequestInfo'):
+                yield info
+            if response.get('HasNext') != 'true':
+                break
+            response = reports_api.get_report_request_list_by_next_token(
+                token=response.NextToken).parsed
+
+
+def update_report_requests(merchant):
+    """
+    Poll the processing status of all pending report requests of *merchant*
+    that are due. All requests are polled in as few requests as possible,
+    see :func:`iter_report_request_info`. Requests that are still pending are
+    scheduled for the next poll with an increasing delay, see
+    :func:`get_poll_delay`.
+
+    :rtype int: the number of report requests that finished processing.
+
+    :raises MWSError: if an error occurs when communicating with MWS
+    """
+    now = tz_now()
+    pending = ReportRequest.objects.filter(
+        Q(date_next_poll__isnull=True) | Q(date_next_poll__lte=now),
+        merchant=merchant,
+        processing_status__in=PENDING_STATUSES,
+    ).values_list('request_id', 'processing_status', 'num_polls')
+    pending = dict((request_id, (status, num_polls))
+                   for request_id, status, num_polls in pending)
+    if not pending:
+        return 0
+
+    reports_api = get_merchant_connection(merchant.seller_id, 'reports')
+    try:
+        infos = list(iter_report_request_info(reports_api, pending.keys()))
+    except MWSError:
+        logger.error(
+            "could not update report requests", exc_info=1,
+            extra={'seller_id': merchant.seller_id})
+        raise
+
+    num_finished = 0
+    still_pending = defaultdict(list)
+    with transaction.commit_on_success():
+        for info in infos:
+            try:
+                status, num_polls = pending.pop(info.ReportRequestId)
+            except KeyError:
+                continue
+            status = info.ReportProcessingStatus
+            if status in PENDING_STATUSES:
+                still_pending[(status, num_polls)].append(info.ReportRequestId)
+                continue
+
+            ReportRequest.objects.filter(
+                request_id=info.ReportRequestId,
+            ).update(
+                processing_status=status,
+                report_id=info.get('GeneratedReportId') or '',
+                date_next_poll=None,
+                date_updated=now)
+            num_finished += 1
+
+        # requests missing from the response are polled again later
+        for request_id, key in pending.iteritems():
+            still_pending[key].append(request_id)
+
+        for (status, num_polls), request_ids in still_pending.iteritems():
+            for batch in chunks(request_ids, 500):
+                ReportRequest.objects.filter(request_id__in=batch).update(
+                    processing_status=status,
+                    num_polls=num_polls + 1,
+                    date_next_poll=now + get_poll_delay(num_polls + 1),
+                    date_updated=now)
+    return num_finished
+
+
+def get_report_handler(report_type):
+    """
+    Get the callable configured for *report_type* in ``MWS_REPORT_HANDLERS``
+    or ``None`` if there isn't one. The handlers in
+    :mod:`oscar_mws.defaults` are used if the setting is missing.
+    """
+    handlers = getattr(settings, 'MWS_REPORT_HANDLERS', MWS_REPORT_HANDLERS)
+    return load_class(handlers.get(report_type))
+
+
+def get_claim_timeout():
+    return timedelta(
+        seconds=getattr(settings, 'MWS_REPORT_CLAIM_TIMEOUT', 3600))
+
+
+def process_report_request(report_request, handler):
+    """
+    Download the report generated for *report_request* and pass it to
+    *handler* together with the report request. The report request is
+    claimed before the download starts which guarantees that a report is
+    only processed by one process at a time. If the download or the handler
+    fail, the claim is removed to retry processing the report later and the
+    failed attempt is counted. Claims of processes that died expire after
+    ``MWS_REPORT_CLAIM_TIMEOUT`` seconds. The report request is marked as
+    downloaded once it has been processed.
+
+    :rtype bool: ``True`` if the report was processed and ``False`` if it has
+        already been downloaded or is being processed.
+    """
+    now = tz_now()
+    claimed = ReportRequest.objects.filter(
+        Q(date_claimed__isnull=True) |
+        Q(date_claimed__lt=now - get_claim_timeout()),
+        pk=report_request.pk, date_downloaded__isnull=True,
+    ).update(date_claimed=now)
+    if not claimed:
+        return False
+
+    try:
+        report_file = download_report(
+            report_request.merchant, report_request.report_id)
+        try:
+            handler(report_request, report_file)
+        finally:
+            report_file.close()
+    except Exception:
+        ReportRequest.objects.filter(pk=report_request.pk).update(
+            date_claimed=None,
+            num_failed_attempts=F('num_failed_attempts') + 1)
+        report_request.num_failed_attempts += 1
+        raise
+    ReportRequest.objects.filter(pk=report_request.pk).update(
+        date_claimed=None, date_downloaded=now)
+    report_request.date_downloaded = now
+    return True
+
+
+def process_completed_reports(merchant):
+    """
+    Download and process all reports of *merchant* that are done but haven't
+    been downloaded yet. Reports without a handler configured in
+    ``MWS_REPORT_HANDLERS`` are left for later. A report that fails to
+    download or process is logged and skipped so that it doesn't block the
+    other reports. Reports are retried until they have failed
+    ``MWS_REPORT_MAX_ATTEMPTS`` times, reports with fewer failures are
+    processed first.
+
+    :rtype int: the number of processed reports.
+    """
+    report_requests = ReportRequest.objects.filter(
+        merchant=merchant,
+        processing_status=am.STATUS_DONE,
+        date_downloaded__isnull=True,
+        num_failed_attempts__lt=getattr(
+            settings, 'MWS_REPORT_MAX_ATTEMPTS', 5),
+    ).exclude(report_id='').select_related('merchant').order_by(
+        'num_failed_attempts', 'date_created')
+
+    num_processed = 0
+    for report_request in report_requests:
+        handler = get_report_handler(report_request.report_type)
+        if handler is None:
+            logger.warning(
+                "no handler configured for report type {}".format(
+                    report_request.report_type),
+                extra={'seller_id': merchant.seller_id,
+                       'report_id': report_request.report_id})
+            continue
+        try:
+            if process_report_request(report_request, handler):
+                num_processed += 1
+        except MWSError:
+            # errors are logged when downloading the report
+            continue
+        except Exception:
+            logger.error(
+                "processing report {} failed".format(
+                    report_request.report_id),
+                exc_info=1, extra={
+                    'seller_id': merchant.seller_id,
+                    'report_id': report_request.report_id,
+                    'report_type': report_request.report_type,
+                    'num_failed_attempts':
+                    report_request.num_failed_attempts})
+    return num_processed
@@ -0,0 +1,144 @@
+import logging
+
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import get_model
+
+from ..utils import chunks
+
+from .readers import FlatFileReportReader, TYPE_MERCHANT_LISTINGS
+
+logger = logging.getLogger('oscar_mws')
+
+AmazonProfile = get_model('oscar_mws', 'AmazonProfile')
+
+
+def update_asins(asins):
+    """
+    Update the ASINs of Amazon profiles from *asins*, a dictionary mapping
+    profile IDs to their new ASIN. Profiles with the same new ASIN are
+    updated together in chunks of 500 profiles.
+    """
+    profile_ids = defaultdict(list)
+    for profile_id, asin in asins.iteritems():
+        profile_ids[asin].append(profile_id)
+    for asin, ids in profile_ids.iteritems():
+        for id_batch in chunks(ids, 500):
+            AmazonProfile.objects.filter(id__in=id_batch).update(asin=asin)
+
+
+def reconcile_listings(marketplace, rows):
+    """
+    Reconcile the Amazon profiles in *marketplace* with the listings in
+    *rows* of a merchant listings report requested for this marketplace. The
+    ASIN of each profile is updated from the listing with the same SKU and
+    *marketplace* is added to or removed from the
+    :attr:`AmazonProfile.listed_marketplaces
+    <oscar_mws.models.AmazonProfile.listed_marketplaces>` of the profile.
+    Profiles are flagged as listed on Amazon in :attr:`AmazonProfile.is_listed
+    <oscar_mws.models.AmazonProfile.is_listed>` as long as they are listed in
+    any of their marketplaces, so the order in which the reports of several
+    marketplaces are processed doesn't matter. All profiles are loaded in a
+    single query and only profiles that changed are written to the database
+    in bulk.
+
+    :param AmazonMarketplace marketplace: the marketplace the report was
+        requested for.
+    :param rows: iterable of report rows as returned by
+        :class:`FlatFileReportReader
+        <oscar_mws.reports.readers.FlatFileReportReader>`.
+    :rtype dict: the number of ``updated`` profiles, and the SKUs of
+        ``missing`` profiles without a listing and ``unknown`` listings
+        without a profile.
+    """
+    listed_asins = {}
+    for row in rows:
+        if row.get('seller-sku'):
+            listed_asins[row['seller-sku']] = row.get('asin1') or ''
+
+    ListedMarketplace = AmazonProfile.listed_marketplaces.through
+    listed_here = set(ListedMarketplace.objects.filter(
+        amazonmarketplace=marketplace,
+    ).values_list('amazonprofile_id', flat=True))
+
+    profiles = AmazonProfile.objects.filter(
+        marketplaces=marketplace,
+    ).values_list('id', 'sku', 'asin', 'is_listed').distinct()
+
+    changed_asins = {}
+    added_ids, removed_ids, listed_ids, unlisted_ids = [], [], [], []
+    missing_skus = []
+    unknown_skus = set(listed_asins.keys())
+    for profile_id, sku, asin, is_listed in profiles:
+        unknown_skus.discard(sku)
+        if sku not in listed_asins:
+            missing_skus.append(sku)
+            if profile_id in listed_here:
+                removed_ids.append(profile_id)
+            if is_listed is not False:
+                unlisted_ids.append(profile_id)
+            continue
+
+        if listed_asins[sku] and listed_asins[sku] != asin:
+            changed_asins[profile_id] = listed_asins[sku]
+        if profile_id not in listed_here:
+            added_ids.append(profile_id)
+        if is_listed is not True:
+            listed_ids.append(profile_id)
+
+    updated_ids = set(
+        changed_asins.keys() + added_ids + removed_ids + listed_ids)
+    with transaction.commit_on_success():
+        update_asins(changed_asins)
+        for id_batch in chunks(removed_ids, 500):
+            ListedMarketplace.objects.filter(
+                amazonmarketplace=marketplace,
+                amazonprofile_id__in=id_batch).delete()
+        ListedMarketplace.objects.bulk_create([
+            ListedMarketplace(amazonprofile_id=profile_id,
+                              amazonmarketplace=marketplace)
+            for profile_id in added_ids])
+
+        # profiles missing here might still be listed in other marketplaces
+        for id_batch in chunks(unlisted_ids, 500):
+            still_listed = set(ListedMarketplace.objects.filter(
+                amazonprofile_id__in=id_batch,
+            ).values_list('amazonprofile_id', flat=True))
+            id_batch = [i for i in id_batch if i not in still_listed]
+            AmazonProfile.objects.filter(id__in=id_batch).update(
+                is_listed=False)
+            updated_ids.update(id_batch)
+        for id_batch in chunks(listed_ids, 500):
+            AmazonProfile.objects.filter(id__in=id_batch).update(
+                is_listed=True)
+
+    num_updated = len(updated_ids)
+    logger.info(
+        "reconciled listings: {} profiles updated, {} missing on Amazon, "
+        "{} unknown SKUs".format(
+            num_updated, len(missing_skus), len(unknown_skus)),
+        extra={'seller_id': marketplace.merchant.seller_id,
+               'marketplace_id': marketplace.marketplace_id})
+    return {'updated': num_updated,
+            'missing': missing_skus,
+            'unknown': sorted(unknown_skus)}
+
+
+def reconcile_listings_report(report_request, report_file):
+    """
+    Report handler for the merchant listings report, see
+    ``MWS_REPORT_HANDLERS`` and :func:`reconcile_listings`. Listings can only
+    be reconciled for reports requested for a single marketplace, other
+    reports are skipped.
+    """
+    if report_request.marketplace is None:
+        logger.warning(
+            "cannot reconcile listings of report {} without a "
+            "marketplace".format(report_request.report_id),
+            extra={'seller_id': report_request.merchant.seller_id,
+                   'report_id': report_request.report_id})
+        return None
+    reader = FlatFileReportReader.for_report_type(
+        report_file, TYPE_MERCHANT_LISTINGS)
+    return reconcile_listings(report_request.marketplace, reader)
@@ -0,0 +1,118 @@
+import csv
+
+from decimal import Decimal as D, InvalidOperation
+from dateutil import parser as du_parser
+
+TYPE_FBA_MYI_UNSUPPRESSED_INVENTORY = \
+    '_GET_FBA_MYI_UNSUPPRESSED_INVENTORY_DATA_'
+TYPE_MERCHANT_LISTINGS = '_GET_MERCHANT_LISTINGS_DATA_'
+
+# Flat file reports for the European and North American marketplaces are
+# encoded in Windows-1252, see the MWS Reports API documentation.
+DEFAULT_ENCODING = 'cp1252'
+
+
+def to_int(value):
+    return int(value)
+
+
+def to_decimal(value):
+    try:
+        return D(value)
+    except InvalidOperation:
+        raise ValueError("invalid decimal value '{}'".format(value))
+
+
+def to_bool(value):
+    return value.lower() in ('yes', 'y', 'true')
+
+
+def to_datetime(value):
+    return du_parser.parse(value)
+
+
+# Converters for the columns of the supported flat file reports. Columns
+# that are not listed are returned as unicode strings.
+REPORT_COLUMNS = {
+    TYPE_FBA_MYI_UNSUPPRESSED_INVENTORY: {
+        'your-price': to_decimal,
+        'mfn-listing-exists': to_bool,
+        'mfn-fulfillable-quantity': to_int,
+        'afn-listing-exists': to_bool,
+        'afn-warehouse-quantity': to_int,
+        'afn-fulfillable-quantity': to_int,
+        'afn-unsellable-quantity': to_int,
+        'afn-reserved-quantity': to_int,
+        'afn-total-quantity': to_int,
+        'per-unit-volume': to_decimal,
+        'afn-inbound-working-quantity': to_int,
+        'afn-inbound-shipped-quantity': to_int,
+        'afn-inbound-receiving-quantity': to_int,
+    },
+    TYPE_MERCHANT_LISTINGS: {
+        'price': to_decimal,
+        'quantity': to_int,
+        'open-date': to_datetime,
+        'item-is-marketplace': to_bool,
+        'zshop-shipping-fee': to_decimal,
+        'will-ship-internationally': to_bool,
+        'expedited-shipping': to_bool,
+        'zshop-boldface': to_bool,
+        'bid-for-featured-placement': to_bool,
+        'pending-quantity': to_int,
+    },
+}
+
+
+class FlatFileReportReader(object):
+    """
+    Iterates over the rows of a tab-delimited flat file report in
+    *report_file*. Each row is returned as a dictionary mapping the column
+    headers to the values of the row. Empty values are returned as ``None``
+    and the values of columns with a converter in *columns* are converted to
+    the corresponding Python type. The file is read row by row which means
+    that reports of any size can be processed with constant memory.
+
+    A value that can't be converted is returned as the unicode string found
+    in the report and the line, column and value are recorded in
+    :attr:`errors`.
+    """
+
+    def __init__(self, report_file, columns=None, encoding=DEFAULT_ENCODING):
+        self.report_file = report_file
+        self.columns = columns or {}
+        self.encoding = encoding
+        self.errors = []
+
+    @classmethod
+    def for_report_type(cls, report_file, report_type, **kwargs):
+        return cls(report_file, columns=REPORT_COLUMNS.get(report_type),
+                   **kwargs)
+
+    def convert(self, line_num, header, value):
+        if not value:
+            return None
+        value = value.decode(self.encoding)
+        converter = self.columns.get(header)
+        if converter is None:
+            return value
+        try:
+            return converter(value)
+        except (ValueError, TypeError):
+            self.errors.append((line_num, header, value))
+            return value
+
+    def __iter__(self):
+        reader = csv.reader(self.report_file, dialect='excel-tab',
+                            quoting=csv.QUOTE_NONE)
+        try:
+            headers = [h.decode(self.encoding).strip()
+                       for h in reader.next()]
+        except StopIteration:
+            return
+        for row in reader:
+            if not row:
+                continue
+            yield dict(
+                (header, self.convert(reader.line_num, header, value))
+                for header, value in zip(headers, row))
@@ -1,42 +1,167 @@
 import logging
 
+from collections import defaultdict
+from multiprocessing.pool import ThreadPool
+
 from django.db.models import get_model
 
-from ..api import MWSError
+from ..api import MWSError, MWSObject
+from ..registry import invalidate_merchant_registry
 from ..connection import get_merchant_connection
 
 logger = logging.getLogger('oscar_mws')
 
+MerchantAccount = get_model('oscar_mws', 'MerchantAccount')
 AmazonMarketplace = get_model('oscar_mws', 'AmazonMarketplace')
 
+# Maximum number of merchant accounts that marketplaces are requested for
+# at the same time
+MAX_CONCURRENT_REQUESTS = 8
+
+# Mapping of marketplace fields to the values in the MWS response
+MARKETPLACE_FIELDS = {
+    'name': 'Name',
+    'domain': 'DomainName',
+    'region': 'DefaultCountryCode',
+    'currency_code': 'DefaultCurrencyCode',
+}
+
+
+def iter_marketplaces(sellers_api):
+    """
+    Iterate over all marketplaces returned by
+    ``ListMarketplaceParticipations`` following the ``NextToken``.
+
+    :raises MWSError: if an error occurs when communicating with MWS
+    """
+    response = sellers_api.list_marketplace_participations().parsed
+    while True:
+        marketplaces = response.get('ListMarketplaces') or MWSObject()
+        for marketplace in marketplaces.get_list('Marketplace'):
+            yield marketplace
+        if not response.get('NextToken'):
+            break
+        response = sellers_api.list_marketplace_participations_by_next_token(
+            token=response.NextToken).parsed
 
-def update_marketplaces(merchant):
-    sellers_api = get_merchant_connection(merchant.seller_id, 'sellers')
 
+def fetch_marketplaces(merchant_api):
+    """
+    Request the marketplaces for a ``(merchant, sellers_api)`` tuple. This
+    runs in a worker thread and must not access the database.
+
+    :rtype tuple: the merchant and the list of marketplaces or ``None`` if
+        the request failed.
+    """
+    merchant, sellers_api = merchant_api
     try:
-        response = sellers_api.list_marketplace_participations().parsed
+        return merchant, list(iter_marketplaces(sellers_api))
     except MWSError:
         logger.error(
             "could not retrieve marketplaces for merchant {}".format(
                 merchant.seller_id),
             exc_info=1, extra={'seller_id': merchant.seller_id})
-        return []
-
-    marketplaces = []
-    for rsp_marketplace in response.ListMarketplaces.get_list('Marketplace'):
-        try:
-            marketplace = AmazonMarketplace.objects.get(
-                marketplace_id=rsp_marketplace.MarketplaceId,
-                merchant=merchant)
-        except AmazonMarketplace.DoesNotExist:
-            marketplace = AmazonMarketplace(
-                marketplace_id=rsp_marketplace.MarketplaceId,
-                merchant=merchant)
-        marketplace.name = rsp_marketplace.Name
-        marketplace.domain = rsp_marketplace.DomainName
-        marketplace.region = rsp_marketplace.DefaultCountryCode
-        marketplace.currency_code = rsp_marketplace.DefaultCurrencyCode
-        marketplace.save()
-
-        marketplaces.append(marketplace)
+        return merchant, None
+
+
+def get_marketplace_values(marketplace_data):
+    return dict((field, marketplace_data.get(name) or u'')
+                for field, name in MARKETPLACE_FIELDS.iteritems())
+
+
+def update_all_marketplaces(merchants=None):
+    """
+    Update the marketplaces of all *merchants*, or all merchant accounts if
+    none are given, from MWS. The marketplaces are requested concurrently
+    for up to ``MAX_CONCURRENT_REQUESTS`` merchant accounts. Existing
+    marketplaces are loaded with a single query, new marketplaces are
+    created in bulk and only changed fields are updated with one query for
+    each distinct set of changes. Nothing is written if no marketplace has
+    changed. Merchant accounts that MWS returns an error for are skipped.
+
+    :rtype dict: mapping of seller ID to the list of marketplaces returned
+        by MWS for each merchant account that was updated successfully.
+    """
+    if merchants is None:
+        merchants = list(MerchantAccount.objects.all())
+
+    # connections are looked up before starting the threads because
+    # creating them requires database access
+    merchant_apis = []
+    for merchant in merchants:
+        sellers_api = get_merchant_connection(merchant.seller_id, 'sellers')
+        if sellers_api is not None:
+            merchant_apis.append((merchant, sellers_api))
+    if not merchant_apis:
+        return {}
+
+    pool = ThreadPool(min(len(merchant_apis), MAX_CONCURRENT_REQUESTS))
+    try:
+        results = pool.map(fetch_marketplaces, merchant_apis)
+    finally:
+        pool.close()
+        pool.join()
+    results = [(m, data) for m, data in results if data is not None]
+
+    existing = dict(
+        (m.marketplace_id, m) for m in AmazonMarketplace.objects.filter(
+            marketplace_id__in=set(
+                d.MarketplaceId for __, data in results for d in data)))
+
+    new_marketplaces = []
+    changes = defaultdict(list)
+    marketplaces = {}
+    for merchant, data in results:
+        marketplaces[merchant.seller_id] = []
+        for marketplace_data in data:
+            values = get_marketplace_values(marketplace_data)
+            marketplace = existing.get(marketplace_data.MarketplaceId)
+            if marketplace is None:
+                marketplace = AmazonMarketplace(
+                    marketplace_id=marketplace_data.MarketplaceId,
+                    merchant=merchant, **values)
+                existing[marketplace.marketplace_id] = marketplace
+                new_marketplaces.append(marketplace)
+            elif marketplace.merchant_id != merchant.id:
+                logger.error(
+                    "marketplace {0} belongs to another merchant".format(
+                        marketplace.marketplace_id),
+                    extra={'seller_id': merchant.seller_id})
+                continue
+            else:
+                changed = dict(
+                    (field, value) for field, value in values.iteritems()
+                    if getattr(marketplace, field) != value)
+                if changed:
+                    changes[tuple(sorted(changed.items()))].append(
+                        marketplace.id)
+                    for field, value in changed.iteritems():
+                        setattr(marketplace, field, value)
+            marketplaces[merchant.seller_id].append(marketplace)
+
+    for changed, marketplace_ids in changes.iteritems():
+        AmazonMarketplace.objects.filter(id__in=marketplace_ids).update(
+            **dict(changed))
+    if new_marketplaces:
+        AmazonMarketplace.objects.bulk_create(new_marketplaces)
+        created_ids = dict(AmazonMarketplace.objects.filter(
+            marketplace_id__in=[m.marketplace_id for m in new_marketplaces],
+        ).values_list('marketplace_id', 'id'))
+        for marketplace in new_marketplaces:
+            marketplace.id = created_ids[marketplace.marketplace_id]
+
+    if changes or new_marketplaces:
+        # bulk updates don't send the signals that invalidate the merchant
+        # registry and the routing table sharing its version
+        invalidate_merchant_registry()
     return marketplaces
+
+
+def update_marketplaces(merchant):
+    """
+    Update the marketplaces of *merchant* from MWS.
+
+    :rtype list: the marketplaces returned by MWS or an empty list if the
+        request failed.
+    """
+    return update_all_marketplaces([merchant]).get(merchant.seller_id, [])
@@ -95,6 +95,15 @@ class FeedSubmissionFactory(factory.DjangoModelFactory):
     date_submitted = now()
 
 
+class ReportRequestFactory(factory.DjangoModelFactory):
+    FACTORY_FOR = get_model('oscar_mws', 'ReportRequest')
+
+    request_id = factory.Sequence(lambda n: '{}'.format(2291326430 + n))
+    report_type = '_GET_MERCHANT_LISTINGS_DATA_'
+    processing_status = '_SUBMITTED_'
+    merchant = factory.SubFactory(MerchantAccountFactory)
+
+
 class PartnerFactory(factory.DjangoModelFactory):
     FACTORY_FOR = get_model('partner', 'Partner')
 
@@ -152,3 +161,21 @@ class FulfillmentOrderFactory(factory.DjangoModelFactory):
     date_updated = now()
     order = factory.SubFactory(OrderFactory)
     shipping_address = factory.SubFactory(ShippingAddressFactory)
+
+
+class FulfillmentShipmentFactory(factory.DjangoModelFactory):
+    FACTORY_FOR = get_model('oscar_mws', 'FulfillmentShipment')
+
+    shipment_id = factory.Sequence(lambda n: 'D{0:06d}'.format(n))
+    fulfillment_center_id = 'RNO1'
+    order = factory.SubFactory(OrderFactory)
+    status = 'SHIPPED'
+
+
+class ShipmentPackageFactory(factory.DjangoModelFactory):
+    FACTORY_FOR = get_model('oscar_mws', 'ShipmentPackage')
+
+    package_number = factory.Sequence(lambda n: n)
+    tracking_number = factory.Sequence(lambda n: 'TRACK{0}'.format(n))
+    carrier_code = 'UPS'
+    fulfillment_shipment = factory.SubFactory(FulfillmentShipmentFactory)
@@ -1,4 +1,5 @@
 import re
+import time
 
 from django.core.exceptions import ImproperlyConfigured
 
@@ -25,3 +26,64 @@ def load_class(name, default=None):
 def convert_camel_case(name):
     s1 = FIRST_CAPITAL_PATTERN.sub(r'\1_\2', name)
     return UPPERCASE_PATTERN.sub(r'\1_\2', s1).lower()
+
+
+def chunks(iterable, size):
+    """
+    Split *iterable* into lists of at most *size* items. This is mainly used
+    to split up lists of IDs or SKUs into batches that don't exceed the
+    limits imposed by the MWS API or to keep memory usage bounded when
+    processing large querysets.
+    """
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class RequestThrottle(object):
+    """
+    Client-side throttle for an MWS operation. MWS allows a burst of up to
+    *max_quota* requests for an operation after which a new request becomes
+    available every *restore_rate* seconds. Calling :meth:`wait` before each
+    request blocks until a request is available which keeps long running
+    imports from being throttled by MWS.
+    """
+
+    def __init__(self, max_quota, restore_rate):
+        self.max_quota = max_quota
+        self.restore_rate = restore_rate
+        self.available = float(max_quota)
+        self.last_checked = time.time()
+
+    def wait(self):
+        now = time.time()
+        self.available = min(
+            self.max_quota,
+            self.available + (now - self.last_checked) / self.restore_rate)
+        self.last_checked = now
+        if self.available < 1:
+            time.sleep((1 - self.available) * self.restore_rate)
+            self.available = 1.0
+            self.last_checked = time.time()
+        self.available -= 1
+
+
+_throttles = {}
+
+
+def get_request_throttle(seller_id, operation, max_quota, restore_rate):
+    """
+    Get the :class:`RequestThrottle` for *operation* of the merchant account
+    with *seller_id*. MWS throttles requests per merchant account and
+    operation so the throttle is shared by everything running in the same
+    process.
+    """
+    key = (seller_id, operation)
+    if key not in _throttles:
+        _throttles[key] = RequestThrottle(max_quota, restore_rate)
+    return _throttles[key]
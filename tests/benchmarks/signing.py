@@ -0,0 +1,62 @@
+"""
+Microbenchmark for signing MWS requests. It measures the time required to
+build the query string and calculate the signature for a typical request
+and compares it to the previous implementation that quoted every value and
+created a new HMAC for each request. Run it from the project root with::
+
+    $ python -m tests.benchmarks.signing
+"""
+import hmac
+import timeit
+import base64
+import urllib
+import hashlib
+
+from django.conf import settings
+
+if not settings.configured:
+    settings.configure()
+
+from oscar_mws import api
+
+NUMBER = 20000
+
+mws = api.Feeds('FAKE_KEY', 'FAKE_SECRET', 'FAKE_SELLER')
+params = dict(mws._base_params, **{
+    'Action': 'GetFeedSubmissionList',
+    'Timestamp': mws.get_timestamp(),
+    'FeedProcessingStatusList.Status.1': '_SUBMITTED_',
+    'FeedProcessingStatusList.Status.2': '_IN_PROGRESS_',
+})
+params.update(mws.enumerate_param(
+    'FeedSubmissionIdList.Id', [str(i) for i in range(20)]))
+
+
+def sign_uncached():
+    quoted_params = []
+    for key in sorted(params):
+        value = urllib.quote(unicode(params[key]).encode('utf-8'),
+                             safe='-_.~')
+        quoted_params.append("{}={}".format(key, value))
+    description = '&'.join(quoted_params)
+    sig_data = "{}\n{}\n{}\n{}".format(
+        'POST', mws.domain.replace('https://', '').lower(), mws.uri,
+        description)
+    return base64.b64encode(
+        hmac.new(str(mws.secret_key), sig_data, hashlib.sha256).digest())
+
+
+def sign_cached():
+    return mws.calc_signature('POST', mws._get_quote_params(params))
+
+
+def main():
+    assert sign_cached() == sign_uncached()
+    for name, func in [('uncached', sign_uncached), ('cached', sign_cached)]:
+        duration = min(timeit.repeat(func, number=NUMBER, repeat=3))
+        print "{0:>10}: {1:.2f} us per request".format(
+            name, duration / NUMBER * 1e6)
+
+
+if __name__ == '__main__':
+    main()
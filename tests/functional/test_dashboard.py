@@ -1,11 +1,16 @@
+import mock
+
+from django.db import connection
 from django.db.models import get_model
 from django.core.urlresolvers import reverse
 
 from oscar.test.testcases import WebTestCase
 
 from oscar_mws.test import factories
+from oscar_mws.dashboard.views import ProductListView, SubmissionListView
 
 AmazonProfile = get_model('oscar_mws', 'AmazonProfile')
+MwsJob = get_model('oscar_mws', 'MwsJob')
 
 
 class TestAmazonProfileDashboard(WebTestCase):
@@ -39,3 +44,145 @@ class TestAmazonProfileDashboard(WebTestCase):
     def test_displays_message_for_unkown_product(self):
         page = self.get(reverse('mws-dashboard:profile-create', args=(22222,)))
         self.assertRedirects(page, reverse('mws-dashboard:profile-list'))
+
+
+class TestSubmissionListDashboard(WebTestCase):
+    is_staff = True
+
+    def setUp(self):
+        super(TestSubmissionListDashboard, self).setUp()
+        self.merchant = factories.MerchantAccountFactory()
+        self.submissions = [
+            factories.FeedSubmissionFactory(
+                submission_id=str(idx), merchant=self.merchant,
+                feed_type='_POST_PRODUCT_DATA_',
+                processing_status='_DONE_')
+            for idx in range(5)]
+        # the newest submission is listed first
+        self.submissions.reverse()
+
+    def get_submission_ids(self, page):
+        return [s.submission_id for s in page.context['submission_list']]
+
+    def test_seeks_to_the_next_and_previous_page(self):
+        url = reverse('mws-dashboard:submission-list')
+        with mock.patch.object(SubmissionListView, 'paginate_by', 2):
+            page = self.get(url)
+            self.assertEquals(self.get_submission_ids(page), ['4', '3'])
+            self.assertEquals(
+                page.context['object_list'], page.context['submission_list'])
+            self.assertNotIn('previous_page_url', page.context)
+
+            page = self.get(url + page.context['next_page_url'])
+            self.assertEquals(self.get_submission_ids(page), ['2', '1'])
+
+            page = self.get(url + page.context['next_page_url'])
+            self.assertEquals(self.get_submission_ids(page), ['0'])
+            self.assertNotIn('next_page_url', page.context)
+
+            page = self.get(url + page.context['previous_page_url'])
+            self.assertEquals(self.get_submission_ids(page), ['2', '1'])
+
+    def test_filters_submissions_by_status(self):
+        self.submissions[0].processing_status = '_IN_PROGRESS_'
+        self.submissions[0].save()
+
+        page = self.get(reverse('mws-dashboard:submission-list'),
+                        params={'processing_status': '_IN_PROGRESS_'})
+        self.assertEquals(self.get_submission_ids(page), ['4'])
+
+
+class TestProductListDashboardActions(WebTestCase):
+    is_staff = True
+
+    def setUp(self):
+        super(TestProductListDashboardActions, self).setUp()
+        self.product = factories.ProductFactory()
+        self.marketplace = factories.AmazonMarketplaceFactory()
+
+    def test_creates_job_for_selected_action(self):
+        page = self.get(reverse('mws-dashboard:profile-list'))
+        form = page.forms['mws-product-update-form']
+        form['submission_selection'] = 'update_stock'
+        form['marketplace'] = self.marketplace.id
+        page = form.submit()
+
+        job = MwsJob.objects.get()
+        self.assertRedirects(
+            page, reverse('mws-dashboard:job-detail', args=(job.id,)))
+        self.assertEquals(job.action, MwsJob.ACTION_UPDATE_STOCK)
+        self.assertEquals(job.status, MwsJob.PENDING)
+        self.assertContains(page.follow(), 'Update product stock')
+
+        page = self.get(reverse('mws-dashboard:job-status', args=(job.id,)))
+        self.assertEquals(page.json['status'], MwsJob.PENDING)
+        self.assertEquals(page.json['num_processed'], 0)
+
+
+class TestProductListDashboard(WebTestCase):
+    is_staff = True
+
+    def setUp(self):
+        super(TestProductListDashboard, self).setUp()
+        self.marketplace = factories.AmazonMarketplaceFactory()
+        self.num_products = 0
+
+    def create_products(self, num_products):
+        submission = factories.FeedSubmissionFactory(
+            submission_id='SUB{0}'.format(self.num_products),
+            merchant=self.marketplace.merchant)
+        for __ in range(num_products):
+            product = factories.ProductFactory(
+                amazon_profile__sku='SKU{0}'.format(self.num_products))
+            product.amazon_profile.marketplaces.add(self.marketplace)
+            submission.submitted_products.add(product)
+            self.num_products += 1
+        return submission
+
+    def count_queries(self, url):
+        # the queries are reset at the start of each request
+        connection.use_debug_cursor = True
+        try:
+            self.get(url)
+            return len(connection.queries)
+        finally:
+            connection.use_debug_cursor = False
+
+    def test_number_of_queries_does_not_depend_on_products(self):
+        url = reverse('mws-dashboard:profile-list')
+        self.create_products(2)
+        # the first request also logs in the user
+        self.get(url)
+        num_queries = self.count_queries(url)
+
+        self.create_products(5)
+        self.assertEquals(self.count_queries(url), num_queries)
+
+    def test_shows_last_submission_and_marketplaces(self):
+        submission = self.create_products(1)
+        page = self.get(reverse('mws-dashboard:profile-list'))
+
+        product = page.context['product_list'][0]
+        self.assertEquals(product.date_last_submitted,
+                          submission.date_updated)
+        self.assertEquals(product.mws_marketplaces, [self.marketplace])
+
+    def test_filters_products_by_last_feed_result(self):
+        self.create_products(3)
+        AmazonProfile.objects.filter(sku='SKU1').update(
+            last_feed_result=AmazonProfile.FEED_RESULT_ERROR)
+
+        page = self.get(reverse('mws-dashboard:profile-list'),
+                        params={'last_feed_result': 'Error'})
+        self.assertEquals(
+            [p.amazon_profile.sku for p in page.context['product_list']],
+            ['SKU1'])
+
+    def test_paginates_products(self):
+        self.create_products(3)
+        with mock.patch.object(ProductListView, 'paginate_by', 2):
+            page = self.get(reverse('mws-dashboard:profile-list'))
+            self.assertEquals(len(page.context['product_list']), 2)
+            page = self.get(reverse('mws-dashboard:profile-list'),
+                            params={'page': 2})
+            self.assertEquals(len(page.context['product_list']), 1)
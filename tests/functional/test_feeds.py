@@ -11,6 +11,7 @@ from oscar_mws import abstract_models as am
 from oscar_mws.test import mixins
 from oscar_mws.test import factories
 
+AmazonProfile = get_model('oscar_mws', 'AmazonProfile')
 FeedSubmission = get_model('oscar_mws', 'FeedSubmission')
 
 
@@ -95,3 +96,30 @@ class TestProcessingSubmissionFeedResults(mixins.DataLoaderMixin, TestCase):
         self.assertEquals(report.errors, 0)
         self.assertEquals(report.warnings, 1)
         self.assertEquals(report.results.count(), 3)
+
+    @httpretty.activate
+    def test_stores_last_feed_result_on_submitted_profiles(self):
+        xml_data = self.load_data('get_feed_submission_results_response.xml')
+        httpretty.register_uri(
+            httpretty.GET,
+            'https://mws.amazonservices.com/',
+            responses=[httpretty.Response(
+                xml_data,
+                content_md5=self.get_md5(xml_data),
+            )],
+        )
+        with_warning = factories.ProductFactory(
+            amazon_profile__sku='sku_1_2181')
+        successful = factories.ProductFactory(amazon_profile__sku='sku_2')
+        not_submitted = factories.ProductFactory(amazon_profile__sku='sku_3')
+
+        submission = factories.FeedSubmissionFactory(submission_id=7867070986)
+        submission.submitted_products.add(with_warning, successful)
+        gateway.process_submission_results(submission)
+
+        results = dict(AmazonProfile.objects.values_list(
+            'product', 'last_feed_result'))
+        self.assertEquals(results, {
+            with_warning.id: AmazonProfile.FEED_RESULT_WARNING,
+            successful.id: AmazonProfile.FEED_RESULT_SUCCESS,
+            not_submitted.id: ''})
@@ -10,11 +10,16 @@ class TestMarketplaces(mixins.DataLoaderMixin, TestCase):
 
     @httpretty.activate
     def test_can_be_updated_from_mws(self):
-        xml = self.load_data('list_marketplace_participations_response.xml')
         httpretty.register_uri(
             httpretty.GET,
             'https://mws.amazonservices.com/Sellers/2011-07-01',
-            body=xml,
+            responses=[
+                httpretty.Response(body=self.load_data(
+                    'list_marketplace_participations_response.xml')),
+                httpretty.Response(body=self.load_data(
+                    'list_marketplace_participations_by_next_token_'
+                    'response.xml')),
+            ],
         )
 
         self.merchant = factories.MerchantAccountFactory(
@@ -25,11 +30,19 @@ class TestMarketplaces(mixins.DataLoaderMixin, TestCase):
 
         gateway.update_marketplaces(self.merchant)
 
-        self.assertEquals(self.merchant.marketplaces.count(), 1)
+        self.assertEquals(self.merchant.marketplaces.count(), 2)
+        self.assertEquals(
+            httpretty.last_request().querystring['Action'],
+            ['ListMarketplaceParticipationsByNextToken'])
 
-        marketplace = self.merchant.marketplaces.all()[0]
-        self.assertEquals(marketplace.marketplace_id, 'ATVPDKIKX0DER')
+        marketplace = self.merchant.marketplaces.get(
+            marketplace_id='ATVPDKIKX0DER')
         self.assertEquals(marketplace.domain, 'www.amazon.com')
         self.assertEquals(marketplace.name, 'Amazon.com')
         self.assertEquals(marketplace.currency_code, 'USD')
         self.assertEquals(marketplace.region, 'US')
+
+        marketplace = self.merchant.marketplaces.get(
+            marketplace_id='A2EUQ1WTGCTBG2')
+        self.assertEquals(marketplace.name, 'Amazon.ca')
+        self.assertEquals(marketplace.currency_code, 'CAD')
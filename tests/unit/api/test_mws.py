@@ -1,4 +1,13 @@
 # -*- encoding: utf-8 -*-
+import hmac
+import mock
+import base64
+import hashlib
+import urlparse
+import httpretty
+
+from StringIO import StringIO
+
 from django.utils.unittest import TestCase
 
 from oscar_mws import api
@@ -67,3 +76,157 @@ class TestRemoveEmptyhelper(TestCase):
         }
         self.assertItemsEqual(api.remove_empty(test_dct),
                               {'key1': 'has a value', 'key4': 23112})
+
+
+class TestCalculatingSignature(TestCase):
+
+    def setUp(self):
+        self.mws = api.MWS('FAKE_KEY', 'FAKE_SECRET', 'FAKE_SELLER',
+                           domain='https://MWS.amazonservices.com')
+
+    def test_matches_signature_from_fresh_hmac(self):
+        description = 'Action=GetServiceStatus&SellerId=FAKE_SELLER'
+        expected = base64.b64encode(hmac.new(
+            'FAKE_SECRET',
+            'GET\nmws.amazonservices.com\n/\n' + description,
+            hashlib.sha256).digest())
+        self.assertEquals(
+            self.mws.calc_signature('GET', description), expected)
+
+    def test_signatures_are_independent_of_previous_requests(self):
+        first = self.mws.calc_signature('POST', 'Action=First')
+        self.mws.calc_signature('POST', 'Action=Second')
+        self.assertEquals(
+            self.mws.calc_signature('POST', 'Action=First'), first)
+
+
+class TestQuotingParams(TestCase):
+
+    def test_quotes_non_string_values(self):
+        self.assertEquals(api.quote_param(12), '12')
+
+    def test_returns_cached_value_for_repeated_strings(self):
+        api.quote_param(u'Düsseldorf')
+        self.assertEquals(
+            api._quote_cache[u'Düsseldorf'], 'D%C3%BCsseldorf')
+        self.assertEquals(api.quote_param(u'Düsseldorf'), 'D%C3%BCsseldorf')
+
+    def test_does_not_cache_long_values(self):
+        value = 'x' * (api.QUOTE_CACHE_MAX_LENGTH + 1)
+        self.assertEquals(api.quote_param(value), value)
+        self.assertFalse(value in api._quote_cache)
+
+
+class TestEncodingRequestParams(TestCase):
+    url = 'https://mws.amazonservices.com/'
+    response = '<GetServiceStatusResponse />'
+
+    def setUp(self):
+        self.mws = api.MWS('FAKE_KEY', 'FAKE_SECRET', 'FAKE_SELLER')
+
+    @httpretty.activate
+    def test_sends_params_in_query_string_for_get_requests(self):
+        httpretty.register_uri(httpretty.GET, self.url, body=self.response)
+        self.mws.make_request({'Action': 'GetServiceStatus'})
+
+        request = httpretty.last_request()
+        self.assertEquals(request.querystring['Action'], ['GetServiceStatus'])
+        self.assertTrue('Signature' in request.querystring)
+        self.assertEquals(request.body, '')
+
+    @httpretty.activate
+    def test_sends_params_as_form_encoded_body_for_post_requests(self):
+        httpretty.register_uri(httpretty.POST, self.url, body=self.response)
+        self.mws.make_request({'Action': 'GetServiceStatus'}, 'POST')
+
+        request = httpretty.last_request()
+        self.assertEquals(request.querystring, {})
+        self.assertEquals(
+            request.headers['Content-Type'], api.FORM_CONTENT_TYPE)
+        body = urlparse.parse_qs(request.body)
+        self.assertEquals(body['Action'], ['GetServiceStatus'])
+        self.assertTrue('Signature' in body)
+
+    @httpretty.activate
+    def test_keeps_params_in_query_string_for_requests_with_body(self):
+        httpretty.register_uri(httpretty.POST, self.url, body=self.response)
+        self.mws.make_request(
+            {'Action': 'GetServiceStatus'}, 'POST', body='<feed />',
+            extra_headers={'Content-Type': 'text/xml'})
+
+        request = httpretty.last_request()
+        self.assertEquals(request.querystring['Action'], ['GetServiceStatus'])
+        self.assertEquals(request.headers['Content-Type'], 'text/xml')
+        self.assertEquals(request.body, '<feed />')
+
+
+class TestCalculatingMD5(TestCase):
+    data = 'x' * (api.CHUNK_SIZE * 2 + 10)
+
+    def setUp(self):
+        self.expected = base64.encodestring(
+            hashlib.md5(self.data).digest()).strip('\n')
+
+    def test_calculates_md5_for_strings(self):
+        self.assertEquals(api.calc_md5(self.data), self.expected)
+
+    def test_calculates_md5_for_files_and_restores_position(self):
+        fileobj = StringIO(self.data)
+        self.assertEquals(api.calc_md5(fileobj), self.expected)
+        self.assertEquals(fileobj.tell(), 0)
+
+    def test_calculates_md5_for_iterables(self):
+        chunks = iter([self.data[:100], self.data[100:]])
+        self.assertEquals(api.calc_md5(chunks), self.expected)
+
+
+class TestStreamingFeedsAndReports(TestCase):
+    data = 'sku\tquantity\nSKU1\t2\n'
+
+    @httpretty.activate
+    def test_submits_feed_from_iterable_as_file(self):
+        httpretty.register_uri(
+            httpretty.POST, 'https://mws.amazonservices.com/',
+            body='<SubmitFeedResponse />')
+        feeds = api.Feeds('FAKE_KEY', 'FAKE_SECRET', 'FAKE_SELLER')
+        feeds.submit_feed(iter(self.data.splitlines(True)), '_FEED_TYPE_')
+
+        request = httpretty.last_request()
+        self.assertEquals(request.body, self.data)
+        self.assertEquals(
+            request.headers['Content-MD5'], api.calc_md5(self.data))
+
+    def test_closes_temporary_feed_file_when_request_fails(self):
+        feed_file = mock.Mock()
+        feeds = api.Feeds('FAKE_KEY', 'FAKE_SECRET', 'FAKE_SELLER')
+        with mock.patch('oscar_mws.api.tempfile.TemporaryFile',
+                        return_value=feed_file), \
+                mock.patch.object(feeds, 'make_request',
+                                  side_effect=api.MWSError()):
+            self.assertRaises(
+                api.MWSError, feeds.submit_feed,
+                iter(self.data.splitlines(True)), '_FEED_TYPE_')
+        self.assertTrue(feed_file.close.called)
+
+    @httpretty.activate
+    def test_streams_report_into_file(self):
+        httpretty.register_uri(
+            httpretty.GET, 'https://mws.amazonservices.com/',
+            body=self.data, content_md5=api.calc_md5(self.data))
+        reports = api.Reports('FAKE_KEY', 'FAKE_SECRET', 'FAKE_SELLER')
+        report_file = StringIO()
+
+        response = reports.get_report('1234', response_file=report_file)
+
+        self.assertTrue(response.parsed is report_file)
+        self.assertEquals(report_file.read(), self.data)
+
+    @httpretty.activate
+    def test_raises_error_for_streamed_report_with_invalid_md5(self):
+        httpretty.register_uri(
+            httpretty.GET, 'https://mws.amazonservices.com/',
+            body=self.data, content_md5=api.calc_md5('invalid'))
+        reports = api.Reports('FAKE_KEY', 'FAKE_SECRET', 'FAKE_SELLER')
+        self.assertRaises(
+            api.MWSError, reports.get_report, '1234',
+            response_file=StringIO())
@@ -6,11 +6,14 @@ from django.db.models import get_model
 from oscar.test.factories import create_order
 
 from oscar_mws.test import factories
+from oscar_mws.fulfillment import finders
 from oscar_mws.fulfillment.creator import FulfillmentOrderCreator
 
+Order = get_model('order', 'Order')
 Country = get_model('address', 'Country')
 ShippingAddress = get_model('order', 'ShippingAddress')
 FulfillmentOrder = get_model('oscar_mws', 'FulfillmentOrder')
+FulfillmentOrderLine = get_model('oscar_mws', 'FulfillmentOrderLine')
 
 
 class TestFulfillmentShipmentCreator(TestCase):
@@ -69,3 +72,64 @@ class TestFulfillmentShipmentCreator(TestCase):
         for mws_order, address in zip(mws_orders, addresses):
             self.assertEquals(mws_order.status, mws_order.UNSUBMITTED)
             self.assertEquals(mws_order.shipping_address.id, address.id)
+
+
+class TestBulkFulfillmentOrderCreator(TestCase):
+
+    def setUp(self):
+        super(TestBulkFulfillmentOrderCreator, self).setUp()
+        self.merchant = factories.MerchantAccountFactory()
+        self.orders = []
+        for __ in range(3):
+            order = factories.OrderFactory()
+            factories.OrderLineFactory(order=order)
+            factories.OrderLineFactory(order=order)
+            self.orders.append(order)
+        self.creator = FulfillmentOrderCreator()
+
+    def get_orders(self):
+        return Order.objects.filter(id__in=[o.id for o in self.orders])
+
+    def test_creates_fulfillment_orders_and_lines(self):
+        mws_orders = self.creator.create_fulfillment_orders(
+            self.get_orders(), batch_size=2)
+
+        self.assertEquals(len(mws_orders), 3)
+        self.assertEquals(FulfillmentOrder.objects.count(), 3)
+        self.assertEquals(FulfillmentOrderLine.objects.count(), 6)
+        for mws_order in FulfillmentOrder.objects.all():
+            self.assertEquals(mws_order.status, mws_order.UNSUBMITTED)
+            self.assertEquals(mws_order.merchant, self.merchant)
+            self.assertEquals(mws_order.fulfillment_lines.count(), 2)
+            self.assertEquals(
+                mws_order.shipping_address, mws_order.order.shipping_address)
+
+    def test_calls_merchant_finder_once_per_key_of_the_finder(self):
+        finder = mock.Mock(return_value=self.merchant)
+        finder.get_merchant_key = finders.get_country_key
+        self.creator.find_fulfillment_merchant = finder
+
+        self.creator.create_fulfillment_orders(self.get_orders())
+
+        countries = set(
+            o.shipping_address.country_id for o in self.orders)
+        self.assertEquals(finder.call_count, len(countries))
+
+    def test_calls_merchant_finder_without_key_for_every_address(self):
+        finder = mock.Mock(spec=lambda order, address: None,
+                           return_value=self.merchant)
+        self.creator.find_fulfillment_merchant = finder
+
+        self.creator.create_fulfillment_orders(self.get_orders())
+
+        self.assertEquals(finder.call_count, len(self.orders))
+
+    def test_skips_existing_fulfillment_orders(self):
+        FulfillmentOrderCreator().create_fulfillment_order(self.orders[0])
+
+        mws_orders = self.creator.create_fulfillment_orders(self.get_orders())
+
+        self.assertEquals(len(mws_orders), 2)
+        self.assertEquals(FulfillmentOrder.objects.count(), 3)
+        self.assertEquals(FulfillmentOrderLine.objects.count(), 6)
+        self.assertIn(self.orders[0].number, self.creator.errors)
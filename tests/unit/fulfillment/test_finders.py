@@ -0,0 +1,81 @@
+import mock
+
+from django.test import TestCase
+from django.core.cache import cache
+from django.db.models import get_model
+
+from oscar_mws.test import factories
+from oscar_mws.fulfillment import finders
+from oscar_mws.registry import VERSION_KEY
+
+AmazonMarketplace = get_model('oscar_mws', 'AmazonMarketplace')
+
+
+class TestRoutingMerchantFinder(TestCase):
+
+    def setUp(self):
+        super(TestRoutingMerchantFinder, self).setUp()
+        self.us_merchant = factories.MerchantAccountFactory(
+            name='US', seller_id='US_SELLER', region='US')
+        self.eu_merchant = factories.MerchantAccountFactory(
+            name='EU', seller_id='EU_SELLER', region='EU')
+        factories.AmazonMarketplaceFactory(
+            merchant=self.us_merchant, region='US')
+        factories.AmazonMarketplaceFactory(
+            merchant=self.eu_merchant, region='DE')
+        finders.reset_routing_table()
+
+    def get_address(self, country_code):
+        return mock.Mock(country_id=country_code)
+
+    def test_routes_country_to_merchant_with_marketplace(self):
+        merchant = finders.routing_merchant_finder(
+            None, self.get_address('DE'))
+        self.assertEquals(merchant, self.eu_merchant)
+
+    def test_routes_country_to_merchant_of_same_fulfillment_center(self):
+        merchant = finders.routing_merchant_finder(
+            None, self.get_address('FR'))
+        self.assertEquals(merchant, self.eu_merchant)
+
+        merchant = finders.routing_merchant_finder(
+            None, self.get_address('CA'))
+        self.assertEquals(merchant, self.us_merchant)
+
+    @mock.patch('oscar_mws.fulfillment.finders.logger')
+    def test_falls_back_to_first_merchant_for_unknown_country(self, logger):
+        merchant = finders.routing_merchant_finder(
+            None, self.get_address('AU'))
+        self.assertEquals(merchant, self.us_merchant)
+        self.assertTrue(logger.warning.called)
+
+    def test_does_not_query_the_database_once_loaded(self):
+        finders.routing_merchant_finder(None, self.get_address('US'))
+        with self.assertNumQueries(0):
+            merchant = finders.routing_merchant_finder(
+                None, self.get_address('US'))
+        self.assertEquals(merchant, self.us_merchant)
+
+    def test_is_reset_when_marketplace_is_saved(self):
+        finders.routing_merchant_finder(None, self.get_address('JP'))
+        jp_merchant = factories.MerchantAccountFactory(
+            name='JP', seller_id='JP_SELLER', region='JP')
+        factories.AmazonMarketplaceFactory(merchant=jp_merchant, region='JP')
+
+        merchant = finders.routing_merchant_finder(
+            None, self.get_address('JP'))
+        self.assertEquals(merchant, jp_merchant)
+
+    def test_is_rebuilt_when_version_changed_in_another_process(self):
+        finders.routing_merchant_finder(None, self.get_address('DE'))
+        # bulk updates don't send signals, like changes in another process
+        AmazonMarketplace.objects.filter(region='DE').update(
+            merchant=self.us_merchant)
+        self.assertEquals(
+            finders.routing_merchant_finder(None, self.get_address('DE')),
+            self.eu_merchant)
+
+        cache.incr(VERSION_KEY)
+        self.assertEquals(
+            finders.routing_merchant_finder(None, self.get_address('DE')),
+            self.us_merchant)
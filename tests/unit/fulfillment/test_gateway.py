@@ -1,11 +1,19 @@
 import mock
 
+from datetime import timedelta
+
 from django.test import TestCase
+from django.db.models import get_model
+from django.utils.timezone import now as tz_now
 
-from oscar_mws.api import MWSError
+from oscar_mws.api import MWSError, MWSObject
 from oscar_mws.test import factories
 from oscar_mws.fulfillment import gateway
 
+StockAlert = get_model('partner', 'StockAlert')
+StockRecord = get_model('partner', 'StockRecord')
+MerchantAccount = get_model('oscar_mws', 'MerchantAccount')
+
 
 class TestSubmittingFulfillmentOrder(TestCase):
 
@@ -30,3 +38,140 @@ class TestSubmittingFulfillmentOrder(TestCase):
             gateway.submit_fulfillment_orders([self.fulfillment_order])
             self.assertEquals(self.fulfillment_order.status,
                                 self.fulfillment_order.SUBMITTED)
+
+
+class TestIteratingInventorySupply(TestCase):
+
+    def get_response(self, skus, next_token=None):
+        response = MWSObject(InventorySupplyList=MWSObject(
+            member=[MWSObject(SellerSKU=sku, InStockSupplyQuantity='1')
+                    for sku in skus]))
+        if next_token:
+            response['NextToken'] = next_token
+        return mock.Mock(parsed=response)
+
+    def test_requests_skus_in_batches(self):
+        skus = ['SKU{}'.format(i) for i in range(120)]
+        inventory_api = mock.Mock()
+        inventory_api.list_inventory_supply.side_effect = (
+            lambda skus: self.get_response(skus))
+
+        supply = list(gateway.iter_inventory_supply(inventory_api, skus=skus))
+
+        self.assertEquals(len(supply), 120)
+        self.assertEquals(inventory_api.list_inventory_supply.call_count, 3)
+        for call in inventory_api.list_inventory_supply.call_args_list:
+            self.assertTrue(len(call[1]['skus']) <= gateway.MAX_INVENTORY_SKUS)
+
+    def test_follows_next_token(self):
+        inventory_api = mock.Mock()
+        inventory_api.list_inventory_supply.return_value = self.get_response(
+            ['SKU1'], next_token='TOKEN')
+        inventory_api.list_inventory_supply_by_next_token.return_value = \
+            self.get_response(['SKU2'])
+
+        supply = list(gateway.iter_inventory_supply(inventory_api, ['SKU1']))
+
+        self.assertEquals([s.SellerSKU for s in supply], ['SKU1', 'SKU2'])
+        inventory_api.list_inventory_supply_by_next_token.assert_called_with(
+            token='TOKEN')
+
+
+class TestUpdatingStockRecords(TestCase):
+
+    def setUp(self):
+        super(TestUpdatingStockRecords, self).setUp()
+        self.merchant = factories.MerchantAccountFactory()
+        self.product = factories.ProductFactory(
+            stockrecord__partner=self.merchant.partner,
+            amazon_profile__sku='SKU_1')
+        self.stockrecord = self.product.stockrecords.all()[0]
+
+    def test_updates_changed_stock_records(self):
+        updated = gateway.update_stockrecords(
+            self.merchant.seller_id, {'SKU_1': 7})
+        self.assertEquals(updated, 1)
+
+        stockrecord = StockRecord.objects.get(id=self.stockrecord.id)
+        self.assertEquals(stockrecord.num_in_stock, 7)
+        self.assertEquals(stockrecord.num_allocated, 0)
+
+    def test_updates_date_and_stock_alerts(self):
+        StockRecord.objects.filter(id=self.stockrecord.id).update(
+            low_stock_threshold=5)
+        gateway.update_stockrecords(self.merchant.seller_id, {'SKU_1': 3})
+
+        stockrecord = StockRecord.objects.get(id=self.stockrecord.id)
+        self.assertTrue(stockrecord.date_updated > self.stockrecord.date_updated)
+        alert = StockAlert.objects.get(stockrecord=stockrecord)
+        self.assertEquals(alert.status, StockAlert.OPEN)
+        self.assertEquals(alert.threshold, 5)
+
+        gateway.update_stockrecords(self.merchant.seller_id, {'SKU_1': 8})
+        self.assertEquals(
+            StockAlert.objects.get(stockrecord=stockrecord).status,
+            StockAlert.CLOSED)
+
+    def test_skips_unchanged_stock_records(self):
+        StockRecord.objects.filter(id=self.stockrecord.id).update(
+            num_in_stock=7, num_allocated=0)
+        updated = gateway.update_stockrecords(
+            self.merchant.seller_id, {'SKU_1': 7})
+        self.assertEquals(updated, 0)
+
+    def test_creates_missing_stock_records(self):
+        product = factories.ProductFactory(amazon_profile__sku='SKU_2')
+        updated = gateway.update_stockrecords(
+            self.merchant.seller_id, {'SKU_2': 4, 'UNKNOWN': 2})
+        self.assertEquals(updated, 1)
+
+        stockrecord = StockRecord.objects.get(
+            product=product, partner=self.merchant.partner)
+        self.assertEquals(stockrecord.num_in_stock, 4)
+        self.assertEquals(stockrecord.partner_sku, 'SKU_2')
+
+
+class TestUpdatingInventoryChanges(TestCase):
+
+    def setUp(self):
+        super(TestUpdatingInventoryChanges, self).setUp()
+        self.merchant = factories.MerchantAccountFactory()
+        self.product = factories.ProductFactory(
+            stockrecord__partner=self.merchant.partner,
+            amazon_profile__sku='SKU_1')
+        self.inventory_api = mock.Mock()
+        self.inventory_api.list_inventory_supply.return_value = mock.Mock(
+            parsed=MWSObject(InventorySupplyList=MWSObject(member=[
+                MWSObject(SellerSKU='SKU_1', InStockSupplyQuantity='3')])))
+
+    def update_inventory_changes(self):
+        with mock.patch(
+                'oscar_mws.fulfillment.gateway.get_merchant_connection') \
+                as gmc_mock:
+            gmc_mock.return_value = self.inventory_api
+            return gateway.update_inventory_changes(self.merchant)
+
+    def test_requests_all_supply_for_first_sync(self):
+        self.assertEquals(self.update_inventory_changes(), 1)
+        self.inventory_api.list_inventory_supply.assert_called_with(
+            datetime=gateway.INVENTORY_SYNC_START.isoformat())
+
+        stockrecord = self.product.stockrecords.all()[0]
+        self.assertEquals(stockrecord.num_in_stock, 3)
+
+        merchant = MerchantAccount.objects.get(pk=self.merchant.pk)
+        self.assertNotEquals(merchant.date_inventory_synced, None)
+
+    def test_requests_supply_changed_since_last_sync(self):
+        synced = tz_now() - timedelta(minutes=5)
+        self.merchant.date_inventory_synced = synced
+        self.update_inventory_changes()
+        self.inventory_api.list_inventory_supply.assert_called_with(
+            datetime=synced.isoformat())
+        self.assertTrue(self.merchant.date_inventory_synced > synced)
+
+    def test_keeps_sync_date_when_request_fails(self):
+        self.inventory_api.list_inventory_supply.side_effect = MWSError()
+        self.assertRaises(MWSError, self.update_inventory_changes)
+        merchant = MerchantAccount.objects.get(pk=self.merchant.pk)
+        self.assertEquals(merchant.date_inventory_synced, None)
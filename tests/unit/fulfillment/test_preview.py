@@ -0,0 +1,123 @@
+import mock
+
+from decimal import Decimal as D
+from requests import Timeout
+
+from django.test import TestCase
+
+from oscar_mws.api import MWSError, DictWrapper
+from oscar_mws.test import factories, mixins
+from oscar_mws.fulfillment import preview
+
+
+class TestFulfillmentPreviewCache(TestCase):
+
+    def test_evicts_least_recently_used_entries(self):
+        cache = preview.FulfillmentPreviewCache(max_size=2)
+        cache.set('first', [1])
+        cache.set('second', [2])
+        cache.get('first')
+        cache.set('third', [3])
+
+        self.assertEquals(len(cache), 2)
+        self.assertEquals(cache.get('first'), [1])
+        self.assertEquals(cache.get('second'), None)
+
+    def test_returns_expired_entries_only_when_stale_allowed(self):
+        cache = preview.FulfillmentPreviewCache(timeout=-1)
+        cache.set('key', [1])
+        self.assertEquals(cache.get('key'), None)
+        self.assertEquals(cache.get('key', allow_stale=True), [1])
+
+    def test_only_first_caller_is_owner_of_pending_request(self):
+        cache = preview.FulfillmentPreviewCache()
+        event, is_owner = cache.acquire('key')
+        self.assertTrue(is_owner)
+        self.assertEquals(cache.acquire('key'), (event, False))
+
+        cache.release('key')
+        self.assertTrue(event.is_set())
+        self.assertTrue(cache.acquire('key')[1])
+
+
+class TestGettingFulfillmentPreview(mixins.DataLoaderMixin, TestCase):
+
+    def setUp(self):
+        super(TestGettingFulfillmentPreview, self).setUp()
+        self.merchant = factories.MerchantAccountFactory()
+        self.address = {'CountryCode': 'US', 'PostalCode': '98104'}
+        self.items = [('SampleSKU1', 1)]
+        preview.get_preview_cache().clear()
+
+        response = DictWrapper(
+            self.load_data('get_fulfillment_preview_response.xml'),
+            'GetFulfillmentPreviewResult')
+        self.outbound = mock.Mock()
+        self.outbound.get_fulfillment_preview.return_value = response
+
+        patcher = mock.patch(
+            'oscar_mws.fulfillment.preview.get_merchant_connection')
+        self.addCleanup(patcher.stop)
+        patcher.start().return_value = self.outbound
+
+    def test_parses_previews_from_response(self):
+        previews = preview.get_fulfillment_preview(
+            self.merchant, self.address, self.items)
+
+        self.assertEquals(len(previews), 2)
+        expedited = previews[0]
+        self.assertEquals(expedited['shipping_speed'], 'Expedited')
+        self.assertTrue(expedited['is_fulfillable'])
+        self.assertEquals(expedited['total_fees'], D('12.25'))
+        self.assertEquals(expedited['currency'], 'USD')
+        self.assertEquals(expedited['earliest_arrival'].day, 13)
+        self.assertEquals(expedited['latest_arrival'].day, 14)
+
+    def test_requests_identical_preview_only_once(self):
+        preview.get_fulfillment_preview(
+            self.merchant, self.address, self.items)
+        preview.get_fulfillment_preview(
+            self.merchant, {'CountryCode': 'US', 'PostalCode': '98 104'},
+            list(self.items))
+        self.assertEquals(
+            self.outbound.get_fulfillment_preview.call_count, 1)
+
+    def test_returns_stale_preview_when_mws_fails(self):
+        previews = preview.get_fulfillment_preview(
+            self.merchant, self.address, self.items)
+        self.outbound.get_fulfillment_preview.side_effect = MWSError()
+
+        self.assertEquals(
+            preview.get_fulfillment_preview(
+                self.merchant, self.address, self.items, refresh=True),
+            previews)
+
+    def test_returns_stale_preview_when_mws_times_out(self):
+        previews = preview.get_fulfillment_preview(
+            self.merchant, self.address, self.items)
+        self.assertEquals(
+            self.outbound.get_fulfillment_preview.call_args[1]['timeout'], 3)
+        self.outbound.get_fulfillment_preview.side_effect = Timeout()
+
+        self.assertEquals(
+            preview.get_fulfillment_preview(
+                self.merchant, self.address, self.items, refresh=True),
+            previews)
+
+    def test_warming_refreshes_cached_previews(self):
+        addresses = [self.address, {'CountryCode': 'US', 'PostalCode': '1'}]
+        self.assertEquals(
+            preview.warm_fulfillment_previews(
+                self.merchant, addresses, self.items), 2)
+        self.assertEquals(len(preview.get_preview_cache()), 2)
+
+    def test_key_contains_every_address_field_sent_to_mws(self):
+        key = preview.get_preview_key(self.merchant, {
+            'CountryCode': 'US', 'PostalCode': '98104', 'Line1': '1 Road'},
+            self.items)
+        self.assertEquals(key, preview.get_preview_key(self.merchant, {
+            'CountryCode': 'US', 'PostalCode': '98 104', 'Line1': '1 Road'},
+            self.items))
+        self.assertNotEquals(key, preview.get_preview_key(self.merchant, {
+            'CountryCode': 'US', 'PostalCode': '98104', 'Line1': '2 Road'},
+            self.items))
@@ -0,0 +1,67 @@
+from django.test import TestCase
+from django.core.cache import cache
+from django.db.models import get_model
+
+from oscar_mws.test import factories
+from oscar_mws.fulfillment import timeline
+
+ShippingEvent = get_model('order', 'ShippingEvent')
+ShippingEventType = get_model('order', 'ShippingEventType')
+FulfillmentOrder = get_model('oscar_mws', 'FulfillmentOrder')
+FulfillmentOrderLine = get_model('oscar_mws', 'FulfillmentOrderLine')
+
+
+class TestFulfillmentTimeline(TestCase):
+
+    def setUp(self):
+        super(TestFulfillmentTimeline, self).setUp()
+        cache.clear()
+        self.order = factories.OrderFactory()
+        self.fulfillment_order = factories.FulfillmentOrderFactory(
+            order=self.order)
+        event_type = ShippingEventType.objects.create(name='Shipped')
+        self.lines = []
+        for idx in range(3):
+            line = factories.OrderLineFactory(
+                order=self.order, partner_sku='SKU{0}'.format(idx),
+                product__amazon_profile__sku='SKU{0}'.format(idx))
+            self.lines.append(FulfillmentOrderLine.objects.create(
+                line=line, fulfillment_order=self.fulfillment_order,
+                order_item_id='item-{0}'.format(idx), quantity=1))
+
+        for fline in self.lines[:2]:
+            shipment = factories.FulfillmentShipmentFactory(order=self.order)
+            package = factories.ShipmentPackageFactory(
+                fulfillment_shipment=shipment)
+            shipment.shipment_events.add(ShippingEvent.objects.create(
+                order=self.order, event_type=event_type))
+            fline.shipment, fline.package = shipment, package
+            fline.save()
+
+    def get_fulfillment_order(self):
+        return FulfillmentOrder.objects.get(pk=self.fulfillment_order.pk)
+
+    def test_is_built_with_a_fixed_number_of_queries(self):
+        with self.assertNumQueries(6):
+            data = timeline.build_fulfillment_timeline(self.fulfillment_order)
+
+        self.assertEquals(len(data['shipments']), 2)
+        self.assertEquals(len(data['events']), 2)
+        self.assertEquals(
+            [s['packages'][0]['lines'][0]['sku'] for s in data['shipments']],
+            ['SKU0', 'SKU1'])
+        self.assertEquals(
+            [l['sku'] for l in data['unshipped_lines']], ['SKU2'])
+
+    def test_is_cached_until_the_fulfillment_order_is_updated(self):
+        fulfillment_order = self.get_fulfillment_order()
+        data = timeline.get_fulfillment_timeline(fulfillment_order)
+        with self.assertNumQueries(0):
+            self.assertEquals(
+                timeline.get_fulfillment_timeline(fulfillment_order), data)
+
+        factories.FulfillmentShipmentFactory(order=self.order)
+        timeline.invalidate_fulfillment_timelines(self.order)
+
+        data = timeline.get_fulfillment_timeline(self.get_fulfillment_order())
+        self.assertEquals(len(data['shipments']), 3)
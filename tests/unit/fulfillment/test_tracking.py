@@ -0,0 +1,148 @@
+import mock
+
+from datetime import timedelta
+
+from django.test import TestCase
+from django.db.models import get_model
+from django.test.utils import override_settings
+from django.utils.timezone import now as tz_now
+
+from oscar_mws.api import MWSError, MWSObject
+from oscar_mws.test import factories
+from oscar_mws.fulfillment import tracking
+
+FulfillmentOrder = get_model('oscar_mws', 'FulfillmentOrder')
+ShipmentPackage = get_model('oscar_mws', 'ShipmentPackage')
+
+
+def get_tracking_response(status, events=()):
+    return mock.Mock(parsed=MWSObject(
+        CurrentStatus=status,
+        EstimatedArrivalDate='2014-03-12T10:27:42Z',
+        TrackingEvents=MWSObject(member=[
+            MWSObject(EventCode=code, EventDate=date,
+                      EventAddress=MWSObject(City='Reno', Country='US'))
+            for code, date in events])))
+
+
+@override_settings(MWS_PACKAGE_TRACKING_INTERVAL=3600)
+class TestTrackingInterval(TestCase):
+
+    def test_grows_with_the_age_of_the_shipment(self):
+        now = tz_now()
+        package = factories.ShipmentPackageFactory(
+            fulfillment_shipment__date_shipped=now - timedelta(days=15))
+        self.assertEquals(
+            tracking.get_tracking_interval(package, now), timedelta(hours=3))
+
+    def test_uses_base_interval_for_statuses_that_need_attention(self):
+        now = tz_now()
+        package = factories.ShipmentPackageFactory(
+            tracking_status='DELAYED',
+            fulfillment_shipment__date_shipped=now - timedelta(days=15))
+        self.assertEquals(
+            tracking.get_tracking_interval(package, now), timedelta(hours=1))
+
+
+class TestDuePackages(TestCase):
+
+    def test_excludes_delivered_old_and_not_due_packages(self):
+        now = tz_now()
+        shipment = factories.FulfillmentShipmentFactory(date_shipped=now)
+        due = [
+            factories.ShipmentPackageFactory(
+                fulfillment_shipment=shipment,
+                date_tracking_due=now - timedelta(hours=hours))
+            for hours in (1, 2)]
+        factories.ShipmentPackageFactory(
+            fulfillment_shipment=shipment, tracking_status='DELIVERED',
+            date_tracking_due=now - timedelta(hours=3))
+        factories.ShipmentPackageFactory(
+            fulfillment_shipment=shipment,
+            date_tracking_due=now + timedelta(hours=1))
+        factories.ShipmentPackageFactory(
+            fulfillment_shipment__date_shipped=now - timedelta(days=90),
+            date_tracking_due=now - timedelta(hours=3))
+
+        self.assertEquals(
+            tracking.get_due_packages(now=now), list(reversed(due)))
+        self.assertEquals(
+            tracking.get_due_packages(batch_size=1, now=now), [due[1]])
+
+
+class TestUpdatingDuePackages(TestCase):
+
+    def setUp(self):
+        super(TestUpdatingDuePackages, self).setUp()
+        self.fulfillment_order = factories.FulfillmentOrderFactory()
+        self.package = factories.ShipmentPackageFactory(
+            fulfillment_shipment__order=self.fulfillment_order.order,
+            fulfillment_shipment__date_shipped=tz_now())
+        self.outbound_api = mock.Mock()
+        patcher = mock.patch(
+            'oscar_mws.fulfillment.tracking.get_merchant_connection')
+        patcher.start().return_value = self.outbound_api
+        self.addCleanup(patcher.stop)
+
+    def make_due(self):
+        ShipmentPackage.objects.update(date_tracking_due=tz_now())
+
+    def test_stores_status_and_new_tracking_events(self):
+        events = [('EVENT_101', '2014-03-09T08:48:53Z')]
+        self.outbound_api.get_package_tracking_details.return_value = \
+            get_tracking_response('IN_TRANSIT', events)
+        date_updated = self.fulfillment_order.date_updated
+
+        self.assertEquals(tracking.update_due_packages(), (1, 0))
+        self.make_due()
+        events.append(('EVENT_301', '2014-03-10T08:48:53Z'))
+        self.outbound_api.get_package_tracking_details.return_value = \
+            get_tracking_response('DELIVERED', events)
+        self.assertEquals(tracking.update_due_packages(), (1, 0))
+
+        package = ShipmentPackage.objects.get(pk=self.package.pk)
+        self.assertEquals(package.tracking_status, 'DELIVERED')
+        self.assertEquals(
+            [e.event_code for e in package.tracking_events.all()],
+            ['EVENT_101', 'EVENT_301'])
+        self.assertNotEquals(
+            FulfillmentOrder.objects.get(
+                pk=self.fulfillment_order.pk).date_updated,
+            date_updated)
+
+        self.make_due()
+        self.assertEquals(tracking.update_due_packages(), (0, 0))
+
+    def test_reschedules_packages_that_failed(self):
+        self.outbound_api.get_package_tracking_details.side_effect = \
+            MWSError('throttled')
+
+        self.assertEquals(tracking.update_due_packages(), (0, 1))
+        package = ShipmentPackage.objects.get(pk=self.package.pk)
+        self.assertTrue(package.date_tracking_due > tz_now())
+        self.assertEquals(package.date_tracking_updated, None)
+
+    def test_retries_throttled_packages_soon(self):
+        error = MWSError('throttled')
+        error.response = mock.Mock(
+            content='<ErrorResponse><Error><Code>RequestThrottled</Code>'
+                    '</Error></ErrorResponse>')
+        self.outbound_api.get_package_tracking_details.side_effect = error
+
+        self.assertEquals(tracking.update_due_packages(), (0, 1))
+        package = ShipmentPackage.objects.get(pk=self.package.pk)
+        self.assertTrue(
+            package.date_tracking_due <=
+            tz_now() + tracking.THROTTLED_RETRY_DELAY)
+
+    def test_throttles_requests_per_merchant(self):
+        self.outbound_api.get_package_tracking_details.return_value = \
+            get_tracking_response('IN_TRANSIT')
+        with mock.patch(
+                'oscar_mws.fulfillment.tracking.get_request_throttle') \
+                as throttle_mock:
+            tracking.update_due_packages()
+        throttle_mock.assert_called_once_with(
+            self.fulfillment_order.merchant.seller_id,
+            'GetPackageTrackingDetails', *tracking.PACKAGE_TRACKING_QUOTA)
+        self.assertEquals(throttle_mock.return_value.wait.call_count, 1)
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+import mock
+import pytest
+
+from datetime import datetime, timedelta
+
+from django.db import connection, reset_queries
+from django.db.models import get_model
+from django.utils.timezone import now as tz_now, utc
+
+from oscar_mws.test import factories
+from oscar_mws.feeds import scheduler
+from oscar_mws.abstract_models import (
+    STATUS_CANCELLED, STATUS_DONE, STATUS_SUBMITTED, TYPE_POST_PRODUCT_DATA)
+
+FeedSubmission = get_model('oscar_mws', 'FeedSubmission')
+
+SUBMITTED = datetime(2014, 1, 1, 12, 0, tzinfo=utc)
+
+
+def get_history(minutes, merchant_id=1, num_messages=10):
+    return [(TYPE_POST_PRODUCT_DATA, merchant_id, num_messages, SUBMITTED,
+             SUBMITTED + timedelta(minutes=m)) for m in minutes]
+
+
+def test_estimator_uses_median_of_matching_feeds():
+    estimator = scheduler.ProcessingTimeEstimator(get_history([5, 20, 7]))
+    assert estimator.estimate(TYPE_POST_PRODUCT_DATA, 1, 12) == \
+        timedelta(minutes=7)
+
+
+def test_estimator_falls_back_to_less_specific_feeds():
+    estimator = scheduler.ProcessingTimeEstimator(
+        get_history([5, 20, 7], merchant_id=2))
+    assert estimator.estimate(TYPE_POST_PRODUCT_DATA, 1, 12) == \
+        timedelta(minutes=7)
+    assert estimator.estimate('_OTHER_FEED_', 1, 12) == estimator.default
+
+
+def test_next_poll_is_scheduled_at_expected_completion():
+    now = SUBMITTED + timedelta(minutes=1)
+    next_poll = scheduler.get_next_poll(
+        timedelta(minutes=10), SUBMITTED, now)
+    assert next_poll == SUBMITTED + timedelta(minutes=10)
+
+
+def test_overdue_feeds_are_polled_with_increasing_delay():
+    now = SUBMITTED + timedelta(minutes=40)
+    next_poll = scheduler.get_next_poll(
+        timedelta(minutes=10), SUBMITTED, now)
+    assert next_poll == now + timedelta(minutes=10)
+
+
+@pytest.fixture
+def merchant(transactional_db):
+    return factories.MerchantAccountFactory()
+
+
+def test_polls_only_due_submissions_in_one_batch(merchant):
+    now = tz_now()
+    due = []
+    for num in range(3):
+        due.append(factories.FeedSubmissionFactory(
+            submission_id='10{}'.format(num), merchant=merchant,
+            feed_type=TYPE_POST_PRODUCT_DATA,
+            processing_status=STATUS_SUBMITTED,
+            date_submitted=now - timedelta(minutes=30)))
+    factories.FeedSubmissionFactory(
+        submission_id='200', merchant=merchant,
+        feed_type=TYPE_POST_PRODUCT_DATA, processing_status=STATUS_SUBMITTED,
+        date_submitted=now)
+    factories.FeedSubmissionFactory(
+        submission_id='300', merchant=merchant,
+        feed_type=TYPE_POST_PRODUCT_DATA, processing_status=STATUS_DONE,
+        date_submitted=now - timedelta(minutes=30))
+
+    with mock.patch('oscar_mws.feeds.gateway.poll_feed_submissions') \
+            as poll_mock:
+        poll_mock.return_value = []
+        scheduler.poll_due_submissions(
+            merchant, scheduler.ProcessingTimeEstimator())
+
+    assert poll_mock.call_count == 1
+    assert sorted(poll_mock.call_args[0][1]) == ['100', '101', '102']
+
+    for submission in FeedSubmission.objects.filter(
+            processing_status=STATUS_SUBMITTED):
+        assert submission.date_next_poll > now
+
+    queue = scheduler.get_poll_queue(merchant)
+    assert len(queue) == 4
+    assert queue[0]['submission_id'] == '200'
+
+
+def test_schedules_submissions_with_same_poll_date_together(merchant):
+    now = tz_now()
+    for num in range(3):
+        factories.FeedSubmissionFactory(
+            submission_id='10{}'.format(num), merchant=merchant,
+            feed_type=TYPE_POST_PRODUCT_DATA,
+            processing_status=STATUS_SUBMITTED,
+            date_submitted=now - timedelta(minutes=30))
+
+    connection.use_debug_cursor = True
+    try:
+        reset_queries()
+        num_scheduled = scheduler.schedule_submissions(
+            FeedSubmission.objects.all(),
+            scheduler.ProcessingTimeEstimator(), now)
+        updates = [q for q in connection.queries
+                   if q['sql'].startswith('UPDATE')]
+    finally:
+        connection.use_debug_cursor = False
+
+    assert num_scheduled == 3
+    assert len(updates) == 1
+    assert len(set(FeedSubmission.objects.values_list(
+        'date_next_poll', flat=True))) == 1
+
+
+def test_estimator_ignores_cancelled_submissions(merchant):
+    for num, status in enumerate([STATUS_CANCELLED] * 3 + [STATUS_DONE]):
+        factories.FeedSubmissionFactory(
+            submission_id='10{}'.format(num), merchant=merchant,
+            feed_type=TYPE_POST_PRODUCT_DATA, processing_status=status,
+            date_submitted=SUBMITTED,
+            date_completed=SUBMITTED + timedelta(minutes=1))
+
+    estimator = scheduler.ProcessingTimeEstimator.from_history()
+    assert estimator.estimate(TYPE_POST_PRODUCT_DATA, merchant.id) == \
+        estimator.default
@@ -2,10 +2,17 @@
 import mock
 import pytest
 
+from django.db import connection, reset_queries
+from django.db.models import get_model
+
+from oscar_mws.api import MWSObject
 from oscar_mws.test import factories
 from oscar_mws.feeds import gateway as feed_gw
 from oscar_mws.abstract_models import (
-    STATUS_CANCELLED, STATUS_SUBMITTED, TYPE_POST_PRODUCT_DATA)
+    STATUS_CANCELLED, STATUS_DONE, STATUS_IN_PROGRESS, STATUS_SUBMITTED,
+    TYPE_POST_PRODUCT_DATA)
+
+Product = get_model('catalogue', 'Product')
 
 
 @pytest.fixture
@@ -76,3 +83,128 @@ def test_cancelling_submission_without_db_record_creates_it(submission):
 
         assert updated.submission_id == new_submission.submission_id
         assert updated.processing_status == STATUS_CANCELLED
+
+
+def get_submission_list_response(statuses, has_next=False):
+    response = MWSObject(FeedSubmissionInfo=[
+        MWSObject(FeedSubmissionId=submission_id,
+                  SubmittedDate='2012-06-30T10:00:00+00:00',
+                  FeedType=TYPE_POST_PRODUCT_DATA,
+                  FeedProcessingStatus=status)
+        for submission_id, status in statuses])
+    if has_next:
+        response['HasNext'] = 'true'
+        response['NextToken'] = 'TOKEN'
+    return mock.Mock(parsed=response)
+
+
+def test_polling_submissions_requests_ids_in_batches():
+    feeds_api = mock.Mock()
+    feeds_api.get_feed_submission_list.side_effect = (
+        lambda feedids, max_count: get_submission_list_response(
+            [(i, STATUS_SUBMITTED) for i in feedids]))
+
+    submission_ids = [str(i) for i in range(250)]
+    infos = list(feed_gw.iter_feed_submission_info(feeds_api, submission_ids))
+
+    assert len(infos) == 250
+    assert feeds_api.get_feed_submission_list.call_count == 3
+
+
+def test_polling_submissions_follows_next_token():
+    feeds_api = mock.Mock()
+    feeds_api.get_feed_submission_list.return_value = \
+        get_submission_list_response([('1', STATUS_SUBMITTED)], True)
+    feeds_api.get_submission_list_by_next_token.return_value = \
+        get_submission_list_response([('2', STATUS_SUBMITTED)])
+
+    infos = list(feed_gw.iter_feed_submission_info(feeds_api, ['1', '2']))
+
+    assert [i.FeedSubmissionId for i in infos] == ['1', '2']
+    feeds_api.get_submission_list_by_next_token.assert_called_with(
+        token='TOKEN')
+
+
+def test_updating_submission_stores_completion_date(submission):
+    response = get_submission_list_response(
+        [(submission.submission_id, STATUS_DONE)])
+    response.parsed.FeedSubmissionInfo[0]['CompletedProcessingDate'] = \
+        '2012-06-30T10:05:00+00:00'
+
+    with mock.patch('oscar_mws.feeds.gateway.get_merchant_connection') as conn:
+        conn.return_value.get_feed_submission_list.return_value = response
+        updated = feed_gw.update_feed_submission(submission)
+
+    assert updated.processing_status == STATUS_DONE
+    assert updated.date_completed.minute == 5
+    assert updated.date_next_poll is None
+
+
+def test_polling_submissions_updates_changed_statuses_only(submission):
+    unchanged = factories.FeedSubmissionFactory(
+        submission_id='123123124', merchant=submission.merchant,
+        processing_status=STATUS_IN_PROGRESS)
+
+    with mock.patch('oscar_mws.feeds.gateway.get_merchant_connection') as conn:
+        conn.return_value.get_feed_submission_list.return_value = \
+            get_submission_list_response([
+                (submission.submission_id, STATUS_DONE),
+                (unchanged.submission_id, STATUS_IN_PROGRESS)])
+        with mock.patch(
+                'oscar_mws.feeds.gateway.process_submission_results') \
+                as process_results:
+            updated = feed_gw.poll_feed_submissions(submission.merchant)
+
+    assert [s.submission_id for s in updated] == [submission.submission_id]
+    assert updated[0].processing_status == STATUS_DONE
+    process_results.assert_called_once_with(updated[0])
+
+
+def test_switching_fulfillment_streams_products_in_one_query(
+        transactional_db, capsys):
+    marketplace = factories.AmazonMarketplaceFactory()
+    for idx in range(3):
+        factories.ProductFactory(
+            amazon_profile__sku='SKU{0}'.format(idx),
+            amazon_profile__fulfillment_by='AFN')
+    factories.ProductFactory(amazon_profile=None)
+
+    products = Product.objects.all()
+    connection.use_debug_cursor = True
+    try:
+        reset_queries()
+        feed_gw.switch_product_fulfillment(
+            marketplace, products, dry_run=True)
+        num_queries = len(connection.queries)
+    finally:
+        connection.use_debug_cursor = False
+
+    assert num_queries == 1
+    xml_data = capsys.readouterr()[0]
+    assert xml_data.count('<SwitchFulfillmentTo>AFN<') == 3
+
+
+def test_submitting_product_feed_uploads_feed_from_file(transactional_db):
+    marketplace = factories.AmazonMarketplaceFactory()
+    for idx in range(3):
+        factories.ProductFactory(amazon_profile__sku='SKU{0}'.format(idx))
+
+    uploaded = []
+
+    def submit_feed(feed, **kwargs):
+        uploaded.append(feed.read())
+        return mock.Mock(parsed=MWSObject(FeedSubmissionInfo=MWSObject(
+            FeedSubmissionId='123', SubmittedDate='2012-06-30T10:00:00Z',
+            FeedType=TYPE_POST_PRODUCT_DATA,
+            FeedProcessingStatus=STATUS_SUBMITTED)))
+
+    with mock.patch('oscar_mws.feeds.gateway.get_merchant_connection') as conn:
+        conn.return_value.submit_feed.side_effect = submit_feed
+        submissions = feed_gw.submit_product_feed(
+            Product.objects.all(), [marketplace])
+
+    assert len(uploaded) == 1
+    assert uploaded[0].count('<Message>') == 3
+    assert submissions[0].num_messages == 3
+    assert submissions[0].submitted_products.count() == 3
+    assert submissions[0].feed_xml == uploaded[0].decode('utf-8')
@@ -0,0 +1,134 @@
+import mock
+import httpretty
+import requests
+
+from django.test import TestCase
+from django.test.utils import override_settings
+
+from oscar_mws import api, instrumentation
+
+
+def get_metrics(**kwargs):
+    values = dict(
+        action='GetServiceStatus', method='GET',
+        host='mws.amazonservices.com', status_code=200, error_code=None,
+        response_bytes=100, sign_time=0.001, http_time=0.2, parse_time=0.01)
+    values.update(kwargs)
+    return instrumentation.RequestMetrics(**values)
+
+
+class TestInstrumentingRequests(TestCase):
+    url = 'https://mws.amazonservices.com/'
+    response = (
+        '<GetServiceStatusResponse><GetServiceStatusResult>'
+        '<Status>GREEN</Status>'
+        '</GetServiceStatusResult></GetServiceStatusResponse>')
+    error_response = (
+        '<ErrorResponse><Error><Type>Sender</Type>'
+        '<Code>RequestThrottled</Code><Message>Throttled</Message>'
+        '</Error></ErrorResponse>')
+
+    def setUp(self):
+        super(TestInstrumentingRequests, self).setUp()
+        self.mws = api.MWS('FAKE_KEY', 'FAKE_SECRET', 'FAKE_SELLER')
+        self.addCleanup(instrumentation.reset_sinks)
+
+    def get_sink(self):
+        instrumentation.reset_sinks()
+        return instrumentation.get_sinks()[0]
+
+    @httpretty.activate
+    @override_settings(MWS_INSTRUMENTATION_SINKS=[
+        'oscar_mws.instrumentation.CounterSink'])
+    def test_emits_metrics_for_successful_requests(self):
+        httpretty.register_uri(httpretty.GET, self.url, body=self.response)
+        sink = self.get_sink()
+
+        self.mws.make_request({'Action': 'GetServiceStatus'})
+
+        labels = ('GetServiceStatus', 200, '')
+        counters = sink.get_counters()
+        self.assertEquals(counters[('mws_requests_total', labels)], 1)
+        self.assertEquals(
+            counters[('mws_response_bytes_total', labels)],
+            len(self.response))
+        self.assertTrue(counters[('mws_parse_seconds_total', labels)] > 0)
+        self.assertTrue(
+            'mws_requests_total{action="GetServiceStatus",status="200",'
+            'error=""} 1.0' in sink.render())
+
+    @httpretty.activate
+    @override_settings(MWS_INSTRUMENTATION_SINKS=[
+        ('oscar_mws.instrumentation.CounterSink', {})])
+    def test_emits_error_code_for_failed_requests(self):
+        httpretty.register_uri(
+            httpretty.GET, self.url, body=self.error_response, status=503)
+        sink = self.get_sink()
+
+        self.assertRaises(
+            api.MWSError, self.mws.make_request,
+            {'Action': 'GetServiceStatus'})
+
+        self.assertEquals(
+            sink.get_counters()[('mws_requests_total',
+                                 ('GetServiceStatus', 503,
+                                  'RequestThrottled'))],
+            1)
+
+    @httpretty.activate
+    def test_does_nothing_without_sinks(self):
+        httpretty.register_uri(httpretty.GET, self.url, body=self.response)
+        with mock.patch('oscar_mws.instrumentation.emit') as emit_mock:
+            self.mws.make_request({'Action': 'GetServiceStatus'})
+        self.assertFalse(emit_mock.called)
+
+    @override_settings(MWS_INSTRUMENTATION_SINKS=[
+        'oscar_mws.instrumentation.CounterSink'])
+    def test_emits_exception_name_for_connection_errors(self):
+        sink = self.get_sink()
+        with mock.patch.object(self.mws.session, 'request') as request_mock:
+            request_mock.side_effect = requests.Timeout()
+            self.assertRaises(
+                requests.Timeout, self.mws.make_request,
+                {'Action': 'GetServiceStatus'})
+
+        self.assertEquals(
+            sink.get_counters()[('mws_requests_total',
+                                 ('GetServiceStatus', '', 'Timeout'))],
+            1)
+
+    @override_settings(MWS_INSTRUMENTATION_SINKS=[
+        'oscar_mws.instrumentation.UnknownSink',
+        'oscar_mws.instrumentation.CounterSink'])
+    def test_skips_sinks_that_cannot_be_created(self):
+        with mock.patch('oscar_mws.instrumentation.load_sinks',
+                        wraps=instrumentation.load_sinks) as load_mock:
+            instrumentation.reset_sinks()
+            self.assertTrue(instrumentation.is_enabled())
+            sinks = instrumentation.get_sinks()
+        self.assertEquals(load_mock.call_count, 1)
+        self.assertEquals(len(sinks), 1)
+        self.assertTrue(isinstance(sinks[0], instrumentation.CounterSink))
+
+    @override_settings(MWS_INSTRUMENTATION_SINKS=[
+        'oscar_mws.instrumentation.CounterSink'])
+    def test_ignores_failing_sinks(self):
+        sink = self.get_sink()
+        with mock.patch.object(sink, 'emit') as emit_mock:
+            emit_mock.side_effect = ValueError()
+            instrumentation.emit(get_metrics())
+
+
+class TestStatsdSink(TestCase):
+
+    def test_sends_counters_and_timers(self):
+        sink = instrumentation.StatsdSink(prefix='mws')
+        lines = sink.get_lines(get_metrics(
+            status_code=503, error_code='RequestThrottled'))
+
+        self.assertEquals(lines[:2], [
+            'mws.GetServiceStatus.requests:1|c',
+            'mws.GetServiceStatus.status.503:1|c'])
+        self.assertTrue('mws.GetServiceStatus.time.http:200.000|ms' in lines)
+        self.assertEquals(
+            lines[-1], 'mws.GetServiceStatus.errors.RequestThrottled:1|c')
@@ -0,0 +1,189 @@
+import mock
+
+from datetime import timedelta
+
+from django.test import TestCase
+from django.db.models import get_model
+from django.test.utils import override_settings
+from django.utils.timezone import now as tz_now
+
+from oscar_mws import jobs
+from oscar_mws.api import MWSError
+from oscar_mws.test import factories
+
+MwsJob = get_model('oscar_mws', 'MwsJob')
+AmazonProfile = get_model('oscar_mws', 'AmazonProfile')
+
+
+@override_settings(MWS_JOB_BATCH_SIZE=2)
+class TestRunningJobs(TestCase):
+
+    def setUp(self):
+        super(TestRunningJobs, self).setUp()
+        self.marketplace = factories.AmazonMarketplaceFactory()
+        self.products = [
+            factories.ProductFactory(
+                amazon_profile__sku='SKU{0}'.format(idx))
+            for idx in range(5)]
+
+    def create_job(self, products=None):
+        return jobs.create_job(
+            MwsJob.ACTION_UPDATE_STOCK, self.marketplace, products)
+
+    def test_processes_all_products_in_batches(self):
+        job = self.create_job()
+        with mock.patch('oscar_mws.jobs.update_inventory') as update_mock:
+            self.assertTrue(jobs.run_job(job))
+
+        self.assertEquals(update_mock.call_count, 3)
+        self.assertEquals(
+            [c[0][0].count() for c in update_mock.call_args_list], [2, 2, 1])
+
+        job = MwsJob.objects.get(pk=job.pk)
+        self.assertEquals(job.status, MwsJob.DONE)
+        self.assertEquals(job.num_total, 5)
+        self.assertEquals(job.num_processed, 5)
+        self.assertEquals(job.num_failed, 0)
+        self.assertEquals(job.progress, 100)
+
+    def test_only_processes_selected_products(self):
+        job = self.create_job(self.products[:1])
+        with mock.patch('oscar_mws.jobs.update_inventory') as update_mock:
+            jobs.run_job(job)
+
+        self.assertEquals(update_mock.call_count, 1)
+        self.assertEquals(list(update_mock.call_args[0][0]),
+                          [self.products[0]])
+        self.assertEquals(MwsJob.objects.get(pk=job.pk).num_total, 1)
+
+    def test_fails_when_selected_products_were_deleted(self):
+        job = self.create_job(self.products[:1])
+        self.products[0].delete()
+        with mock.patch('oscar_mws.jobs.update_inventory') as update_mock:
+            jobs.run_job(job)
+
+        self.assertFalse(update_mock.called)
+        job = MwsJob.objects.get(pk=job.pk)
+        self.assertEquals(job.status, MwsJob.FAILED)
+        self.assertEquals(job.errors.count(), 1)
+
+    def test_fails_stale_running_jobs(self):
+        running = self.create_job()
+        stale = self.create_job()
+        MwsJob.objects.filter(pk=running.pk).update(
+            status=MwsJob.RUNNING, date_started=tz_now())
+        MwsJob.objects.filter(pk=stale.pk).update(
+            status=MwsJob.RUNNING,
+            date_started=tz_now() - timedelta(hours=7))
+
+        self.assertEquals(jobs.fail_stale_jobs(), 1)
+        self.assertEquals(
+            MwsJob.objects.get(pk=running.pk).status, MwsJob.RUNNING)
+        stale = MwsJob.objects.get(pk=stale.pk)
+        self.assertEquals(stale.status, MwsJob.FAILED)
+        self.assertEquals(stale.errors.count(), 1)
+
+    def test_records_errors_for_products_in_failed_batch(self):
+        job = self.create_job()
+        with mock.patch('oscar_mws.jobs.update_inventory') as update_mock:
+            update_mock.side_effect = [None, MWSError('throttled'), None]
+            jobs.run_job(job)
+
+        job = MwsJob.objects.get(pk=job.pk)
+        self.assertEquals(job.status, MwsJob.DONE)
+        self.assertEquals(job.num_processed, 3)
+        self.assertEquals(job.num_failed, 2)
+        self.assertItemsEqual(
+            [e.product for e in job.errors.all()], self.products[2:4])
+        self.assertEquals(job.errors.all()[0].message, 'throttled')
+
+    def test_marks_job_as_failed_on_unexpected_error(self):
+        job = self.create_job()
+        with mock.patch('oscar_mws.jobs.update_inventory') as update_mock:
+            update_mock.side_effect = ValueError('broken')
+            jobs.run_job(job)
+
+        job = MwsJob.objects.get(pk=job.pk)
+        self.assertEquals(job.status, MwsJob.FAILED)
+        self.assertEquals(job.errors.get().message, 'broken')
+
+    def test_submits_single_feed_for_all_products(self):
+        job = jobs.create_job(
+            MwsJob.ACTION_SUBMIT_PRODUCT_FEED, self.marketplace)
+        with mock.patch(
+                'oscar_mws.feeds.gateway.submit_product_feed') as submit_mock:
+            submit_mock.return_value = [mock.Mock(num_messages=5)]
+            jobs.run_job(job)
+
+        self.assertEquals(submit_mock.call_count, 1)
+        self.assertItemsEqual(
+            submit_mock.call_args[1]['products'], self.products)
+        job = MwsJob.objects.get(pk=job.pk)
+        self.assertEquals(job.num_processed, 5)
+        self.assertEquals(job.status, MwsJob.DONE)
+
+    def test_records_single_error_for_failed_feed(self):
+        job = jobs.create_job(
+            MwsJob.ACTION_SUBMIT_PRODUCT_FEED, self.marketplace)
+        with mock.patch(
+                'oscar_mws.feeds.gateway.submit_product_feed') as submit_mock:
+            submit_mock.side_effect = MWSError('throttled')
+            jobs.run_job(job)
+
+        job = MwsJob.objects.get(pk=job.pk)
+        self.assertEquals(job.status, MwsJob.FAILED)
+        self.assertEquals(job.num_failed, 5)
+        self.assertEquals(job.errors.get().message, 'throttled')
+
+    def test_runs_pending_job_only_once(self):
+        job = self.create_job()
+        with mock.patch('oscar_mws.jobs.update_inventory'):
+            self.assertEquals(jobs.run_pending_jobs(), [job])
+            self.assertEquals(jobs.run_pending_jobs(), [])
+            self.assertFalse(jobs.run_job(job))
+
+
+class TestSwitchingToAfnJob(TestCase):
+
+    def test_updates_profiles_with_a_single_query(self):
+        marketplace = factories.AmazonMarketplaceFactory()
+        products = [
+            factories.ProductFactory(amazon_profile__sku='SKU{0}'.format(idx))
+            for idx in range(3)]
+        job = jobs.create_job(
+            MwsJob.ACTION_SWITCH_TO_AFN, marketplace, products[:2])
+
+        with mock.patch('oscar_mws.feeds.gateway.switch_product_fulfillment'):
+            with self.assertNumQueries(1):
+                jobs.switch_to_afn(job, job.products.all())
+
+        self.assertItemsEqual(
+            AmazonProfile.objects.filter(
+                fulfillment_by=AmazonProfile.FULFILLMENT_BY_AMAZON
+            ).values_list('sku', flat=True),
+            ['SKU0', 'SKU1'])
+
+    @override_settings(MWS_JOB_BATCH_SIZE=1)
+    def test_switches_all_products_with_a_single_feed(self):
+        marketplace = factories.AmazonMarketplaceFactory()
+        products = [
+            factories.ProductFactory(amazon_profile__sku='SKU{0}'.format(idx))
+            for idx in range(3)]
+        for product in products[:2]:
+            product.amazon_profile.marketplaces.add(marketplace)
+        job = jobs.create_job(MwsJob.ACTION_SWITCH_TO_AFN, marketplace)
+
+        gateway = 'oscar_mws.feeds.gateway'
+        with mock.patch(gateway + '.get_merchant_connection') as conn_mock:
+            with mock.patch(gateway + '.handle_feed_submission_response'
+                            ) as response_mock:
+                response_mock.side_effect = \
+                    lambda *args, **kwargs: mock.Mock(**kwargs)
+                jobs.run_job(job)
+
+        self.assertEquals(
+            conn_mock.return_value.submit_feed.call_count, 1)
+        job = MwsJob.objects.get(pk=job.pk)
+        self.assertEquals(job.num_total, 2)
+        self.assertEquals(job.num_processed, 2)
+        self.assertEquals(job.status, MwsJob.DONE)
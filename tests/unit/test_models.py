@@ -144,3 +144,46 @@ class TestMerchantAccount(TestCase):
         self.merchant.marketplaces.add(marketplaces[1])
         self.assertEquals(self.merchant.marketplace_ids,
                           [m.marketplace_id for m in marketplaces])
+
+
+class TestFeedSubmissionContent(TestCase):
+    feed_xml = u'<AmazonEnvelope><Title>Caf\xe9</Title></AmazonEnvelope>'
+
+    def test_stores_the_feed_compressed(self):
+        submission = factories.FeedSubmissionFactory(
+            submission_id='1', feed_xml=self.feed_xml)
+        submission = mwsm.FeedSubmission.objects.get(id=submission.id)
+
+        self.assertEquals(submission.feed_xml, self.feed_xml)
+        self.assertNotIn('AmazonEnvelope',
+                         submission.feed_content.compressed_data)
+        self.assertEquals(submission.feed_content.size,
+                          len(self.feed_xml.encode('utf-8')))
+
+    def test_stores_identical_feeds_only_once(self):
+        merchant = factories.MerchantAccountFactory()
+        first = factories.FeedSubmissionFactory(
+            submission_id='2', merchant=merchant, feed_xml=self.feed_xml)
+        second = factories.FeedSubmissionFactory(
+            submission_id='3', merchant=merchant, feed_xml=self.feed_xml)
+        factories.FeedSubmissionFactory(
+            submission_id='4', merchant=merchant,
+            feed_xml=u'<AmazonEnvelope/>')
+
+        self.assertEquals(first.feed_content_id, second.feed_content_id)
+        self.assertEquals(mwsm.FeedContent.objects.count(), 2)
+
+    def test_does_not_load_the_feed_when_querying_submissions(self):
+        submission = factories.FeedSubmissionFactory(
+            submission_id='5', feed_xml=self.feed_xml)
+
+        with self.assertNumQueries(1):
+            submission = mwsm.FeedSubmission.objects.get(id=submission.id)
+        with self.assertNumQueries(1):
+            self.assertEquals(submission.feed_xml, self.feed_xml)
+            self.assertEquals(submission.feed_xml, self.feed_xml)
+
+    def test_returns_none_without_feed(self):
+        submission = factories.FeedSubmissionFactory(
+            submission_id='6')
+        self.assertEquals(submission.feed_xml, None)
@@ -0,0 +1,215 @@
+import mock
+
+from decimal import Decimal as D
+
+from django.test import TestCase
+from django.db.models import get_model
+
+from oscar_mws.api import MWSError, MWSObject
+from oscar_mws.test import factories
+from oscar_mws.utils import RequestThrottle
+from oscar_mws.orders import gateway
+
+Order = get_model('order', 'Order')
+AmazonOrder = get_model('oscar_mws', 'AmazonOrder')
+AmazonMarketplace = get_model('oscar_mws', 'AmazonMarketplace')
+
+
+def get_order_data(order_id, status='Unshipped', marketplace_id='MKT'):
+    return MWSObject(
+        AmazonOrderId=order_id,
+        OrderStatus=status,
+        MarketplaceId=marketplace_id,
+        PurchaseDate='2014-01-02T10:00:00Z',
+        FulfillmentChannel='MFN',
+        ShipServiceLevel='Std US D2D Dom',
+        BuyerEmail='buyer@example.com',
+        OrderTotal=MWSObject(CurrencyCode='USD', Amount='25.00'),
+        ShippingAddress=MWSObject(
+            Name='Peter Griffin', AddressLine1='31 Spooner Street',
+            City='Quahog', StateOrRegion='RI', PostalCode='12345',
+            CountryCode='US'))
+
+
+def get_item_data(sku, quantity=2):
+    return MWSObject(
+        SellerSKU=sku, OrderItemId='ITEM-{0}'.format(sku), Title='A Title',
+        QuantityOrdered=str(quantity),
+        ItemPrice=MWSObject(CurrencyCode='USD', Amount='20.00'),
+        ItemTax=MWSObject(CurrencyCode='USD', Amount='1.00'),
+        ShippingPrice=MWSObject(CurrencyCode='USD', Amount='4.00'))
+
+
+class MockedThrottleMixin(object):
+
+    def setUp(self):
+        super(MockedThrottleMixin, self).setUp()
+        patcher = mock.patch('oscar_mws.orders.gateway.get_throttle')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class TestSavingOrders(MockedThrottleMixin, TestCase):
+
+    def setUp(self):
+        super(TestSavingOrders, self).setUp()
+        factories.CountryFactory(iso_3166_1_a2='US')
+        self.marketplace = factories.AmazonMarketplaceFactory(
+            marketplace_id='MKT')
+        self.merchant = self.marketplace.merchant
+        self.product = factories.ProductFactory(amazon_profile__sku='SKU1')
+        self.orders_api = mock.Mock()
+        self.orders_api.list_order_items.return_value = mock.Mock(
+            parsed=MWSObject(OrderItems=MWSObject(
+                OrderItem=get_item_data('SKU1'))))
+
+    def test_creates_orders_with_lines(self):
+        orders = [get_order_data('111-1'), get_order_data('111-2'),
+                  get_order_data('111-3', status='Pending')]
+
+        self.assertEquals(
+            gateway.save_orders(self.merchant, self.orders_api, orders),
+            (2, 0))
+        self.assertEquals(self.orders_api.list_order_items.call_count, 2)
+
+        order = Order.objects.get(number='111-1')
+        self.assertEquals(order.status, 'Pending')
+        self.assertEquals(order.total_incl_tax, D('25.00'))
+        self.assertEquals(order.total_excl_tax, D('24.00'))
+        self.assertEquals(order.shipping_excl_tax, D('4.00'))
+        self.assertEquals(order.date_placed.year, 2014)
+        self.assertEquals(order.shipping_address.line4, 'Quahog')
+        self.assertEquals(order.shipping_address.notes, None)
+        self.assertIn('Quahog', order.shipping_address.search_text)
+        self.assertNotEquals(
+            order.shipping_address_id,
+            Order.objects.get(number='111-2').shipping_address_id)
+
+        line = order.lines.get()
+        self.assertEquals(line.product, self.product)
+        self.assertEquals(line.quantity, 2)
+        self.assertEquals(line.unit_price_excl_tax, D('10.00'))
+        self.assertEquals(line.line_price_incl_tax, D('21.00'))
+
+        amazon_order = order.amazon_order
+        self.assertEquals(amazon_order.amazon_order_id, '111-1')
+        self.assertEquals(amazon_order.marketplace, self.marketplace)
+
+    def test_updates_only_orders_with_changed_status(self):
+        gateway.save_orders(
+            self.merchant, self.orders_api,
+            [get_order_data('111-1'), get_order_data('111-2')])
+        self.orders_api.reset_mock()
+
+        orders = [get_order_data('111-1', status='Shipped'),
+                  get_order_data('111-2')]
+        self.assertEquals(
+            gateway.save_orders(self.merchant, self.orders_api, orders),
+            (0, 1))
+        self.assertFalse(self.orders_api.list_order_items.called)
+        self.assertEquals(
+            Order.objects.get(number='111-1').status, 'Complete')
+        self.assertEquals(
+            AmazonOrder.objects.get(amazon_order_id='111-1').status, 'Shipped')
+        self.assertEquals(Order.objects.get(number='111-2').status, 'Pending')
+
+    def test_uses_unmapped_statuses_unchanged(self):
+        with self.settings(MWS_ORDER_STATUS_MAP={'Shipped': 'Dispatched'}):
+            gateway.save_orders(
+                self.merchant, self.orders_api, [get_order_data('111-1')])
+            self.assertEquals(
+                Order.objects.get(number='111-1').status, 'Unshipped')
+
+            gateway.save_orders(
+                self.merchant, self.orders_api,
+                [get_order_data('111-1', status='Shipped')])
+            self.assertEquals(
+                Order.objects.get(number='111-1').status, 'Dispatched')
+
+
+class TestUpdatingMarketplaceOrders(MockedThrottleMixin, TestCase):
+
+    def setUp(self):
+        super(TestUpdatingMarketplaceOrders, self).setUp()
+        self.marketplace = factories.AmazonMarketplaceFactory()
+        self.orders_api = mock.Mock()
+        patcher = mock.patch(
+            'oscar_mws.orders.gateway.get_merchant_connection')
+        patcher.start().return_value = self.orders_api
+        self.addCleanup(patcher.stop)
+
+    def get_response(self, order_ids, next_token=None):
+        response = MWSObject(Orders=MWSObject(
+            Order=[get_order_data(i, status='Pending') for i in order_ids]))
+        if next_token:
+            response['NextToken'] = next_token
+        return mock.Mock(parsed=response)
+
+    def test_follows_next_token_and_stores_high_water_mark(self):
+        self.orders_api.list_orders.return_value = self.get_response(
+            ['111-1'], next_token='TOKEN')
+        self.orders_api.list_orders_by_next_token.return_value = \
+            self.get_response(['111-2'])
+
+        with mock.patch('oscar_mws.orders.gateway.save_orders') as save_mock:
+            save_mock.return_value = (1, 0)
+            self.assertEquals(
+                gateway.update_marketplace_orders(self.marketplace), (2, 0))
+
+        self.assertEquals(
+            [[o.AmazonOrderId for o in c[0][2]]
+             for c in save_mock.call_args_list],
+            [['111-1'], ['111-2']])
+        self.orders_api.list_orders_by_next_token.assert_called_with(
+            token='TOKEN')
+
+        date_synced = AmazonMarketplace.objects.get(
+            pk=self.marketplace.pk).date_orders_synced
+        self.assertEquals(date_synced, self.marketplace.date_orders_synced)
+        gateway.update_marketplace_orders(self.marketplace)
+        self.assertEquals(
+            self.orders_api.list_orders.call_args[1]['lastupdatedafter'],
+            date_synced.isoformat())
+
+    def test_keeps_high_water_mark_when_import_fails(self):
+        self.orders_api.list_orders.return_value = self.get_response(
+            ['111-1'], next_token='TOKEN')
+        self.orders_api.list_orders_by_next_token.side_effect = MWSError()
+
+        self.assertRaises(
+            MWSError, gateway.update_marketplace_orders, self.marketplace)
+        self.assertEquals(
+            AmazonMarketplace.objects.get(
+                pk=self.marketplace.pk).date_orders_synced,
+            None)
+
+
+class TestIteratingOrders(MockedThrottleMixin, TestCase):
+
+    def test_requests_orders_in_batches(self):
+        order_ids = ['111-{0}'.format(i) for i in range(120)]
+        orders_api = mock.Mock()
+        orders_api.get_order.return_value = mock.Mock(parsed=MWSObject())
+
+        list(gateway.iter_orders(orders_api, 'SELLER', order_ids))
+
+        self.assertEquals(
+            [len(c[1]['amazon_order_ids'])
+             for c in orders_api.get_order.call_args_list],
+            [50, 50, 20])
+
+
+class TestRequestThrottle(TestCase):
+
+    @mock.patch('oscar_mws.utils.time')
+    def test_waits_for_restored_requests_once_quota_is_used(self, time_mock):
+        time_mock.time.return_value = 1000.0
+        throttle = RequestThrottle(max_quota=2, restore_rate=10)
+
+        throttle.wait()
+        throttle.wait()
+        self.assertFalse(time_mock.sleep.called)
+
+        time_mock.time.return_value = 1004.0
+        throttle.wait()
+        time_mock.sleep.assert_called_once_with(6.0)
@@ -0,0 +1,101 @@
+import mock
+
+from decimal import Decimal as D
+
+from django.test import TestCase
+from django.db.models import get_model
+
+from oscar_mws.api import DictWrapper, MWSError
+from oscar_mws.test import factories, mixins
+from oscar_mws.pricing import gateway, snapshots
+
+PricingSnapshot = get_model('oscar_mws', 'PricingSnapshot')
+
+
+class TestUpdatingMarketplacePricing(mixins.DataLoaderMixin, TestCase):
+
+    def setUp(self):
+        super(TestUpdatingMarketplacePricing, self).setUp()
+        self.marketplace = factories.AmazonMarketplaceFactory()
+        for sku in ['SKU1', 'SKU2']:
+            profile = factories.ProductFactory(
+                amazon_profile__sku=sku).amazon_profile
+            profile.marketplaces.add(self.marketplace)
+
+        self.products_api = mock.Mock()
+        self.products_api.get_competitive_pricing_for_sku.return_value = \
+            DictWrapper(
+                self.load_data('get_competitive_pricing_for_sku_response.xml'),
+                'GetCompetitivePricingForSKUResult')
+        self.products_api.get_lowest_offer_listings_for_sku.return_value = \
+            DictWrapper(
+                self.load_data(
+                    'get_lowest_offer_listings_for_sku_response.xml'),
+                'GetLowestOfferListingsForSKUResult')
+
+        for name in ['get_merchant_connection', 'get_request_throttle']:
+            patcher = mock.patch('oscar_mws.pricing.gateway.{0}'.format(name))
+            patcher.start().return_value = self.products_api
+            self.addCleanup(patcher.stop)
+
+    def test_stores_snapshot_for_successful_skus(self):
+        self.assertEquals(
+            gateway.update_marketplace_pricing(self.marketplace), (1, 0, 1))
+
+        snapshot = snapshots.get_latest_snapshot(self.marketplace, 'SKU1')
+        self.assertEquals(snapshot.currency, 'USD')
+        self.assertEquals(snapshot.buybox_price, D('23.99'))
+        self.assertFalse(snapshot.is_buybox_ours)
+        self.assertEquals(snapshot.lowest_price, D('22.75'))
+        self.assertEquals(snapshot.num_offers, 7)
+        self.assertEquals(snapshot.sales_rank, 1523)
+        self.assertEquals(
+            snapshots.get_latest_snapshot(self.marketplace, 'SKU2'), None)
+
+        self.products_api.get_lowest_offer_listings_for_sku.assert_called_with(
+            marketplaceid=self.marketplace.marketplace_id,
+            skus=['SKU1', 'SKU2'], condition='New', excludeme='True')
+
+    def test_appends_snapshots_only_when_values_change(self):
+        gateway.update_marketplace_pricing(self.marketplace)
+        first = snapshots.get_latest_snapshot(self.marketplace, 'SKU1')
+
+        self.assertEquals(
+            gateway.update_marketplace_pricing(self.marketplace), (0, 1, 1))
+        latest = snapshots.get_latest_snapshot(self.marketplace, 'SKU1')
+        self.assertEquals(latest.id, first.id)
+        self.assertTrue(latest.date_checked > first.date_checked)
+
+        with mock.patch('oscar_mws.pricing.gateway.get_lowest_price') as lp:
+            lp.return_value = (D('21.00'), 'USD')
+            gateway.update_marketplace_pricing(self.marketplace)
+        latest = snapshots.get_latest_snapshot(self.marketplace, 'SKU1')
+        self.assertEquals(latest.lowest_price, D('21.00'))
+        self.assertEquals(PricingSnapshot.objects.count(), 2)
+
+    def test_skips_batches_that_fail(self):
+        self.products_api.get_competitive_pricing_for_sku.side_effect = \
+            MWSError()
+        self.assertEquals(
+            gateway.update_marketplace_pricing(self.marketplace), (0, 0, 2))
+
+
+class TestGettingLatestSnapshots(TestCase):
+
+    def test_returns_latest_snapshot_per_sku(self):
+        marketplace = factories.AmazonMarketplaceFactory()
+        profiles = [
+            factories.ProductFactory(amazon_profile__sku=sku).amazon_profile
+            for sku in ['SKU1', 'SKU2']]
+        for price in ['10.00', '12.00']:
+            for profile in profiles:
+                snapshots.save_snapshots(
+                    marketplace,
+                    {profile.id: {'buybox_price': D(price), 'currency': 'USD'}},
+                    profile.product.date_created)
+
+        with self.assertNumQueries(2):
+            latest = snapshots.get_latest_snapshots(marketplace)
+            self.assertEquals(
+                dict((sku, s.buybox_price) for sku, s in latest.items()),
+                {'SKU1': D('12.00'), 'SKU2': D('12.00')})
@@ -0,0 +1,94 @@
+from django.test import TestCase
+from django.core.cache import cache
+
+from oscar_mws import registry
+from oscar_mws.test import factories
+from oscar_mws.connection import get_merchant_connection
+
+
+class TestMerchantRegistry(TestCase):
+
+    def setUp(self):
+        super(TestMerchantRegistry, self).setUp()
+        cache.clear()
+        registry.get_merchant_registry().clear()
+        self.marketplace = factories.AmazonMarketplaceFactory(
+            marketplace_id='MKT1')
+        self.merchant = self.marketplace.merchant
+
+    def test_loads_merchants_once(self):
+        with self.assertNumQueries(1):
+            entry = registry.get_merchant(self.merchant.seller_id)
+            self.assertEquals(registry.get_merchant('UNKNOWN'), None)
+
+        self.assertEquals(entry.id, self.merchant.id)
+        self.assertEquals(entry.aws_api_key, 'FAKE_KEY')
+        self.assertEquals(entry.endpoint, 'mws.amazonservices.com')
+        self.assertEquals(entry.marketplace_ids, ('MKT1',))
+
+        with self.assertNumQueries(0):
+            self.assertEquals(self.merchant.marketplace_ids, ['MKT1'])
+            get_merchant_connection(self.merchant.seller_id, 'feeds')
+
+    def test_reuses_api_clients_until_merchant_changes(self):
+        feeds_api = get_merchant_connection(self.merchant.seller_id, 'feeds')
+        self.assertTrue(
+            get_merchant_connection(self.merchant.seller_id, 'feeds')
+            is feeds_api)
+
+        self.merchant.aws_api_key = 'NEW_KEY'
+        self.merchant.save()
+        new_api = get_merchant_connection(self.merchant.seller_id, 'feeds')
+        self.assertFalse(new_api is feeds_api)
+        self.assertEquals(new_api.access_key, 'NEW_KEY')
+
+    def test_is_invalidated_by_saving_marketplaces(self):
+        registry.get_merchant(self.merchant.seller_id)
+        factories.AmazonMarketplaceFactory(
+            marketplace_id='MKT2', merchant=self.merchant)
+
+        self.assertEquals(
+            registry.get_merchant(self.merchant.seller_id).marketplace_ids,
+            ('MKT1', 'MKT2'))
+
+    def test_is_invalidated_across_processes(self):
+        other_registry = registry.MerchantRegistry()
+        registry.get_merchant(self.merchant.seller_id)
+        other_registry.get(self.merchant.seller_id)
+
+        self.merchant.aws_api_key = 'NEW_KEY'
+        self.merchant.save()
+
+        # the signal only clears the in-process cache of this process
+        self.assertEquals(len(other_registry), 1)
+        self.assertEquals(
+            other_registry.get(self.merchant.seller_id).aws_api_key,
+            'NEW_KEY')
+        api = get_merchant_connection(self.merchant.seller_id, 'feeds')
+        self.assertEquals(api.access_key, 'NEW_KEY')
+
+    def test_evicts_least_recently_used_entries(self):
+        for seller_id in ['SELLER1', 'SELLER2']:
+            factories.MerchantAccountFactory(
+                name='Merchant {0}'.format(seller_id), seller_id=seller_id)
+        merchant_registry = registry.MerchantRegistry(max_size=2)
+
+        for seller_id in [self.merchant.seller_id, 'SELLER1', 'SELLER2']:
+            merchant_registry.get(seller_id)
+
+        self.assertEquals(
+            merchant_registry._entries.keys(), ['SELLER1', 'SELLER2'])
+
+    def test_keeps_secrets_out_of_django_cache(self):
+        registry.get_merchant(self.merchant.seller_id)
+        version = registry.get_registry_version()
+        merchant_registry = registry.get_merchant_registry()
+        cached = cache.get(merchant_registry.get_cache_key(version))
+        self.assertEquals(
+            cached[self.merchant.seller_id].aws_api_secret, None)
+
+        other_registry = registry.MerchantRegistry()
+        with self.assertNumQueries(1):
+            entry = other_registry.get(self.merchant.seller_id)
+            other_registry.get(self.merchant.seller_id)
+        self.assertEquals(entry.aws_api_secret, 'FAKE_SECRET')
@@ -0,0 +1,315 @@
+# -*- encoding: utf-8 -*-
+import mock
+
+from StringIO import StringIO
+from datetime import timedelta
+from decimal import Decimal as D
+
+from django.test import TestCase
+from django.db.models import get_model
+from django.utils.timezone import now as tz_now
+
+from oscar_mws.api import MWSError, MWSObject
+from oscar_mws.test import mixins, factories
+from oscar_mws.reports import gateway, handlers, readers
+
+ReportRequest = get_model('oscar_mws', 'ReportRequest')
+AmazonProfile = get_model('oscar_mws', 'AmazonProfile')
+
+
+class TestFlatFileReportReader(mixins.DataLoaderMixin, TestCase):
+
+    def get_rows(self, data):
+        return list(readers.FlatFileReportReader.for_report_type(
+            StringIO(data), readers.TYPE_MERCHANT_LISTINGS))
+
+    def test_converts_values_to_column_types(self):
+        rows = self.get_rows(self.load_data('merchant_listings_report.txt'))
+        self.assertEquals(len(rows), 2)
+
+        row = rows[0]
+        self.assertEquals(row['item-name'], u'Café Mug')
+        self.assertEquals(row['item-description'], None)
+        self.assertEquals(row['seller-sku'], u'SKU1')
+        self.assertEquals(row['price'], D('12.99'))
+        self.assertEquals(row['quantity'], 5)
+        self.assertEquals(row['open-date'].year, 2014)
+        self.assertEquals(row['item-is-marketplace'], True)
+
+        self.assertEquals(rows[1]['quantity'], None)
+        self.assertEquals(rows[1]['item-is-marketplace'], False)
+
+    def test_records_values_that_cannot_be_converted(self):
+        reader = readers.FlatFileReportReader.for_report_type(
+            StringIO('seller-sku\tquantity\nSKU1\tmany\n'),
+            readers.TYPE_MERCHANT_LISTINGS)
+        rows = list(reader)
+        self.assertEquals(rows[0]['quantity'], u'many')
+        self.assertEquals(reader.errors, [(2, 'quantity', u'many')])
+
+    def test_returns_no_rows_for_empty_report(self):
+        self.assertEquals(self.get_rows(''), [])
+
+
+class TestIteratingReportRows(mixins.DataLoaderMixin, TestCase):
+
+    def setUp(self):
+        super(TestIteratingReportRows, self).setUp()
+        self.merchant = factories.MerchantAccountFactory()
+
+    def test_streams_report_into_temporary_file(self):
+        data = self.load_data('merchant_listings_report.txt')
+
+        def get_report(report_id, response_file):
+            response_file.write(data)
+            response_file.seek(0)
+            return mock.Mock(parsed=response_file)
+
+        with mock.patch(
+                'oscar_mws.reports.gateway.get_merchant_connection') \
+                as gmc_mock:
+            gmc_mock.return_value.get_report.side_effect = get_report
+            rows = list(gateway.iter_report_rows(
+                self.merchant, '1234', readers.TYPE_MERCHANT_LISTINGS))
+
+        self.assertEquals([r['seller-sku'] for r in rows], ['SKU1', 'SKU2'])
+        response_file = gmc_mock.return_value.get_report.call_args[1][
+            'response_file']
+        self.assertTrue(response_file.closed)
+
+    def test_raises_error_when_download_fails(self):
+        with mock.patch(
+                'oscar_mws.reports.gateway.get_merchant_connection') \
+                as gmc_mock:
+            gmc_mock.return_value.get_report.side_effect = MWSError()
+            self.assertRaises(
+                MWSError, gateway.download_report, self.merchant, '1234')
+
+
+class TestUpdatingReportRequests(TestCase):
+
+    def setUp(self):
+        super(TestUpdatingReportRequests, self).setUp()
+        self.merchant = factories.MerchantAccountFactory()
+        self.done = factories.ReportRequestFactory(merchant=self.merchant)
+        self.pending = factories.ReportRequestFactory(merchant=self.merchant)
+        self.reports_api = mock.Mock()
+        self.reports_api.get_report_request_list.return_value = mock.Mock(
+            parsed=MWSObject(ReportRequestInfo=[
+                MWSObject(ReportRequestId=self.done.request_id,
+                          ReportProcessingStatus='_DONE_',
+                          GeneratedReportId='REPORT1'),
+                MWSObject(ReportRequestId=self.pending.request_id,
+                          ReportProcessingStatus='_IN_PROGRESS_')]))
+
+    def update_report_requests(self):
+        with mock.patch(
+                'oscar_mws.reports.gateway.get_merchant_connection') \
+                as gmc_mock:
+            gmc_mock.return_value = self.reports_api
+            return gateway.update_report_requests(self.merchant)
+
+    def test_polls_all_pending_requests_at_once(self):
+        self.assertEquals(self.update_report_requests(), 1)
+        self.assertEquals(
+            self.reports_api.get_report_request_list.call_count, 1)
+
+        done = ReportRequest.objects.get(pk=self.done.pk)
+        self.assertEquals(done.processing_status, '_DONE_')
+        self.assertEquals(done.report_id, 'REPORT1')
+        self.assertEquals(done.date_next_poll, None)
+
+        pending = ReportRequest.objects.get(pk=self.pending.pk)
+        self.assertEquals(pending.processing_status, '_IN_PROGRESS_')
+        self.assertEquals(pending.num_polls, 1)
+        self.assertTrue(pending.date_next_poll > tz_now())
+
+    def test_skips_requests_that_are_not_due(self):
+        ReportRequest.objects.update(
+            date_next_poll=tz_now() + timedelta(minutes=5))
+        self.assertEquals(self.update_report_requests(), 0)
+        self.assertFalse(self.reports_api.get_report_request_list.called)
+
+    def test_increases_poll_delay(self):
+        self.assertEquals(gateway.get_poll_delay(0), timedelta(seconds=60))
+        self.assertEquals(gateway.get_poll_delay(2), timedelta(seconds=240))
+        self.assertEquals(gateway.get_poll_delay(10), timedelta(seconds=900))
+
+
+class TestProcessingReportRequests(TestCase):
+
+    def setUp(self):
+        super(TestProcessingReportRequests, self).setUp()
+        self.report_request = factories.ReportRequestFactory(
+            processing_status='_DONE_', report_id='REPORT1')
+        self.handler = mock.Mock()
+
+    def test_downloads_report_only_once(self):
+        with mock.patch('oscar_mws.reports.gateway.download_report') \
+                as download_mock:
+            download_mock.return_value = StringIO('report')
+            self.assertTrue(gateway.process_report_request(
+                self.report_request, self.handler))
+            self.assertFalse(gateway.process_report_request(
+                self.report_request, self.handler))
+
+        self.assertEquals(download_mock.call_count, 1)
+        self.assertEquals(self.handler.call_count, 1)
+
+    def test_can_be_retried_after_failed_download(self):
+        with mock.patch('oscar_mws.reports.gateway.download_report') \
+                as download_mock:
+            download_mock.side_effect = MWSError()
+            self.assertRaises(
+                MWSError, gateway.process_report_request,
+                self.report_request, self.handler)
+
+        report_request = ReportRequest.objects.get(pk=self.report_request.pk)
+        self.assertEquals(report_request.date_downloaded, None)
+        self.assertEquals(report_request.date_claimed, None)
+
+    def test_can_be_retried_once_claim_expired(self):
+        ReportRequest.objects.filter(pk=self.report_request.pk).update(
+            date_claimed=tz_now() - timedelta(minutes=30))
+        with mock.patch('oscar_mws.reports.gateway.download_report') \
+                as download_mock:
+            download_mock.return_value = StringIO('report')
+            self.assertFalse(gateway.process_report_request(
+                self.report_request, self.handler))
+            with self.settings(MWS_REPORT_CLAIM_TIMEOUT=600):
+                self.assertTrue(gateway.process_report_request(
+                    self.report_request, self.handler))
+
+        report_request = ReportRequest.objects.get(pk=self.report_request.pk)
+        self.assertNotEquals(report_request.date_downloaded, None)
+        self.assertEquals(report_request.date_claimed, None)
+
+    def test_does_not_close_file_passed_by_caller(self):
+        report_file = mock.Mock()
+        reports_api = mock.Mock()
+        reports_api.get_report.side_effect = MWSError()
+        with mock.patch('oscar_mws.reports.gateway.get_merchant_connection',
+                        return_value=reports_api):
+            self.assertRaises(
+                MWSError, gateway.download_report,
+                self.report_request.merchant, 'REPORT1', report_file)
+        self.assertFalse(report_file.close.called)
+
+
+class TestProcessingCompletedReports(TestCase):
+
+    def setUp(self):
+        super(TestProcessingCompletedReports, self).setUp()
+        self.failing = factories.ReportRequestFactory(
+            processing_status='_DONE_', report_id='REPORT1')
+        self.merchant = self.failing.merchant
+        factories.ReportRequestFactory(
+            processing_status='_DONE_', report_id='REPORT2',
+            merchant=self.merchant)
+
+    def test_skips_reports_that_fail_to_process(self):
+        def handle_report(report_request, report_file):
+            if report_request.report_id == 'REPORT1':
+                raise ValueError('bad row')
+
+        with mock.patch('oscar_mws.reports.gateway.download_report') \
+                as download_mock, \
+                mock.patch('oscar_mws.reports.gateway.load_class') \
+                as load_mock:
+            download_mock.return_value = StringIO('report')
+            load_mock.return_value = handle_report
+            self.assertEquals(
+                gateway.process_completed_reports(self.merchant), 1)
+            with self.settings(MWS_REPORT_MAX_ATTEMPTS=1):
+                self.assertEquals(
+                    gateway.process_completed_reports(self.merchant), 0)
+
+        self.assertEquals(download_mock.call_count, 2)
+        failing = ReportRequest.objects.get(pk=self.failing.pk)
+        self.assertEquals(failing.num_failed_attempts, 1)
+        self.assertEquals(failing.date_downloaded, None)
+
+    def test_uses_default_handlers_without_setting(self):
+        with mock.patch('oscar_mws.reports.gateway.settings', object()):
+            self.assertEquals(
+                gateway.get_report_handler('_GET_MERCHANT_LISTINGS_DATA_'),
+                handlers.reconcile_listings_report)
+
+
+class TestReconcilingListings(TestCase):
+
+    def setUp(self):
+        super(TestReconcilingListings, self).setUp()
+        self.marketplace = factories.AmazonMarketplaceFactory()
+        self.profiles = {}
+        for sku in ['SKU1', 'SKU2', 'SKU3']:
+            profile = factories.ProductFactory(
+                amazon_profile__sku=sku).amazon_profile
+            profile.marketplaces.add(self.marketplace)
+            self.profiles[sku] = profile
+
+    def get_profile(self, sku):
+        return AmazonProfile.objects.get(pk=self.profiles[sku].pk)
+
+    def test_updates_asins_and_flags_listings(self):
+        rows = [{'seller-sku': 'SKU1', 'asin1': 'B00ASIN001'},
+                {'seller-sku': 'SKU2', 'asin1': 'B00ASIN002'},
+                {'seller-sku': 'UNKNOWN', 'asin1': 'B00ASIN009'}]
+        result = handlers.reconcile_listings(self.marketplace, rows)
+
+        self.assertEquals(result['updated'], 3)
+        self.assertEquals(result['missing'], ['SKU3'])
+        self.assertEquals(result['unknown'], ['UNKNOWN'])
+
+        self.assertEquals(self.get_profile('SKU1').asin, 'B00ASIN001')
+        self.assertEquals(self.get_profile('SKU1').is_listed, True)
+        self.assertEquals(self.get_profile('SKU3').asin, '')
+        self.assertEquals(self.get_profile('SKU3').is_listed, False)
+
+    def test_writes_only_changed_profiles(self):
+        rows = [{'seller-sku': 'SKU1', 'asin1': 'B00ASIN001'},
+                {'seller-sku': 'SKU2', 'asin1': 'B00ASIN002'}]
+        handlers.reconcile_listings(self.marketplace, rows)
+
+        rows[1]['asin1'] = 'B00ASIN022'
+        result = handlers.reconcile_listings(self.marketplace, rows)
+        self.assertEquals(result['updated'], 1)
+        self.assertEquals(self.get_profile('SKU2').asin, 'B00ASIN022')
+
+    def test_can_be_used_as_report_handler(self):
+        report_request = factories.ReportRequestFactory(
+            merchant=self.marketplace.merchant, marketplace=self.marketplace)
+        report_file = StringIO('seller-sku\tasin1\nSKU1\tB00ASIN001\n')
+        handlers.reconcile_listings_report(report_request, report_file)
+        self.assertEquals(self.get_profile('SKU1').asin, 'B00ASIN001')
+
+    def test_keeps_profiles_listed_in_other_marketplaces(self):
+        other = factories.AmazonMarketplaceFactory(
+            merchant=self.marketplace.merchant)
+        self.profiles['SKU1'].marketplaces.add(other)
+        rows = [{'seller-sku': 'SKU1', 'asin1': 'B00ASIN001'}]
+
+        handlers.reconcile_listings(self.marketplace, rows)
+        handlers.reconcile_listings(other, [])
+        self.assertEquals(self.get_profile('SKU1').is_listed, True)
+
+        handlers.reconcile_listings(self.marketplace, [])
+        self.assertEquals(self.get_profile('SKU1').is_listed, False)
+        handlers.reconcile_listings(other, rows)
+        self.assertEquals(self.get_profile('SKU1').is_listed, True)
+        self.assertEquals(
+            list(self.get_profile('SKU1').listed_marketplaces.all()),
+            [other])
+
+    def test_ignores_profiles_in_other_marketplaces(self):
+        other = factories.AmazonMarketplaceFactory(
+            merchant=self.marketplace.merchant)
+        profile = factories.ProductFactory(
+            amazon_profile__sku='SKU4').amazon_profile
+        profile.marketplaces.add(other)
+
+        rows = [{'seller-sku': 'SKU1', 'asin1': 'B00ASIN001'}]
+        result = handlers.reconcile_listings(self.marketplace, rows)
+        self.assertEquals(sorted(result['missing']), ['SKU2', 'SKU3'])
+        self.assertEquals(
+            AmazonProfile.objects.get(pk=profile.pk).is_listed, None)
@@ -0,0 +1,99 @@
+import mock
+
+from django.test import TestCase
+from django.db.models import get_model
+
+from oscar_mws.api import MWSError, MWSObject
+from oscar_mws.test import factories
+from oscar_mws.seller import gateway
+
+AmazonMarketplace = get_model('oscar_mws', 'AmazonMarketplace')
+
+
+def get_marketplace_data(marketplace_id, name='Amazon.com'):
+    return MWSObject(
+        MarketplaceId=marketplace_id, Name=name, DomainName='www.amazon.com',
+        DefaultCountryCode='US', DefaultCurrencyCode='USD')
+
+
+def get_response(*marketplaces):
+    return mock.Mock(parsed=MWSObject(
+        ListMarketplaces=MWSObject(Marketplace=list(marketplaces))))
+
+
+class TestUpdatingAllMarketplaces(TestCase):
+
+    def setUp(self):
+        super(TestUpdatingAllMarketplaces, self).setUp()
+        self.merchants = [
+            factories.MerchantAccountFactory(
+                name='Merchant {0}'.format(seller_id), seller_id=seller_id)
+            for seller_id in ['SELLER1', 'SELLER2', 'SELLER3']]
+        self.apis = dict(
+            (m.seller_id, mock.Mock()) for m in self.merchants)
+        self.apis['SELLER1'].list_marketplace_participations.return_value = \
+            get_response(get_marketplace_data('MKT1'),
+                         get_marketplace_data('MKT2'))
+        self.apis['SELLER2'].list_marketplace_participations.return_value = \
+            get_response(get_marketplace_data('MKT3'))
+        self.apis['SELLER3'].list_marketplace_participations.side_effect = \
+            MWSError()
+
+        patcher = mock.patch(
+            'oscar_mws.seller.gateway.get_merchant_connection')
+        patcher.start().side_effect = lambda seller_id, api: \
+            self.apis[seller_id]
+        self.addCleanup(patcher.stop)
+
+    def test_creates_marketplaces_for_all_merchants(self):
+        with self.assertNumQueries(3):
+            marketplaces = gateway.update_all_marketplaces(self.merchants)
+
+        self.assertEquals(
+            dict((s, [m.marketplace_id for m in ms])
+                 for s, ms in marketplaces.items()),
+            {'SELLER1': ['MKT1', 'MKT2'], 'SELLER2': ['MKT3']})
+        self.assertEquals(
+            marketplaces['SELLER2'][0],
+            AmazonMarketplace.objects.get(marketplace_id='MKT3'))
+        self.assertEquals(self.merchants[0].marketplaces.count(), 2)
+        self.assertEquals(self.merchants[2].marketplaces.count(), 0)
+
+    def test_updates_only_changed_marketplaces(self):
+        gateway.update_all_marketplaces(self.merchants)
+        with self.assertNumQueries(1):
+            gateway.update_all_marketplaces(self.merchants)
+
+        self.apis['SELLER1'].list_marketplace_participations.return_value = \
+            get_response(get_marketplace_data('MKT1', name='Amazon.ca'),
+                         get_marketplace_data('MKT2', name='Amazon.ca'))
+        with self.assertNumQueries(2):
+            gateway.update_all_marketplaces(self.merchants)
+        self.assertEquals(
+            AmazonMarketplace.objects.filter(name='Amazon.ca').count(), 2)
+
+    def test_skips_marketplaces_of_other_merchants(self):
+        factories.AmazonMarketplaceFactory(
+            marketplace_id='MKT3', merchant=self.merchants[0])
+
+        marketplaces = gateway.update_all_marketplaces(self.merchants)
+
+        self.assertEquals(marketplaces['SELLER2'], [])
+        self.assertEquals(
+            AmazonMarketplace.objects.get(marketplace_id='MKT3').merchant,
+            self.merchants[0])
+
+    def test_follows_next_token(self):
+        response = get_response(get_marketplace_data('MKT1'))
+        response.parsed['NextToken'] = 'TOKEN'
+        sellers_api = self.apis['SELLER1']
+        sellers_api.list_marketplace_participations.return_value = response
+        sellers_api.list_marketplace_participations_by_next_token\
+            .return_value = get_response(get_marketplace_data('MKT2'))
+
+        self.assertEquals(
+            [m.marketplace_id for m in
+             gateway.update_marketplaces(self.merchants[0])],
+            ['MKT1', 'MKT2'])
+        sellers_api.list_marketplace_participations_by_next_token\
+            .assert_called_once_with(token='TOKEN')
@@ -1,4 +1,5 @@
 import mock
+import tempfile
 
 try:
     from lxml import etree
@@ -50,6 +51,28 @@ shipping are not available for this style."""
         )
 
 
+class TestStreamingFeedWriter(TestCase):
+
+    def test_writes_messages_to_feed_file(self):
+        feed_file = tempfile.TemporaryFile()
+        writer = ProductFeedWriter(
+            merchant_id='MERCH_X_123', feed_file=feed_file)
+        for __ in range(2):
+            product = create_product()
+            AmazonProfile.objects.create(product=product)
+            writer.add_product(product)
+        writer.close()
+
+        self.assertEquals(writer.num_messages, 2)
+        self.assertEquals(writer.messages, {})
+        root = etree.fromstring(feed_file.read())
+        self.assertEquals(
+            root.find('Header/MerchantIdentifier').text, 'MERCH_X_123')
+        self.assertEquals(
+            [m.findtext('MessageID') for m in root.findall('Message')],
+            ['1', '2'])
+
+
 class TestBaseProductMapper(TestCase):
 
     def setUp(self):